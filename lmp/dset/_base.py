@@ -40,6 +40,11 @@ class BaseDset(torch.utils.data.Dataset):
         Used only for downloading dataset files.
     lang: ClassVar[str]
         Language of the dataset.
+    normalized: ClassVar[bool]
+        Whether samples are already normalized by
+        :py:func:`lmp.dset.util.norm`.
+        Tokenizers skip normalization of samples if set to ``True``.
+        See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
     spls: List[str]
         All samples in the dataset.
     ver: str
@@ -62,6 +67,7 @@ class BaseDset(torch.utils.data.Dataset):
     dset_name: ClassVar[str] = 'base'
     file_name: ClassVar[str] = ''
     lang: ClassVar[str] = ''
+    normalized: ClassVar[bool] = False
     vers: ClassVar[List[str]] = []
     url: ClassVar[str] = ''
 
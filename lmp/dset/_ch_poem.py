@@ -50,6 +50,8 @@ class ChPoemDset(BaseDset):
         Used only for downloading dataset files.
     lang: ClassVar[str]
         Use Chinese as primary language.
+    normalized: ClassVar[bool]
+        Samples are normalized by :py:func:`lmp.dset.util.norm`.
     spls: List[str]
         All samples in the dataset.
     ver: str
@@ -83,6 +85,7 @@ class ChPoemDset(BaseDset):
     dset_name: ClassVar[str] = 'chinese-poem'
     file_name: ClassVar[str] = '{}.csv.zip'
     lang: ClassVar[str] = 'zh'
+    normalized: ClassVar[bool] = True
     vers: ClassVar[List[str]] = [
         '元', '元末明初', '先秦', '南北朝', '唐', '唐末宋初', '宋', '宋末元初', '宋末金初', '明',
         '明末清初', '民國末當代初', '清', '清末民國初', '清末近現代初', '漢', '當代', '秦', '近現代',
@@ -47,6 +47,8 @@ class WikiText2Dset(BaseDset):
         Used only for downloading dataset files.
     lang: ClassVar[str]
         Use English as primary language.
+    normalized: ClassVar[bool]
+        Samples are normalized by :py:func:`lmp.dset.util.norm`.
     spls: List[str]
         All samples in the dataset.
     ver: str
@@ -85,6 +87,7 @@ class WikiText2Dset(BaseDset):
     dset_name: ClassVar[str] = 'wikitext-2'
     file_name: ClassVar[str] = 'wiki.{}.tokens.zip'
     lang: ClassVar[str] = 'en'
+    normalized: ClassVar[bool] = True
     vers: ClassVar[List[str]] = ['test', 'train', 'valid']
     url: ClassVar[str] = ''.join([
         'https://github.com/ProFatXuanAll',
@@ -31,11 +31,28 @@ True
 from typing import Dict, Final, List, Type
 
 from lmp.infer._base import BaseInfer
+from lmp.infer._beam_search import BeamSearchInfer
+from lmp.infer._prefix_cache import PrefixStateCache
+from lmp.infer._speculative import SpeculativeInfer
 from lmp.infer._top_1 import Top1Infer
 from lmp.infer._top_k import TopKInfer
 from lmp.infer._top_p import TopPInfer
 
+__all__ = [
+    'ALL_INFERS',
+    'BaseInfer',
+    'BeamSearchInfer',
+    'INFER_OPTS',
+    'PrefixStateCache',
+    'SpeculativeInfer',
+    'Top1Infer',
+    'TopKInfer',
+    'TopPInfer',
+]
+
 ALL_INFERS: Final[List[Type[BaseInfer]]] = [
+    BeamSearchInfer,
+    SpeculativeInfer,
     Top1Infer,
     TopKInfer,
     TopPInfer,
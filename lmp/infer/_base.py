@@ -1,14 +1,47 @@
 r"""Inference method base class."""
 import abc
 import argparse
-from typing import ClassVar, Dict, Optional
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import torch
 
+from lmp.infer._prefix_cache import PrefixStateCache
 from lmp.model import BaseModel
 from lmp.tknzr import BaseTknzr
 
 
+def _gumbel_max(batch_logits: torch.Tensor) -> torch.Tensor:
+    r"""Sample indices from categorical distributions with Gumbel-max trick.
+
+    Adding Gumbel noise to logits and taking the maximum is equivalent to
+    sampling from softmax of logits, thus logits need not to be normalized.
+    Logits equal to ``-inf`` are never sampled.
+
+    Parameters
+    ==========
+    batch_logits: torch.Tensor
+        Batch of unnormalized log probabilities with shape ``(B, K)``.
+
+    Returns
+    =======
+    torch.Tensor
+        Sampled indices with shape ``(B, 1)`` and ``dtype == torch.int64``.
+    """
+    # Gumbel noise `-log(E)` where `E` follows standard exponential
+    # distribution.
+    batch_gumbel = -torch.empty_like(batch_logits).exponential_().log()
+    return (batch_logits + batch_gumbel).argmax(dim=-1, keepdim=True)
+
+
 class BaseInfer(abc.ABC):
     r"""Inference method abstract base class.
 
@@ -18,6 +51,7 @@ class BaseInfer(abc.ABC):
     symbols to denote the shape of tensors:
 
     - ``B``: Batch size.
+    - ``B'``: Number of sequences still being generated.
     - ``S'``: Length of original sequence of tokens.
     - ``S``: Length of truncated sequence of tokens.
     - ``V``: Vocabulary size.
@@ -44,6 +78,13 @@ class BaseInfer(abc.ABC):
         Subclass must overwrite ``infer_name`` attribute.
     max_seq_len: str
         Maximum sequence length constraint of generated sequence of tokens.
+    prefix_cache: Optional[lmp.infer.PrefixStateCache]
+        Model states cache of prompt prefixes.
+        Set to ``None`` to disable caching, which is the default.
+        Assign a :py:class:`lmp.infer.PrefixStateCache` instance to resume
+        generation from cached model states of prompt prefixes.
+        Only used by ``self.batch_gen_steps``, thus ignored by subclasses
+        overriding it (e.g., beam search and speculative decoding).
 
     Raises
     ======
@@ -65,8 +106,9 @@ class BaseInfer(abc.ABC):
         else:
             self.max_seq_len = max_seq_len
 
+        self.prefix_cache: Optional[PrefixStateCache] = None
+
     @torch.no_grad()
-    @abc.abstractmethod
     def gen(
             self,
             model: BaseModel,
@@ -75,6 +117,8 @@ class BaseInfer(abc.ABC):
     ) -> str:
         r"""Generate text conditional on text segment.
 
+        Same as calling ``self.batch_gen`` with a batch of one text segment.
+
         Parameters
         ==========
         model: lmp.model.BaseModel
@@ -89,14 +133,594 @@ class BaseInfer(abc.ABC):
         str
             Generated text.
 
+        See Also
+        ========
+        lmp.infer.BaseInfer.batch_gen
+        """
+        return self.batch_gen(model=model, tknzr=tknzr, batch_txt=[txt])[0]
+
+    @torch.no_grad()
+    def batch_gen(
+            self,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+            batch_txt: Sequence[str],
+            num_return_sequences: int = 1,
+    ) -> List[str]:
+        r"""Generate batch of text conditional on batch of text segments.
+
+        Run ``self.batch_gen_steps`` to the end and decode output buffer.
+
+        Parameters
+        ==========
+        model: lmp.model.BaseModel
+            Pre-trained language model to generate text.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        batch_txt: Sequence[str]
+            Batch of text segments to condition on.
+        num_return_sequences: int, optional
+            Number of generated text for each text segment.
+            Must satisfy ``num_return_sequences > 0``.
+            Defaults to ``1``.
+
+        Returns
+        =======
+        List[str]
+            Batch of generated text.
+            Generated text of the same text segment are consecutive, i.e.,
+            the ``j``-th generated text of the ``i``-th text segment is at
+            index ``i * num_return_sequences + j``.
+
+        See Also
+        ========
+        lmp.infer.BaseInfer.batch_gen_steps
+        """
+        # Return empty list when input empty batch.
+        if not batch_txt:
+            return []
+
+        # Run generation loop until all sequences are finished.
+        for batch_tkids, out_seq_len in self.batch_gen_steps(
+            model=model,
+            tknzr=tknzr,
+            batch_txt=batch_txt,
+            num_return_sequences=num_return_sequences,
+        ):
+            pass
+
+        # Output generated text.
+        # Only decode written part of output buffer.
+        return tknzr.batch_dec(
+            batch_tkids=batch_tkids[:, :out_seq_len],
+            rm_sp_tks=True,
+        )
+
+    @torch.no_grad()
+    def stream(
+            self,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+            txt: str,
+    ) -> Iterator[str]:
+        r"""Generate text conditional on text segment token by token.
+
+        Each newly generated token id is detokenized as soon as it is sampled
+        and the newly generated text is yielded.
+        Detokenization is incremental: only token ids generated after the last
+        yielded text (and the token id right before them) are decoded.
+        Token ids which do not extend text yet (for example whitespaces which
+        are stripped by normalization) are held until later token ids extend
+        text.
+        Conditional text is not yielded.
+
+        Parameters
+        ==========
+        model: lmp.model.BaseModel
+            Pre-trained language model to generate text.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        txt: str
+            Text segment to condition on.
+
+        Yields
+        ======
+        str
+            Newly generated text.
+
+        See Also
+        ========
+        lmp.infer.BaseInfer.batch_gen_steps
+        lmp.infer.BaseInfer.gen
+        """
+        # Token ids written so far.
+        tkids: List[int] = []
+
+        # Decoding window is `tkids[prefix_offset:]`.
+        # Text of `tkids[prefix_offset:read_offset]` has been yielded.
+        prefix_offset = 0
+        read_offset = -1
+
+        for batch_tkids, out_seq_len in self.batch_gen_steps(
+            model=model,
+            tknzr=tknzr,
+            batch_txt=[txt],
+        ):
+            # Only read newly written token ids.
+            tkids.extend(batch_tkids[0, len(tkids):out_seq_len].tolist())
+
+            # The first output of generation loop is conditional text.
+            # Decoding window start from the last token id of conditional
+            # text, so that separators between conditional text and
+            # generated text are kept.
+            if read_offset == -1:
+                read_offset = len(tkids)
+                prefix_offset = max(0, read_offset - 1)
+                continue
+
+            prefix_txt = tknzr.dec(
+                tkids[prefix_offset:read_offset],
+                rm_sp_tks=True,
+            )
+            new_txt = tknzr.dec(tkids[prefix_offset:], rm_sp_tks=True)
+
+            # Hold token ids until they extend text.
+            if len(new_txt) <= len(prefix_txt):
+                continue
+            if not new_txt.startswith(prefix_txt):
+                continue
+
+            yield new_txt[len(prefix_txt):]
+
+            # Slide decoding window.
+            prefix_offset = read_offset
+            read_offset = len(tkids)
+
+    @torch.no_grad()
+    def batch_gen_steps(
+            self,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+            batch_txt: Sequence[str],
+            num_return_sequences: int = 1,
+    ) -> Iterator[Tuple[torch.Tensor, int]]:
+        r"""Generation loop which yield output buffer after each step.
+
+        Batch generation algorithm is structured as follow:
+
+        #. Encode each input text.
+           Remove ``[eos]`` token since model is not trained to predict tokens
+           after seeing ``[eos]``.
+           Truncate text to satisfy maximum sequence constraint.
+        #. Preallocate output buffer and write encoded text into it.
+           Each encoded text is written to ``num_return_sequences``
+           consecutive rows.
+           Unwritten positions are filled with ``[pad]``.
+           (shape: ``(B, max_seq_len)``)
+        #. Create initial model state with ``model.init_state()``.
+           Text segments already reaching ``self.max_seq_len`` are finished
+           and are not fed to model.
+        #. Use ``model.forward_step()`` to feed the shortest conditional text
+           length of token ids and get next token ids logits.
+           Only the first copy of each text segment is fed, thus conditional
+           text is fed only once no matter how many sequences are returned.
+           If ``self.prefix_cache`` is set, then conditional text prefix
+           already cached is not fed again.
+           See ``self.prefill_with_cache`` for details.
+           Logits are not normalized into probability distribution, thus no
+           softmax over the whole vocabulary is calculated.
+           (shape: ``(B', S, V)``)
+        #. Broadcast the last token id logits and model state to every copy
+           of text segment with ``model.select_state()``.
+           (shape: ``(B', V)``)
+        #. Use for-loop to generate sequence of token ids.
+
+            #. Sample next token ids with ``self.sample()``.
+               (shape: ``(B', 1)``)
+            #. Sequences which conditional text are not fully fed yet replace
+               sampled token ids with their conditional text token ids.
+               Thus padding token ids are never fed to model and each sequence
+               is generated as if it were generated alone.
+            #. Write next token ids to output buffer and move write cursor
+               forward.
+               Output buffer is never reallocated.
+            #. Yield output buffer and write cursor.
+            #. Sequences which predict ``[eos]`` are finished.
+               Finished sequences are dropped out of batch and model state
+               with ``model.select_state()``, so no more computation is spent
+               on them.
+            #. Break loop if all sequences are finished.
+            #. Break loop if token ids sequence length violate
+               ``self.max_seq_len`` constraint.
+            #. Feed the last next token id of each sequence with
+               ``model.forward_step()`` to get next token ids logits and
+               update model state.
+               (shape: ``(B', 1, V)``)
+            #. Go to the for-loop start and continue generation.
+
+        Parameters
+        ==========
+        model: lmp.model.BaseModel
+            Pre-trained language model to generate text.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        batch_txt: Sequence[str]
+            Batch of text segments to condition on.
+        num_return_sequences: int, optional
+            Number of generated sequences for each text segment.
+            Must satisfy ``num_return_sequences > 0``.
+            Defaults to ``1``.
+
+        Yields
+        ======
+        Tuple[torch.Tensor, int]
+            Output buffer with shape ``(B, max_seq_len)`` and
+            ``dtype == torch.int64``, and write cursor ``out_seq_len``.
+            ``B`` is ``len(batch_txt) * num_return_sequences``.
+            Only ``batch_tkids[:, :out_seq_len]`` has been written.
+            The first output is yield before any generation step, thus
+            contains only conditional text.
+            Output buffer is shared by all outputs and is updated in place.
+
+        See Also
+        ========
+        lmp.infer.BaseInfer.batch_gen
+        lmp.infer.BaseInfer.stream
+        """
+        # Nothing to generate when input empty batch.
+        if not batch_txt:
+            return
+
+        # Encode conditional text into preallocated output buffer.
+        # Each conditional text is copied to `num_return_sequences` rows.
+        # Tensor shape: `(B, max_seq_len)`.
+        # Tensor dtype: `torch.int64`.
+        batch_tkids, batch_prompt_len = self.enc_prompt(
+            tknzr=tknzr,
+            batch_txt=batch_txt,
+            num_return_sequences=num_return_sequences,
+        )
+        max_prompt_len = max(batch_prompt_len)
+
+        # Write cursor of output buffer.
+        # Only `batch_tkids[:, :out_seq_len]` has been written.
+        out_seq_len = max_prompt_len
+
+        # Sequences already reaching maximum sequence length are finished.
+        active_idx = [
+            idx
+            for idx, prompt_len in enumerate(batch_prompt_len)
+            if prompt_len < self.max_seq_len
+        ]
+
+        # Get model running device.
+        device = next(model.parameters()).device
+
+        # Move tensors to model running device.
+        batch_tkids = batch_tkids.to(device)
+
+        # Output conditional text before generation.
+        yield batch_tkids, out_seq_len
+
+        # Nothing to generate.
+        if not active_idx:
+            return
+
+        # Every active sequence can consume the shortest conditional text
+        # length of token ids at once.
+        min_prompt_len = min(batch_prompt_len[idx] for idx in active_idx)
+
+        # Move tensors to model running device.
+        # `batch_active_idx` maps each row of model state to its sequence.
+        batch_prompt_len = torch.LongTensor(batch_prompt_len).to(device)
+        batch_active_idx = torch.LongTensor(active_idx).to(device)
+
+        # Copies of the same conditional text are consecutive rows, thus only
+        # the first copy of each conditional text is fed to model.
+        batch_prefill_idx = batch_active_idx[::num_return_sequences]
+
+        # Model state summarize all token ids seen by model.
+        # At the first step model have seen nothing, so we feed the shortest
+        # conditional text length of token ids to model.
+        batch_prev_state = model.init_state(
+            batch_size=batch_prefill_idx.size(0),
+        )
+        n_seen = 0
+
+        # Resume from cached model states of prompt prefixes.
+        if self.prefix_cache is not None:
+            batch_prev_state, n_seen = self.prefill_with_cache(
+                batch_prev_state=batch_prev_state,
+                batch_prompt_tkids=batch_tkids[
+                    batch_prefill_idx,
+                    :min_prompt_len,
+                ],
+                model=model,
+            )
+
+        # Get next token ids logits with conditional text and update model
+        # state.
+        # Input tensor : Conditional token ids.
+        # Input shape  : `(B', S)`.
+        # Input dtype  : `torch.int64`.
+        # Output tensor: Next token ids logits.
+        # Output shape : `(B', S, V)`.
+        # Output dtype : `torch.float32`.
+        batch_next_tkids_logits, batch_prev_state = model.forward_step(
+            batch_cur_tkids=batch_tkids[
+                batch_prefill_idx,
+                n_seen:min_prompt_len,
+            ],
+            batch_prev_state=batch_prev_state,
+        )
+        batch_next_tkid_logits = batch_next_tkids_logits[:, -1]
+
+        # Broadcast the last token id logits and model state to every copy of
+        # conditional text.
+        if num_return_sequences > 1:
+            batch_copy_idx = torch.arange(
+                batch_prefill_idx.size(0),
+                device=device,
+            ).repeat_interleave(num_return_sequences)
+            batch_next_tkid_logits = batch_next_tkid_logits.index_select(
+                0,
+                batch_copy_idx,
+            )
+            batch_prev_state = model.select_state(
+                batch_state=batch_prev_state,
+                batch_idx=batch_copy_idx,
+            )
+
+        # Generate tokens.
+        for seq_len in range(min_prompt_len, self.max_seq_len):
+            # Sample next token ids with the last token id logits.
+            # Input shape : `(B', V)`.
+            # Input dtype : `torch.float32`.
+            # Output shape: `(B', 1)`.
+            # Output dtype: `torch.int64`.
+            batch_next_tkid = self.sample(
+                batch_next_tkid_logits=batch_next_tkid_logits,
+            )
+
+            # Sequences which conditional text are not fully fed use their
+            # conditional text token ids instead of sampled token ids.
+            # Output shape: `(B', 1)`.
+            # Output dtype: `torch.bool`.
+            batch_is_prompt = (
+                batch_prompt_len[batch_active_idx] > seq_len
+            ).unsqueeze(-1)
+            batch_next_tkid = torch.where(
+                batch_is_prompt,
+                batch_tkids[batch_active_idx, seq_len:seq_len + 1],
+                batch_next_tkid,
+            )
+
+            # Write next token ids to output buffer and move write cursor.
+            batch_tkids[batch_active_idx, seq_len] = batch_next_tkid[:, 0]
+            out_seq_len = max(out_seq_len, seq_len + 1)
+
+            # Output newly written token ids before next step.
+            yield batch_tkids, out_seq_len
+
+            # Sequences which predict `[eos]` are finished.
+            # Output shape: `(B')`.
+            # Output dtype: `torch.bool`.
+            batch_is_done = (
+                (~batch_is_prompt) & (batch_next_tkid == tknzr.eos_tkid)
+            )[:, 0]
+
+            # Drop finished sequences out of batch.
+            if batch_is_done.any():
+                batch_keep_idx = (~batch_is_done).nonzero(as_tuple=True)[0]
+
+                # All sequences are finished.
+                if batch_keep_idx.size(0) == 0:
+                    break
+
+                batch_active_idx = batch_active_idx[batch_keep_idx]
+                batch_next_tkid = batch_next_tkid[batch_keep_idx]
+                batch_prev_state = model.select_state(
+                    batch_state=batch_prev_state,
+                    batch_idx=batch_keep_idx,
+                )
+
+            # Token ids sequence length reaches maximum sequence length.
+            if seq_len + 1 >= self.max_seq_len:
+                break
+
+            # Model have seen every token ids except the last next token id.
+            # Input shape : `(B', 1)`.
+            # Output shape: `(B', 1, V)`.
+            batch_next_tkids_logits, batch_prev_state = model.forward_step(
+                batch_cur_tkids=batch_next_tkid,
+                batch_prev_state=batch_prev_state,
+            )
+            batch_next_tkid_logits = batch_next_tkids_logits[:, -1]
+
+    def prefill_with_cache(
+            self,
+            batch_prev_state: Any,
+            batch_prompt_tkids: torch.Tensor,
+            model: BaseModel,
+    ) -> Tuple[Any, int]:
+        r"""Feed conditional text prefix with prompt prefix cache.
+
+        Prefill algorithm is structured as follow:
+
+        #. Find the longest conditional text prefix which model states of all
+           sequences are cached.
+           Resume from cached model states if found.
+        #. Feed the rest conditional text block by block, where blocks end at
+           multiples of ``self.prefix_cache.block_size``.
+           Model state of each sequence after each block is cached.
+        #. The last token id of ``batch_prompt_tkids`` is never fed, since
+           at least one token id must be fed to get next token id logits.
+
+        Parameters
+        ==========
+        batch_prev_state: Any
+            Initial model state with batch size ``B``.
+        batch_prompt_tkids: torch.Tensor
+            Batch of conditional token ids with the same length.
+            ``batch_prompt_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+        model: lmp.model.BaseModel
+            Pre-trained language model to generate text.
+
+        Returns
+        =======
+        Tuple[Any, int]
+            Model state after prefill and number of token ids seen by model.
+        """
+        prompt_len = batch_prompt_tkids.size(1)
+        block_size = self.prefix_cache.block_size
+        batch_prompt = batch_prompt_tkids.tolist()
+
+        # Resume from the longest cached prefix shared by all sequences.
+        n_seen, states = self.prefix_cache.match(
+            batch_tkids=[tkids[:prompt_len - 1] for tkids in batch_prompt],
+        )
+        if n_seen > 0:
+            batch_prev_state = model.cat_state(batch_states=states)
+
+        # Feed conditional text block by block and cache model states at
+        # block boundaries.
+        for n_cur_seen in range(
+            (n_seen // block_size + 1) * block_size,
+            prompt_len,
+            block_size,
+        ):
+            _, batch_prev_state = model.forward_step(
+                batch_cur_tkids=batch_prompt_tkids[:, n_seen:n_cur_seen],
+                batch_prev_state=batch_prev_state,
+            )
+            n_seen = n_cur_seen
+
+            for idx, tkids in enumerate(batch_prompt):
+                self.prefix_cache.put(
+                    tkids=tkids[:n_seen],
+                    state=model.select_state(
+                        batch_state=batch_prev_state,
+                        batch_idx=torch.LongTensor([idx]).to(
+                            batch_prompt_tkids.device,
+                        ),
+                    ),
+                )
+
+        return batch_prev_state, n_seen
+
+    def enc_prompt(
+            self,
+            tknzr: BaseTknzr,
+            batch_txt: Sequence[str],
+            num_return_sequences: int = 1,
+    ) -> Tuple[torch.Tensor, List[int]]:
+        r"""Encode conditional text into preallocated output buffer.
+
+        Each text segment is encoded without ``[eos]`` since model is not
+        trained to predict tokens after seeing ``[eos]``, then truncated to
+        satisfy ``self.max_seq_len`` constraint.
+        Output buffer has the maximum sequence length, so generation loops
+        only write to buffer instead of concatenating tensors.
+        Unwritten positions are filled with ``[pad]``.
+        Each text segment is encoded only once and copied to
+        ``num_return_sequences`` consecutive rows.
+
+        Parameters
+        ==========
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        batch_txt: Sequence[str]
+            Batch of text segments to condition on.
+        num_return_sequences: int, optional
+            Number of rows for each text segment.
+            Must satisfy ``num_return_sequences > 0``.
+            Defaults to ``1``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, List[int]]
+            Output buffer with shape ``(B, max_seq_len)`` and
+            ``dtype == torch.int64``, and length of each encoded conditional
+            text.
+            ``B`` is ``len(batch_txt) * num_return_sequences``.
+
+        Raises
+        ======
+        TypeError
+            If ``num_return_sequences`` is not an instance of :py:class:`int`.
+        ValueError
+            If ``num_return_sequences <= 0``.
+        """
+        if not isinstance(num_return_sequences, int):
+            raise TypeError(
+                '`num_return_sequences` must be an instance of `int`.',
+            )
+        if not num_return_sequences > 0:
+            raise ValueError(
+                '`num_return_sequences` must satisfy '
+                + '`num_return_sequences > 0`.',
+            )
+
+        # Encode each text segment into right padded token ids with one more
+        # token id than maximum sequence length.
+        batch_tkids, batch_prompt_len, _ = tknzr.batch_enc(
+            batch_txt,
+            max_seq_len=self.max_seq_len + 1,
+            return_tensors='pt',
+        )
+
+        # Remove the last token id of each text segment, which is either
+        # `[eos]` or exceeds maximum sequence length constraint.
+        batch_prompt_len -= 1
+        batch_tkids[torch.arange(len(batch_txt)), batch_prompt_len] = (
+            tknzr.pad_tkid
+        )
+        batch_tkids = batch_tkids[:, :self.max_seq_len]
+        batch_prompt_len = batch_prompt_len.tolist()
+
+        # Copy each conditional text to `num_return_sequences` rows.
+        if num_return_sequences > 1:
+            batch_tkids = batch_tkids.repeat_interleave(
+                num_return_sequences,
+                dim=0,
+            )
+            batch_prompt_len = [
+                prompt_len
+                for prompt_len in batch_prompt_len
+                for _ in range(num_return_sequences)
+            ]
+
+        return batch_tkids, batch_prompt_len
+
+    @abc.abstractmethod
+    def sample(self, batch_next_tkid_logits: torch.Tensor) -> torch.Tensor:
+        r"""Choose next token ids from next token id logits.
+
+        Logits are unnormalized log probabilities.
+        Subclasses should avoid normalizing logits over the whole vocabulary
+        when possible.
+
+        Parameters
+        ==========
+        batch_next_tkid_logits: torch.Tensor
+            Batch of next token id logits.
+            ``batch_next_tkid_logits`` has shape ``(B, V)`` and
+            ``dtype == torch.float32``.
+
+        Returns
+        =======
+        torch.Tensor
+            Next token ids with shape ``(B, 1)`` and ``dtype == torch.int64``.
+
         Raises
         ======
         NotImplementedError
-            When subclass do not implement text generation.
+            When subclass do not implement next token ids sampling.
         """
         raise NotImplementedError(' '.join([
             f'In class `{self.__class__.__name__}`:',
-            'method `gen` not implemented yet.',
+            'method `sample` not implemented yet.',
         ]))
 
     @staticmethod
@@ -130,8 +754,12 @@ class BaseInfer(abc.ABC):
         True
         >>> args.txt == 'Hello world'
         True
+        >>> args.num_return_sequences == 1
+        True
         >>> args.seed == 42
         True
+        >>> args.stream
+        False
         """
         # Required arguments.
         group = parser.add_argument_group('common arguments')
@@ -155,9 +783,20 @@ class BaseInfer(abc.ABC):
         )
 
         # Optional arguments.
+        group.add_argument(
+            '--num_return_sequences',
+            default=1,
+            help='Number of generated text for conditional text.',
+            type=int,
+        )
         group.add_argument(
             '--seed',
             default=42,
             help='Random seed.',
             type=int,
         )
+        group.add_argument(
+            '--stream',
+            action='store_true',
+            help='Print generated text token by token.',
+        )
@@ -0,0 +1,522 @@
+r"""Beam search inference method."""
+
+import argparse
+from typing import ClassVar, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import torch
+
+from lmp.infer._base import BaseInfer
+from lmp.model import BaseModel
+from lmp.tknzr import BaseTknzr
+
+
+class BeamSearchInfer(BaseInfer):
+    r"""Beam search inference method.
+
+    Keep the ``W`` most probable sequences (beams) at each step, extend each
+    beam with every token id, then keep the ``W`` most probable extended
+    sequences.
+    Sequences ending with ``[eos]`` are finished hypotheses and are scored by
+    their log-likelihood divided by ``(generated length) ** len_penalty``.
+    The best finished hypothesis is chosen as generation result.
+    It is a deterministic algorithm which searches more sequences than
+    :py:class:`lmp.infer.Top1Infer`.
+
+    Beams of all conditional text are fed to model as one batch, thus each
+    step costs one forward pass no matter how many conditional text are
+    searched.
+    Conditional text is fed to model only once, and model state is then
+    copied to every beam.
+    Each step reorder cached model state by beam index with
+    :py:meth:`lmp.model.BaseModel.select_state` instead of recomputing beams
+    from scratch.
+
+    For comment throughout this class, we use ``W`` to denote beam width.
+
+    Parameters
+    ==========
+    beam_width: int
+        Number of beams.
+        Must satisfy ``beam_width > 0``.
+    kwargs: Dict, optional
+        Useless parameter.
+        Intently left for subclass parameters extension.
+    len_penalty: float, optional
+        Length penalty exponent.
+        Larger value favors longer sequences.
+        Defaults to ``1.0``.
+    max_seq_len: str
+        Generated sequence of tokens maximum sequence length constraint.
+        Must satisfy ``0 <= max_seq_len <= BaseInfer.hard_max_seq_len``.
+        If constraint is violated, then replace ``max_seq_len`` with
+        ``BaseInfer.hard_max_seq_len``.
+
+    Attributes
+    ==========
+    beam_width: int
+        Number of beams.
+    infer_name: ClassVar[str]
+        Inference method name is ``beam-search``.
+        Used for command line argument parsing.
+    len_penalty: float
+        Length penalty exponent.
+
+    See Also
+    ========
+    lmp.infer.Top1Infer
+        Top 1 inference method.
+    """
+    infer_name: ClassVar[str] = 'beam-search'
+
+    def __init__(
+            self,
+            beam_width: int,
+            max_seq_len: int,
+            len_penalty: float = 1.0,
+            **kwargs: Optional[Dict],
+    ):
+        super().__init__(max_seq_len=max_seq_len)
+        if not isinstance(beam_width, int):
+            raise TypeError('`beam_width` must be an instance of `int`.')
+        if not beam_width > 0:
+            raise ValueError('`beam_width` must satisfy `beam_width > 0`.')
+        if not isinstance(len_penalty, float):
+            raise TypeError('`len_penalty` must be an instance of `float`.')
+
+        self.beam_width = beam_width
+        self.len_penalty = len_penalty
+
+    @torch.no_grad()
+    def batch_gen_steps(
+            self,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+            batch_txt: Sequence[str],
+            num_return_sequences: int = 1,
+    ) -> Iterator[Tuple[torch.Tensor, int]]:
+        r"""Beam search all conditional text and yield output buffer.
+
+        Each conditional text is searched only once, and beams of all
+        conditional text are searched together with ``self.beam_search``.
+        The ``num_return_sequences`` best hypotheses of each conditional text
+        are written to output buffer in descending order of scores.
+        If there are fewer hypotheses than ``num_return_sequences``, then the
+        last hypothesis is repeated.
+        Output buffer is yielded once before search and once after search.
+
+        Parameters
+        ==========
+        model: lmp.model.BaseModel
+            Pre-trained language model to generate text.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        batch_txt: Sequence[str]
+            Batch of text segments to condition on.
+        num_return_sequences: int, optional
+            Number of generated sequences for each text segment.
+            Must satisfy ``0 < num_return_sequences <= self.beam_width``.
+            Defaults to ``1``.
+
+        Yields
+        ======
+        Tuple[torch.Tensor, int]
+            Output buffer with shape ``(B, max_seq_len)`` and
+            ``dtype == torch.int64``, and write cursor ``out_seq_len``.
+            ``B`` is ``len(batch_txt) * num_return_sequences``.
+
+        Raises
+        ======
+        ValueError
+            If ``num_return_sequences > self.beam_width``.
+
+        See Also
+        ========
+        lmp.infer.BaseInfer.batch_gen_steps
+        """
+        # Nothing to generate when input empty batch.
+        if not batch_txt:
+            return
+
+        # Encode conditional text into preallocated output buffer.
+        # Tensor shape: `(B, max_seq_len)`.
+        # Tensor dtype: `torch.int64`.
+        batch_tkids, batch_prompt_len = self.enc_prompt(
+            tknzr=tknzr,
+            batch_txt=batch_txt,
+            num_return_sequences=num_return_sequences,
+        )
+        if not num_return_sequences <= self.beam_width:
+            raise ValueError(
+                '`num_return_sequences` must satisfy '
+                + '`num_return_sequences <= beam_width`.',
+            )
+
+        # Get model running device.
+        device = next(model.parameters()).device
+
+        # Move tensors to model running device.
+        batch_tkids = batch_tkids.to(device)
+
+        # Write cursor of output buffer.
+        out_seq_len = max(batch_prompt_len)
+
+        # Output conditional text before generation.
+        yield batch_tkids, out_seq_len
+
+        # Copies of the same conditional text are consecutive rows, thus only
+        # the first copy of each conditional text is searched.
+        # Sequences already reaching maximum sequence length are finished.
+        search_idx = [
+            idx
+            for idx in range(0, len(batch_prompt_len), num_return_sequences)
+            if batch_prompt_len[idx] < self.max_seq_len
+        ]
+
+        # Nothing to generate.
+        if not search_idx:
+            return
+
+        batch_hyps = self.beam_search(
+            model=model,
+            tknzr=tknzr,
+            batch_prompt_tkids=[
+                batch_tkids[idx, :batch_prompt_len[idx]]
+                for idx in search_idx
+            ],
+        )
+
+        # Write the best hypotheses to output buffer.
+        for idx, hyps in zip(search_idx, batch_hyps):
+            prompt_len = batch_prompt_len[idx]
+            for rank in range(num_return_sequences):
+                tkids = hyps[min(rank, len(hyps) - 1)]
+                batch_tkids[
+                    idx + rank,
+                    prompt_len:tkids.size(0),
+                ] = tkids[prompt_len:]
+                out_seq_len = max(out_seq_len, tkids.size(0))
+
+        yield batch_tkids, out_seq_len
+
+    @torch.no_grad()
+    def beam_search(
+            self,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+            batch_prompt_tkids: Sequence[torch.Tensor],
+    ) -> List[List[torch.Tensor]]:
+        r"""Beam search conditional on batch of sequences of token ids.
+
+        Beams of all conditional text are rows of one batch, thus each step
+        feeds all beams to model with one forward pass.
+        Each conditional text has at most ``W`` beams, and beams of the same
+        conditional text are consecutive rows.
+        Every row has seen the same number of token ids, so that model states
+        of all rows can be batched.
+
+        Beam search algorithm is structured as follow:
+
+        #. Feed the shortest conditional text length of token ids of every
+           conditional text to model as one batch.
+           (shape: ``(N, S, V)``)
+        #. Use for-loop to generate sequence of token ids.
+
+            #. Conditional text which are not fully fed yet have one row and
+               feed their next conditional token id.
+            #. For every other conditional text, calculate log-likelihood of
+               each of its beam extended with each token id.
+               (shape: ``(W, V)``)
+            #. Take the top ``2W`` extended beams.
+               Extended beams ending with ``[eos]`` and ranked within the top
+               ``W`` become finished hypotheses.
+               The rest ``W`` most probable extended beams become new beams.
+            #. Conditional text with ``W`` finished hypotheses and no beam
+               can score higher than finished hypotheses are finished, and
+               their beams are dropped out of batch.
+            #. Break loop if all conditional text are finished.
+            #. Reorder beam token ids and model state by row indices and
+               write new token ids.
+            #. Feed new token ids of all rows to model as one batch.
+               (shape: ``(R, 1, V)``)
+
+        #. Unfinished beams become hypotheses when reaching
+           ``self.max_seq_len``.
+        #. Return hypotheses of each conditional text in descending order of
+           scores.
+
+        Parameters
+        ==========
+        model: lmp.model.BaseModel
+            Pre-trained language model to generate text.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        batch_prompt_tkids: Sequence[torch.Tensor]
+            Batch of conditional token ids.
+            Each tensor has shape ``(S)`` and ``dtype == torch.int64``.
+            Must satisfy ``0 < S < self.max_seq_len``.
+
+        Returns
+        =======
+        List[List[torch.Tensor]]
+            Hypotheses token ids including conditional token ids of each
+            conditional text, sorted from the best to the worst.
+            Each tensor has shape ``(S')`` and ``dtype == torch.int64`` where
+            ``S' <= self.max_seq_len``.
+        """
+        batch_prompt_len = [tkids.size(0) for tkids in batch_prompt_tkids]
+        min_prompt_len = min(batch_prompt_len)
+        device = batch_prompt_tkids[0].device
+
+        # Each conditional text start with single beam.
+        # `beam_tkids` shape : `(N, max_seq_len)`.
+        # `beam_scores` shape: `(N)`.
+        beam_tkids = torch.full(
+            (len(batch_prompt_tkids), self.max_seq_len),
+            tknzr.pad_tkid,
+            dtype=torch.int64,
+            device=device,
+        )
+        for idx, prompt_tkids in enumerate(batch_prompt_tkids):
+            beam_tkids[idx, :prompt_tkids.size(0)] = prompt_tkids
+        beam_scores = torch.zeros(len(batch_prompt_tkids), device=device)
+
+        # `row_owner[i]` is the conditional text of the `i`-th row.
+        row_owner = list(range(len(batch_prompt_tkids)))
+
+        # Feed the shortest conditional text length of token ids.
+        # Input shape : `(N, S)`.
+        # Output shape: `(N, S, V)`.
+        batch_next_tkids_logits, batch_prev_state = model.forward_step(
+            batch_cur_tkids=beam_tkids[:, :min_prompt_len],
+            batch_prev_state=model.init_state(
+                batch_size=len(batch_prompt_tkids),
+            ),
+        )
+        batch_next_tkid_logits = batch_next_tkids_logits[:, -1]
+
+        # Finished hypotheses of each conditional text are pairs of normalized
+        # score and token ids.
+        batch_hyps: List[List[Tuple[float, torch.Tensor]]] = [
+            [] for _ in batch_prompt_tkids
+        ]
+
+        for seq_len in range(min_prompt_len, self.max_seq_len):
+            # Log-likelihood of each row extended with each token id.
+            # Input shape : `(R, V)`.
+            # Output shape: `(R, V)`.
+            vocab_size = batch_next_tkid_logits.size(-1)
+            cand_scores = (
+                beam_scores.unsqueeze(-1)
+                + batch_next_tkid_logits.log_softmax(dim=-1)
+            )
+
+            new_row_idx: List[int] = []
+            new_tkids: List[int] = []
+            new_scores: List[float] = []
+            new_row_owner: List[int] = []
+
+            # Rows of the same conditional text are consecutive.
+            row_start = 0
+            while row_start < len(row_owner):
+                owner = row_owner[row_start]
+                row_end = row_start + 1
+                while row_end < len(row_owner) and row_owner[row_end] == owner:
+                    row_end += 1
+
+                prompt_len = batch_prompt_len[owner]
+                hyps = batch_hyps[owner]
+
+                # Conditional text is not fully fed yet.
+                if seq_len < prompt_len:
+                    new_row_idx.append(row_start)
+                    new_tkids.append(int(beam_tkids[row_start, seq_len]))
+                    new_scores.append(0.0)
+                    new_row_owner.append(owner)
+                    row_start = row_end
+                    continue
+
+                gen_len = seq_len - prompt_len + 1
+                norm = gen_len ** self.len_penalty
+
+                # Take the top `2W` extended beams.
+                # Input shape : `(W x V)`.
+                # Output shape: `(2W)`.
+                owner_cand_scores = cand_scores[row_start:row_end].reshape(-1)
+                top_scores, top_idx = owner_cand_scores.topk(
+                    k=min(2 * self.beam_width, owner_cand_scores.size(0)),
+                )
+
+                owner_row_idx = []
+                owner_tkids = []
+                owner_scores = []
+                for rank, (score, cand_idx) in enumerate(zip(
+                    top_scores.tolist(),
+                    top_idx.tolist(),
+                )):
+                    beam_idx, tkid = divmod(cand_idx, vocab_size)
+
+                    # Beams ending with `[eos]` are finished.
+                    if tkid == tknzr.eos_tkid:
+                        if rank < self.beam_width:
+                            hyp = beam_tkids[
+                                row_start + beam_idx,
+                                :seq_len + 1,
+                            ].clone()
+                            hyp[seq_len] = tkid
+                            hyps.append((score / norm, hyp))
+                        continue
+
+                    owner_row_idx.append(row_start + beam_idx)
+                    owner_tkids.append(tkid)
+                    owner_scores.append(score)
+
+                    if len(owner_row_idx) == self.beam_width:
+                        break
+
+                # Keep only the best `W` finished hypotheses.
+                hyps.sort(key=lambda hyp: hyp[0], reverse=True)
+                del hyps[self.beam_width:]
+
+                row_start = row_end
+
+                # No beam can score higher than finished hypotheses.
+                if len(hyps) == self.beam_width and (
+                    not owner_scores or hyps[-1][0] >= owner_scores[0] / norm
+                ):
+                    continue
+
+                # Unfinished beams become hypotheses when reaching maximum
+                # sequence length.
+                if seq_len + 1 >= self.max_seq_len:
+                    for row_idx, tkid, score in zip(
+                        owner_row_idx,
+                        owner_tkids,
+                        owner_scores,
+                    ):
+                        hyp = beam_tkids[row_idx].clone()
+                        hyp[seq_len] = tkid
+                        hyps.append((score / norm, hyp))
+                    continue
+
+                new_row_idx.extend(owner_row_idx)
+                new_tkids.extend(owner_tkids)
+                new_scores.extend(owner_scores)
+                new_row_owner.extend([owner] * len(owner_row_idx))
+
+            # Every conditional text is finished.
+            if not new_row_idx:
+                break
+
+            # Reorder rows by row indices and write new token ids.
+            # `beam_tkids` shape: `(R, max_seq_len)`.
+            batch_row_idx = torch.LongTensor(new_row_idx).to(device)
+            beam_tkids = beam_tkids.index_select(0, batch_row_idx)
+            beam_tkids[:, seq_len] = torch.LongTensor(new_tkids).to(device)
+            beam_scores = torch.tensor(new_scores, device=device)
+            row_owner = new_row_owner
+
+            # Reorder cached model state by row indices, then feed new token
+            # ids of all rows as one batch.
+            # Input shape : `(R, 1)`.
+            # Output shape: `(R, 1, V)`.
+            batch_prev_state = model.select_state(
+                batch_state=batch_prev_state,
+                batch_idx=batch_row_idx,
+            )
+            batch_next_tkids_logits, batch_prev_state = model.forward_step(
+                batch_cur_tkids=beam_tkids[:, seq_len:seq_len + 1],
+                batch_prev_state=batch_prev_state,
+            )
+            batch_next_tkid_logits = batch_next_tkids_logits[:, -1]
+
+        # Return hypotheses from the best to the worst.
+        return [
+            [
+                tkids
+                for _, tkids in sorted(
+                    hyps,
+                    key=lambda hyp: hyp[0],
+                    reverse=True,
+                )
+            ]
+            for hyps in batch_hyps
+        ]
+
+    def sample(self, batch_next_tkid_logits: torch.Tensor) -> torch.Tensor:
+        r"""Choose token ids with maximum logits.
+
+        Beam search does not sample token ids one sequence at a time.
+        This is the same as beam search with beam width ``1``.
+
+        Parameters
+        ==========
+        batch_next_tkid_logits: torch.Tensor
+            Batch of next token id logits.
+            ``batch_next_tkid_logits`` has shape ``(B, V)`` and
+            ``dtype == torch.float32``.
+
+        Returns
+        =======
+        torch.Tensor
+            Next token ids with shape ``(B, 1)`` and ``dtype == torch.int64``.
+        """
+        return batch_next_tkid_logits.argmax(dim=-1, keepdim=True)
+
+    @staticmethod
+    def infer_parser(parser: argparse.ArgumentParser) -> None:
+        r"""Beam search inference method CLI arguments parser.
+
+        Parameters
+        ==========
+        parser: argparse.ArgumentParser
+            Parser for CLI arguments.
+
+        See Also
+        ========
+        lmp.script.generate_text
+            Generate text using pre-trained language model.
+
+        Examples
+        ========
+        >>> import argparse
+        >>> from lmp.infer import BeamSearchInfer
+        >>> parser = argparse.ArgumentParser()
+        >>> BeamSearchInfer.infer_parser(parser)
+        >>> args = parser.parse_args([
+        ...     '--beam_width', '4',
+        ...     '--ckpt', '5000',
+        ...     '--exp_name', 'my_exp',
+        ...     '--txt', 'Hello world',
+        ... ])
+        >>> args.beam_width == 4
+        True
+        >>> args.ckpt == 5000
+        True
+        >>> args.exp_name == 'my_exp'
+        True
+        >>> args.len_penalty == 1.0
+        True
+        >>> args.txt == 'Hello world'
+        True
+        >>> args.seed == 42
+        True
+        """
+        # Load common arguments.
+        BaseInfer.infer_parser(parser=parser)
+
+        # Required arguments.
+        group = parser.add_argument_group('inference method arguments')
+        group.add_argument(
+            '--beam_width',
+            help='Number of beams.',
+            required=True,
+            type=int,
+        )
+
+        # Optional arguments.
+        group.add_argument(
+            '--len_penalty',
+            default=1.0,
+            help='Length penalty exponent. Larger value favors longer text.',
+            type=float,
+        )
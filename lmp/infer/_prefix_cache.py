@@ -0,0 +1,270 @@
+r"""Prompt prefix model state cache."""
+
+import collections
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def _n_byte(state: Any) -> int:
+    r"""Calculate memory usage of model state.
+
+    Parameters
+    ==========
+    state: Any
+        Model state which is (nested tuples or lists of) tensors.
+
+    Returns
+    =======
+    int
+        Total number of bytes of all tensors in model state.
+    """
+    if isinstance(state, (list, tuple)):
+        return sum(_n_byte(sub_state) for sub_state in state)
+    return state.element_size() * state.nelement()
+
+
+class _TrieNode:
+    r"""Trie node of :py:class:`lmp.infer.PrefixStateCache`.
+
+    Parameters
+    ==========
+    depth: int
+        Number of token ids from trie root to this node.
+    parent: Optional[_TrieNode]
+        Parent node.
+        Root node has no parent.
+    tkid: int
+        Token id on the edge from parent node to this node.
+    """
+    __slots__ = ('children', 'depth', 'parent', 'tkid')
+
+    def __init__(self, depth: int, parent: Optional['_TrieNode'], tkid: int):
+        self.children: Dict[int, '_TrieNode'] = {}
+        self.depth = depth
+        self.parent = parent
+        self.tkid = tkid
+
+
+class PrefixStateCache:
+    r"""LRU cache of model states after prompt prefixes.
+
+    Map sequence of token ids (a prompt prefix) to model state after seeing
+    that prefix.
+    Prefixes are stored in a trie, thus longest cached prefix of a prompt can
+    be found by walking down the trie once.
+    Model states are evicted in least recently used order whenever total size
+    of cached tensors exceeds ``max_byte``.
+
+    Generation resumes from cached model state instead of re-running the
+    whole prompt.
+    Inference methods only store model states at multiples of
+    ``block_size`` token ids, so prompts sharing the same template or system
+    prompt can reuse model state of their common prefix.
+
+    A cache must only be used with one model, since cached model states are
+    only meaningful to the model which created them.
+    Beam search and speculative decoding override
+    :py:meth:`lmp.infer.BaseInfer.batch_gen_steps` and do not use the cache.
+
+    Parameters
+    ==========
+    max_byte: int
+        Maximum total number of bytes of cached model states.
+        Must satisfy ``max_byte >= 0``.
+    block_size: int, optional
+        Number of token ids between cached prefix lengths.
+        Must satisfy ``block_size > 0``.
+        Defaults to ``16``.
+
+    Attributes
+    ==========
+    block_size: int
+        Number of token ids between cached prefix lengths.
+    max_byte: int
+        Maximum total number of bytes of cached model states.
+    n_byte: int
+        Current total number of bytes of cached model states.
+    n_hit: int
+        Number of lookups which found cached model state.
+    n_miss: int
+        Number of lookups which found no cached model state.
+
+    Examples
+    ========
+    >>> import torch
+    >>> from lmp.infer import PrefixStateCache
+    >>> cache = PrefixStateCache(max_byte=1024)
+    >>> cache.put([0, 5, 6], torch.zeros(1, 4))
+    >>> n_tkid, states = cache.match([[0, 5, 6, 7], [0, 5]])
+    >>> n_tkid
+    0
+    >>> n_tkid, states = cache.match([[0, 5, 6, 7], [0, 5, 6, 8]])
+    >>> n_tkid
+    3
+    >>> cache.n_hit, cache.n_miss
+    (2, 2)
+    """
+
+    def __init__(self, max_byte: int, block_size: int = 16):
+        if not isinstance(max_byte, int):
+            raise TypeError('`max_byte` must be an instance of `int`.')
+        if not max_byte >= 0:
+            raise ValueError('`max_byte` must satisfy `max_byte >= 0`.')
+        if not isinstance(block_size, int):
+            raise TypeError('`block_size` must be an instance of `int`.')
+        if not block_size > 0:
+            raise ValueError('`block_size` must satisfy `block_size > 0`.')
+
+        self.block_size = block_size
+        self.max_byte = max_byte
+        self.n_byte = 0
+        self.n_hit = 0
+        self.n_miss = 0
+
+        self.root = _TrieNode(depth=0, parent=None, tkid=-1)
+
+        # Cached model states in least recently used order.
+        self.lru: collections.OrderedDict = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.lru)
+
+    def put(self, tkids: Sequence[int], state: Any) -> None:
+        r"""Cache model state after seeing ``tkids``.
+
+        Least recently used model states are evicted if total size exceeds
+        ``self.max_byte``.
+        Model states larger than ``self.max_byte`` are not cached.
+
+        Parameters
+        ==========
+        tkids: Sequence[int]
+            Prompt prefix token ids.
+        state: Any
+            Model state with batch size ``1`` after seeing ``tkids``.
+
+        Returns
+        =======
+        None
+        """
+        n_byte = _n_byte(state)
+        if n_byte > self.max_byte or not tkids:
+            return
+
+        # Walk down the trie and create missing nodes.
+        node = self.root
+        for tkid in tkids:
+            if tkid not in node.children:
+                node.children[tkid] = _TrieNode(
+                    depth=node.depth + 1,
+                    parent=node,
+                    tkid=tkid,
+                )
+            node = node.children[tkid]
+
+        # Replace existing model state.
+        if node in self.lru:
+            self.n_byte -= self.lru.pop(node)[1]
+
+        self.lru[node] = (state, n_byte)
+        self.n_byte += n_byte
+
+        # Evict least recently used model states.
+        while self.n_byte > self.max_byte:
+            self.evict()
+
+    def evict(self) -> None:
+        r"""Evict the least recently used model state.
+
+        Trie nodes which no longer lead to any cached model state are removed.
+
+        Returns
+        =======
+        None
+        """
+        node, (_, n_byte) = self.lru.popitem(last=False)
+        self.n_byte -= n_byte
+
+        # Prune trie branch.
+        while node.parent is not None and not node.children:
+            if node in self.lru:
+                break
+            del node.parent.children[node.tkid]
+            node = node.parent
+
+    def match(
+            self,
+            batch_tkids: Sequence[Sequence[int]],
+    ) -> Tuple[int, List[Optional[Any]]]:
+        r"""Find the longest prefix length cached for every sequence.
+
+        Each sequence walks down the trie once to collect all cached prefix
+        lengths.
+        The longest length shared by all sequences is chosen so that all
+        returned model states have seen the same number of token ids and
+        can be batched together.
+        With one sequence, this is the longest prefix match.
+
+        Each sequence count as a hit if a cached model state is returned for
+        it, otherwise count as a miss.
+
+        Parameters
+        ==========
+        batch_tkids: Sequence[Sequence[int]]
+            Batch of prompt token ids.
+
+        Returns
+        =======
+        Tuple[int, List[Optional[Any]]]
+            Matched prefix length and cached model state of each sequence.
+            If no prefix is matched, then prefix length is ``0`` and model
+            states are ``None``.
+        """
+        if not batch_tkids:
+            return 0, []
+
+        # Collect cached trie nodes along each sequence.
+        batch_nodes = []
+        for tkids in batch_tkids:
+            nodes = {}
+            node = self.root
+            for tkid in tkids:
+                node = node.children.get(tkid)
+                if node is None:
+                    break
+                if node in self.lru:
+                    nodes[node.depth] = node
+            batch_nodes.append(nodes)
+
+        # Longest prefix length shared by all sequences.
+        n_tkid = max(
+            set.intersection(*[set(nodes) for nodes in batch_nodes]),
+            default=0,
+        )
+
+        if n_tkid == 0:
+            self.n_miss += len(batch_tkids)
+            return 0, [None] * len(batch_tkids)
+
+        self.n_hit += len(batch_tkids)
+        states = []
+        for nodes in batch_nodes:
+            node = nodes[n_tkid]
+            self.lru.move_to_end(node)
+            states.append(self.lru[node][0])
+
+        return n_tkid, states
+
+    def stats(self) -> Dict[str, int]:
+        r"""Get cache statistics.
+
+        Returns
+        =======
+        Dict[str, int]
+            Number of cached model states, total bytes, hits and misses.
+        """
+        return {
+            'n_byte': self.n_byte,
+            'n_hit': self.n_hit,
+            'n_miss': self.n_miss,
+            'n_state': len(self),
+        }
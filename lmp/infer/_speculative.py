@@ -0,0 +1,479 @@
+r"""Speculative decoding inference method."""
+
+import argparse
+from typing import ClassVar, Dict, Iterator, Optional, Sequence, Tuple
+
+import torch
+
+import lmp.util.cfg
+import lmp.util.model
+from lmp.infer._base import BaseInfer, _gumbel_max
+from lmp.model import BaseModel
+from lmp.tknzr import BaseTknzr
+
+
+class SpeculativeInfer(BaseInfer):
+    r"""Speculative decoding inference method.
+
+    A small draft language model proposes ``N`` next token ids one by one,
+    then the large (target) language model verifies all proposed token ids in
+    one forward pass.
+    Each proposed token id ``x`` is accepted with probability
+    ``min(1, p(x) / q(x))`` where ``p`` and ``q`` are target and draft model
+    next token probability distribution, respectively.
+    When a proposed token id is rejected, the rest proposals are discarded
+    and a token id is sampled from ``max(0, p - q)`` (normalized) instead.
+    When every proposed token id is accepted, one more token id is sampled
+    from target model for free.
+    Generated text follows exactly the same distribution as sampling from
+    target model alone (see :py:meth:`lmp.infer.SpeculativeInfer.sample`),
+    but target model runs only one forward pass for up to ``N + 1`` token
+    ids.
+
+    Both models must share the same tokenizer.
+    Draft model is loaded from experiment ``draft_exp_name`` on checkpoint
+    ``draft_ckpt`` at the first generation, or can be assigned directly to
+    ``draft_model`` attribute.
+
+    For comment throughout this class, we use ``N`` to denote the number of
+    proposed token ids in each round.
+
+    Parameters
+    ==========
+    draft_ckpt: int
+        Pre-trained draft language model checkpoint.
+    draft_exp_name: str
+        Pre-trained draft language model experiment name.
+    kwargs: Dict, optional
+        Useless parameter.
+        Intently left for subclass parameters extension.
+    max_seq_len: str
+        Generated sequence of tokens maximum sequence length constraint.
+        Must satisfy ``0 <= max_seq_len <= BaseInfer.hard_max_seq_len``.
+        If constraint is violated, then replace ``max_seq_len`` with
+        ``BaseInfer.hard_max_seq_len``.
+    n_draft: int, optional
+        Number of token ids proposed by draft model in each round.
+        Must satisfy ``n_draft > 0``.
+        Defaults to ``4``.
+
+    Attributes
+    ==========
+    draft_ckpt: int
+        Pre-trained draft language model checkpoint.
+    draft_exp_name: str
+        Pre-trained draft language model experiment name.
+    draft_model: Optional[lmp.model.BaseModel]
+        Draft language model.
+        Set to ``None`` until draft language model is loaded.
+    infer_name: ClassVar[str]
+        Inference method name is ``speculative``.
+        Used for command line argument parsing.
+    n_draft: int
+        Number of token ids proposed by draft model in each round.
+
+    See Also
+    ========
+    lmp.infer.TopKInfer
+        Top ``K`` inference method.
+    """
+    infer_name: ClassVar[str] = 'speculative'
+
+    def __init__(
+            self,
+            draft_ckpt: int,
+            draft_exp_name: str,
+            max_seq_len: int,
+            n_draft: int = 4,
+            **kwargs: Optional[Dict],
+    ):
+        super().__init__(max_seq_len=max_seq_len)
+        if not isinstance(draft_ckpt, int):
+            raise TypeError('`draft_ckpt` must be an instance of `int`.')
+        if not isinstance(draft_exp_name, str):
+            raise TypeError('`draft_exp_name` must be an instance of `str`.')
+        if not isinstance(n_draft, int):
+            raise TypeError('`n_draft` must be an instance of `int`.')
+        if not n_draft > 0:
+            raise ValueError('`n_draft` must satisfy `n_draft > 0`.')
+
+        self.draft_ckpt = draft_ckpt
+        self.draft_exp_name = draft_exp_name
+        self.draft_model: Optional[BaseModel] = None
+        self.n_draft = n_draft
+
+    def load_draft_model(
+            self,
+            tknzr: BaseTknzr,
+            device: torch.device,
+    ) -> BaseModel:
+        r"""Load draft language model if not loaded yet.
+
+        Parameters
+        ==========
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer shared by draft and target models.
+        device: torch.device
+            Model running device.
+
+        Returns
+        =======
+        lmp.model.BaseModel
+            Draft language model in evaluation mode on running device.
+        """
+        if self.draft_model is None:
+            draft_cfg = lmp.util.cfg.load(exp_name=self.draft_exp_name)
+            self.draft_model = lmp.util.model.load(
+                ckpt=self.draft_ckpt,
+                tknzr=tknzr,
+                **draft_cfg.__dict__,
+            )
+
+        # Set draft model to evaluation mode and move to running device.
+        self.draft_model = self.draft_model.eval().to(device)
+
+        return self.draft_model
+
+    @torch.no_grad()
+    def batch_gen_steps(
+            self,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+            batch_txt: Sequence[str],
+            num_return_sequences: int = 1,
+    ) -> Iterator[Tuple[torch.Tensor, int]]:
+        r"""Speculatively decode each conditional text and yield output buffer.
+
+        Each conditional text is generated with ``self.spec_decode``.
+        Output buffer is yielded once before generation and once after each
+        round of draft and verification.
+        Each copy of conditional text is decoded independently since draft
+        and verification accept different numbers of token ids for each
+        copy.
+
+        Parameters
+        ==========
+        model: lmp.model.BaseModel
+            Pre-trained target language model to generate text.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+        batch_txt: Sequence[str]
+            Batch of text segments to condition on.
+        num_return_sequences: int, optional
+            Number of generated sequences for each text segment.
+            Must satisfy ``num_return_sequences > 0``.
+            Defaults to ``1``.
+
+        Yields
+        ======
+        Tuple[torch.Tensor, int]
+            Output buffer with shape ``(B, max_seq_len)`` and
+            ``dtype == torch.int64``, and write cursor ``out_seq_len``.
+            ``B`` is ``len(batch_txt) * num_return_sequences``.
+
+        See Also
+        ========
+        lmp.infer.BaseInfer.batch_gen_steps
+        """
+        # Nothing to generate when input empty batch.
+        if not batch_txt:
+            return
+
+        # Encode conditional text into preallocated output buffer.
+        # Tensor shape: `(B, max_seq_len)`.
+        # Tensor dtype: `torch.int64`.
+        batch_tkids, batch_prompt_len = self.enc_prompt(
+            tknzr=tknzr,
+            batch_txt=batch_txt,
+            num_return_sequences=num_return_sequences,
+        )
+
+        # Get model running device.
+        device = next(model.parameters()).device
+
+        # Move tensors to model running device.
+        batch_tkids = batch_tkids.to(device)
+
+        # Write cursor of output buffer.
+        out_seq_len = max(batch_prompt_len)
+
+        # Output conditional text before generation.
+        yield batch_tkids, out_seq_len
+
+        draft_model = self.load_draft_model(tknzr=tknzr, device=device)
+
+        for idx, prompt_len in enumerate(batch_prompt_len):
+            # Sequences already reaching maximum sequence length are
+            # finished.
+            if prompt_len >= self.max_seq_len:
+                continue
+
+            for seq_len in self.spec_decode(
+                draft_model=draft_model,
+                model=model,
+                prompt_len=prompt_len,
+                tkids=batch_tkids[idx],
+                tknzr=tknzr,
+            ):
+                out_seq_len = max(out_seq_len, seq_len)
+                yield batch_tkids, out_seq_len
+
+    @torch.no_grad()
+    def spec_decode(
+            self,
+            draft_model: BaseModel,
+            model: BaseModel,
+            prompt_len: int,
+            tkids: torch.Tensor,
+            tknzr: BaseTknzr,
+    ) -> Iterator[int]:
+        r"""Speculatively decode single sequence of token ids.
+
+        Speculative decoding algorithm is structured as follow:
+
+        #. Use while-loop to generate sequence of token ids.
+
+            #. Feed token ids not yet seen by draft model, then let draft model
+               propose ``N`` token ids one by one.
+               Proposal stops early at ``[eos]``.
+               Draft model state after each proposal is kept.
+            #. Feed token ids not yet seen by target model together with all
+               proposed token ids to target model in one forward pass.
+               (shape: ``(1, N+1, V)``)
+            #. Accept each proposed token id ``x`` with probability
+               ``min(1, p(x) / q(x))`` until the first rejection.
+            #. On rejection, sample a token id from normalized
+               ``max(0, p - q)``.
+               Otherwise sample one more token id from target model.
+            #. Target model state is only kept when every proposal is
+               accepted.
+               Recurrent states cannot be rolled back, thus on rejection
+               accepted token ids are fed again in the next verification
+               pass, which costs no extra forward pass.
+               Draft model state is rolled back to the state after the last
+               accepted proposal.
+            #. Yield write cursor.
+            #. Break loop if ``[eos]`` is generated or token ids sequence
+               length reaches ``self.max_seq_len``.
+
+        Parameters
+        ==========
+        draft_model: lmp.model.BaseModel
+            Pre-trained draft language model to propose token ids.
+        model: lmp.model.BaseModel
+            Pre-trained target language model to verify token ids.
+        prompt_len: int
+            Conditional token ids length.
+            Must satisfy ``0 < prompt_len < self.max_seq_len``.
+        tkids: torch.Tensor
+            Output buffer of single sequence with shape ``(max_seq_len)`` and
+            ``dtype == torch.int64``.
+            Conditional token ids are already written.
+            Generated token ids are written in place.
+        tknzr: lmp.tknzr.BaseTknzr
+            Pre-trained tokenizer for text segment encoding.
+
+        Yields
+        ======
+        int
+            Write cursor after each round.
+            Only ``tkids[:seq_len]`` has been written, and positions after
+            write cursor are ``[pad]``.
+        """
+        device = tkids.device
+
+        # Model states and number of token ids seen by each model.
+        draft_prev_state = draft_model.init_state(batch_size=1)
+        draft_seen_len = 0
+        prev_state = model.init_state(batch_size=1)
+        seen_len = 0
+
+        seq_len = prompt_len
+        while seq_len < self.max_seq_len:
+            # Leave room for one token id sampled from target model.
+            n_draft = min(self.n_draft, self.max_seq_len - seq_len - 1)
+
+            # Draft model proposes token ids one by one.
+            # Probability distributions of proposals are kept for acceptance
+            # test.
+            # `draft_states[i]` has seen `seq_len + i` token ids.
+            draft_probs = []
+            draft_states = []
+            draft_cur_tkids = tkids[draft_seen_len:seq_len].unsqueeze(0)
+            is_draft_eos = False
+            for i in range(n_draft):
+                draft_logits, draft_prev_state = draft_model.forward_step(
+                    batch_cur_tkids=draft_cur_tkids,
+                    batch_prev_state=draft_prev_state,
+                )
+                draft_states.append(draft_prev_state)
+
+                # Sample proposal from draft model.
+                # Output shape: `(1, 1)`.
+                draft_cur_tkids = _gumbel_max(draft_logits[:, -1])
+                draft_probs.append(draft_logits[0, -1].softmax(dim=-1))
+                tkids[seq_len + i] = draft_cur_tkids[0, 0]
+
+                # Stop proposing after `[eos]`.
+                if draft_cur_tkids.item() == tknzr.eos_tkid:
+                    n_draft = i + 1
+                    is_draft_eos = True
+                    break
+
+            # Proposals are written into `tkids[seq_len:draft_end]`.
+            draft_end = seq_len + n_draft
+
+            # Target model verifies all proposals in one forward pass.
+            # Input  shape: `(1, S+N)`.
+            # Output shape: `(N+1, V)`.
+            logits, cur_state = model.forward_step(
+                batch_cur_tkids=tkids[seen_len:seq_len + n_draft].unsqueeze(0),
+                batch_prev_state=prev_state,
+            )
+            logits = logits[0, seq_len - seen_len - 1:]
+
+            # Accept each proposal with probability `min(1, p(x) / q(x))` until
+            # the first rejection.
+            n_accept = 0
+            if n_draft > 0:
+                probs = logits[:n_draft].softmax(dim=-1)
+                draft_probs = torch.stack(draft_probs)
+                draft_tkids = tkids[seq_len:seq_len + n_draft].unsqueeze(-1)
+                p_x = probs.gather(-1, draft_tkids)[:, 0]
+                q_x = draft_probs.gather(-1, draft_tkids)[:, 0]
+                is_accept = torch.rand(n_draft, device=device) * q_x < p_x
+                n_accept = int(is_accept.cumprod(dim=0).sum())
+
+            if n_accept == n_draft:
+                # Every proposal is accepted, thus target model state is
+                # valid.
+                prev_state = cur_state
+                seen_len = seq_len + n_draft
+                if n_draft > 0:
+                    draft_prev_state = draft_states[-1]
+                    draft_seen_len = seq_len + n_draft - 1
+                seq_len += n_draft
+
+                # Nothing follows `[eos]`.
+                if is_draft_eos:
+                    yield seq_len
+                    break
+
+                # Sample one more token id from target model.
+                next_tkid = self.sample(batch_next_tkid_logits=logits[-1:])
+            else:
+                # Roll back draft model state to the last valid state.
+                draft_prev_state = draft_states[n_accept]
+                draft_seen_len = seq_len + n_accept
+
+                # Sample from normalized `max(0, p - q)` at rejected position.
+                # Fall back to `p` when `p` and `q` are identical.
+                residual = (probs[n_accept] - draft_probs[n_accept]).clamp(
+                    min=0.0,
+                )
+                if not residual.sum() > 0:
+                    residual = probs[n_accept]
+                next_tkid = torch.multinomial(residual, num_samples=1)
+                seq_len += n_accept
+
+            # Write sampled token id.
+            tkids[seq_len] = next_tkid.view(-1)[0]
+            seq_len += 1
+
+            # Rejected proposals are left after write cursor.
+            # Reset them so that unwritten positions are filled with `[pad]`.
+            tkids[seq_len:draft_end] = tknzr.pad_tkid
+
+            yield seq_len
+
+            # Stop at `[eos]`.
+            if tkids[seq_len - 1].item() == tknzr.eos_tkid:
+                break
+
+    def sample(self, batch_next_tkid_logits: torch.Tensor) -> torch.Tensor:
+        r"""Sample token ids from target model next token distribution.
+
+        Speculative decoding generates text following the same distribution
+        as sampling token ids with this method.
+
+        Parameters
+        ==========
+        batch_next_tkid_logits: torch.Tensor
+            Batch of next token id logits.
+            ``batch_next_tkid_logits`` has shape ``(B, V)`` and
+            ``dtype == torch.float32``.
+
+        Returns
+        =======
+        torch.Tensor
+            Next token ids with shape ``(B, 1)`` and ``dtype == torch.int64``.
+        """
+        return _gumbel_max(batch_next_tkid_logits)
+
+    @staticmethod
+    def infer_parser(parser: argparse.ArgumentParser) -> None:
+        r"""Speculative decoding inference method CLI arguments parser.
+
+        Parameters
+        ==========
+        parser: argparse.ArgumentParser
+            Parser for CLI arguments.
+
+        See Also
+        ========
+        lmp.script.generate_text
+            Generate text using pre-trained language model.
+
+        Examples
+        ========
+        >>> import argparse
+        >>> from lmp.infer import SpeculativeInfer
+        >>> parser = argparse.ArgumentParser()
+        >>> SpeculativeInfer.infer_parser(parser)
+        >>> args = parser.parse_args([
+        ...     '--ckpt', '5000',
+        ...     '--draft_ckpt', '1000',
+        ...     '--draft_exp_name', 'my_draft_exp',
+        ...     '--exp_name', 'my_exp',
+        ...     '--txt', 'Hello world',
+        ... ])
+        >>> args.ckpt == 5000
+        True
+        >>> args.draft_ckpt == 1000
+        True
+        >>> args.draft_exp_name == 'my_draft_exp'
+        True
+        >>> args.exp_name == 'my_exp'
+        True
+        >>> args.n_draft == 4
+        True
+        >>> args.txt == 'Hello world'
+        True
+        >>> args.seed == 42
+        True
+        """
+        # Load common arguments.
+        BaseInfer.infer_parser(parser=parser)
+
+        # Required arguments.
+        group = parser.add_argument_group('inference method arguments')
+        group.add_argument(
+            '--draft_ckpt',
+            help='Pre-trained draft language model checkpoint.',
+            required=True,
+            type=int,
+        )
+        group.add_argument(
+            '--draft_exp_name',
+            help='Pre-trained draft language model experiment name.',
+            required=True,
+            type=str,
+        )
+
+        # Optional arguments.
+        group.add_argument(
+            '--n_draft',
+            default=4,
+            help='Number of token ids proposed by draft model in each round.',
+            type=int,
+        )
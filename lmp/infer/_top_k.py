@@ -5,9 +5,7 @@ from typing import ClassVar, Dict, Optional
 
 import torch
 
-from lmp.infer._base import BaseInfer
-from lmp.model import BaseModel
-from lmp.tknzr import BaseTknzr
+from lmp.infer._base import BaseInfer, _gumbel_max
 
 
 class TopKInfer(BaseInfer):
@@ -62,189 +60,75 @@ class TopKInfer(BaseInfer):
 
         self.k = k
 
-    @torch.no_grad()
-    def gen(
-            self,
-            model: BaseModel,
-            tknzr: BaseTknzr,
-            txt: str,
-    ) -> str:
-        r"""Generate text conditional on text segment.
+    def sample(self, batch_next_tkid_logits: torch.Tensor) -> torch.Tensor:
+        r"""Sample token ids from the top ``K`` highest logits.
 
-        Top ``K`` inference algorithm is structured as follow:
+        Top ``K`` sampling algorithm is structured as follow:
 
-        #. Encode input text as ``1`` sample batch.
-           (shape: ``(1, S')``)
-        #. Remove ``[eos]`` token since model is not trained to predict tokens
-           after seeing ``[eos]``.
-           (shape: ``(1, S'-1)`` or ``(1, S)`` where ``S'-1 = S``)
-        #. Truncate text to satisfy maximum sequence constraint.
-           (shape: ``(1, S)`` or ``(1, max_seq_len)``)
-        #. Use for-loop to generate sequence of token ids.
+        #. Get the top ``K`` highest logits and their respective indices.
+           Softmax preserves order, thus they are the same as the top ``K``
+           highest probabilities.
+           (shape: ``(B, K)``)
+        #. Sample ``1`` index from top ``K`` indices tensor with Gumbel-max
+           trick, which is equivalent to sampling from softmax over only the
+           top ``K`` logits.
+           Use sampled index as next token id prediction result.
+           (shape: ``(B, 1)``)
 
-            #. Use ``model.pred()`` to get next token ids probability
-               distribution.
-               (shape: ``(1, S, V)``)
-            #. Get the last next token id probability distribution.
-               (shape: ``(1, V)``)
-            #. Get the top ``K`` highest probability distribution and their
-               respective indices.
-               (shape: ``(1, K)``)
-            #. Use top ``K`` highest probability to construct multinomial
-               distribution.
-            #. Sample ``1`` index from top ``K`` indices tensor using
-               previously constructed multinomial distribution.
-               Use sampled index as next token id prediction result.
-               (shape: ``(1, 1)``)
-            #. Concate the last next token id prediction result with previous
-               next token id prediction result.
-               (shape: ``(1, S+1)``)
-            #. Break loop if token ids sequence length violate
-               ``self.max_seq_len`` constraint.
-            #. Break loop if the last next token id prediction is ``[eos]``.
-            #. Otherwise go to the for-loop start and continue generation.
-
-        #. Decode generated sequence of token ids to text and return.
+        No softmax over the whole vocabulary is calculated.
 
         Parameters
         ==========
-        model: lmp.model.BaseModel
-            Pre-trained language model to generate text.
-        tknzr: lmp.tknzr.BaseTknzr
-            Pre-trained tokenizer for text segment encoding.
-        txt: str
-            Text segment to condition on.
+        batch_next_tkid_logits: torch.Tensor
+            Batch of next token id logits.
+            ``batch_next_tkid_logits`` has shape ``(B, V)`` and
+            ``dtype == torch.float32``.
 
         Returns
         =======
-        str
-            Generated text.
+        torch.Tensor
+            Next token ids with shape ``(B, 1)`` and ``dtype == torch.int64``.
         """
-        # Encode as 1 sample batch.
-        batch_prev_tkids = tknzr.batch_enc(batch_txt=[txt], max_seq_len=-1)
-
-        # Convert to tensor with `dtype == torch.int64`.
-        # Tensor shape: `(1, S')`.
-        # Tensor dtype: `torch.int64`.
-        batch_prev_tkids = torch.LongTensor(batch_prev_tkids)
-
-        # Remove `[eos]` token id since model is not trained to predict tokens
-        # after seeing `[eos]`.
-        # Tensor shape: `(1, S'-1)` or `(1, S)`.
-        # Tensor dtype: `torch.int64`.
-        batch_prev_tkids = batch_prev_tkids[..., :-1]
-
-        # Satisty maximum sequence length constraint.
-        # If sequence length is longer than constraint, then truncate tensor
-        # to have shape `(1, self.max_seq_len)`.
-        # Otherwise tensor shape remain the same.
-        batch_prev_tkids = batch_prev_tkids[..., :self.max_seq_len]
-
-        # Get model running device.
-        device = next(model.parameters()).device
-
-        # Move tensors to model running device.
-        batch_prev_tkids = batch_prev_tkids.to(device)
-
-        # Calculate how many token can be generate at most.
-        # `out_seq_len` satisfy `0 <= out_seq_len <= self.max_seq_len`.
-        out_seq_len = self.max_seq_len - batch_prev_tkids.size(1)
-
-        # Generate tokens.
-        for _ in range(out_seq_len):
-            # Get probability distribution with current token ids.
-            # Input tensor : Current token ids.
-            # Input shape  : `(1, S)`.
-            # Input dtype  : `torch.int64`.
-            # Output tensor: Next token ids probability distribution.
-            # Output shape : `(1, S, V)`.
-            # Output dtype : `torch.float32`.
-            batch_next_tkids_probs = model.pred(
-                batch_prev_tkids=batch_prev_tkids
-            )
-
-            # Get the last token id probability distribution.
-            # Only need the last token since we already know every previous
-            # token ids.
-            # Input tensor : Next token ids probability distribution.
-            # Input shape  : `(1, S, V)`.
-            # Input dtype  : `torch.float32`.
-            # Output tensor: The last next token id probability distribution.
-            # Output shape : `(1, V)`.
-            # Output dtype : `torch.float32`.
-            batch_next_tkid_probs = batch_next_tkids_probs[:, -1]
-
-            # Use the top K highest probabilities among the rest as possible
-            # next token prediction result.
-            # Input tensor                   : The last next token id
-            #                                  probability distribution.
-            # Input shape                    : `(1, V)`.
-            # Input dtype                    : `torch.float32`.
-            # `batch_topk_tkid_probs` tensor : The top K next token id
-            #                                  probability distribution.
-            # `batch_topk_tkid_probs` shape  : `(1, K)`.
-            # `batch_topk_tkid_probs` dtype  : `torch.float32`.
-            # `batch_topk_tkid` tensor       : The top K next token id.
-            # `batch_topk_tkid` shape        : `(1, K)`.
-            # `batch_topk_tkid` dtype        : `torch.int64`.
-            (
-                batch_topk_tkid_probs,
-                batch_topk_tkid,
-            ) = batch_next_tkid_probs.topk(
-                k=self.k,
-                dim=-1,
-            )
-
-            # Use the top K highest probabilities to construct multinomial
-            # distribution, then sample index from multinomial distribution as
-            # the last next token id prediction result.
-            # Input tensor          : The top K next token id probability
-            #                         distribution.
-            # Input shape           : `(1, K)`.
-            # Input dtype           : `torch.float32`.
-            # Candidate index tensor: Sampled index of the top K next token id.
-            #                         Sampled index is not a token id but is
-            #                         an index of top K next token id tensor.
-            # Candidate index shape : `(1, 1)`.
-            # Candidate index dtype : `torch.int64`.
-            # Next token id tensor  : Sampled token id from top K.
-            #                         Use sampled index to get sampled token
-            #                         id from top K next token id tensor.
-            # Next token id shape   : `(1, 1)`.
-            # Next token id dtype   : `torch.int64`.
-            batch_next_tkid_cand_idx = torch.multinomial(
-                batch_topk_tkid_probs,
-                num_samples=1,
-            )
-            batch_next_tkid = torch.gather(
-                batch_topk_tkid,
-                -1,
-                batch_next_tkid_cand_idx,
-            )
-
-            # Concate the last next token id prediction result with previous
-            # token ids prediction result and use to perform further
-            # prediction.
-            # `batch_prev_tkids` shape: `(1, S)`.
-            # `batch_prev_tkids` dtype: `torch.int64`.
-            # `batch_next_tkid`  shape: `(1, 1)`.
-            # `batch_next_tkid`  dtype: `torch.int64`.
-            # Output shape            : `(1, S+1)`.
-            # Output dtype            : `torch.int64`.
-            batch_prev_tkids = torch.cat(
-                [batch_prev_tkids, batch_next_tkid],
-                dim=-1
-            )
-
-            # If the prediction token id is `[eos]`, then stop prediction.
-            if batch_next_tkid[0, 0].item() == tknzr.eos_tkid:
-                break
+        # Use the top K highest logits among the rest as possible next token
+        # prediction result.
+        # Input tensor                   : The last next token id logits.
+        # Input shape                    : `(B, V)`.
+        # Input dtype                    : `torch.float32`.
+        # `batch_topk_tkid_logits` tensor: The top K next token id logits.
+        # `batch_topk_tkid_logits` shape : `(B, K)`.
+        # `batch_topk_tkid_logits` dtype : `torch.float32`.
+        # `batch_topk_tkid` tensor       : The top K next token id.
+        # `batch_topk_tkid` shape        : `(B, K)`.
+        # `batch_topk_tkid` dtype        : `torch.int64`.
+        (
+            batch_topk_tkid_logits,
+            batch_topk_tkid,
+        ) = batch_next_tkid_logits.topk(
+            k=self.k,
+            dim=-1,
+        )
 
-        # Output generated text.
-        return tknzr.batch_dec(
-            batch_tkids=batch_prev_tkids.tolist(),
-            rm_sp_tks=True,
-        )[0]
+        # Sample index from the top K logits with Gumbel-max trick as the last
+        # next token id prediction result.
+        # Input tensor          : The top K next token id logits.
+        # Input shape           : `(B, K)`.
+        # Input dtype           : `torch.float32`.
+        # Candidate index tensor: Sampled index of the top K next token id.
+        #                         Sampled index is not a token id but is
+        #                         an index of top K next token id tensor.
+        # Candidate index shape : `(B, 1)`.
+        # Candidate index dtype : `torch.int64`.
+        # Next token id tensor  : Sampled token id from top K.
+        #                         Use sampled index to get sampled token
+        #                         id from top K next token id tensor.
+        # Next token id shape   : `(B, 1)`.
+        # Next token id dtype   : `torch.int64`.
+        batch_next_tkid_cand_idx = _gumbel_max(batch_topk_tkid_logits)
+        return torch.gather(
+            batch_topk_tkid,
+            -1,
+            batch_next_tkid_cand_idx,
+        )
 
     @staticmethod
     def infer_parser(parser: argparse.ArgumentParser) -> None:
@@ -4,7 +4,7 @@ import abc
 import argparse
 import os
 import re
-from typing import ClassVar, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional, Sequence, Tuple
 
 import torch
 
@@ -25,9 +25,16 @@ class BaseModel(abc.ABC, torch.nn.Module):
     - ``B``: Batch size.
     - ``E``: Token embedding dimension.
     - ``H``: Hidden representation dimension.
+    - ``L``: Number of recurrent layers.
     - ``S``: Length of sequence of tokens.
     - ``V``: Vocabulary size.
 
+    Step-wise inference is provided by ``self.init_state`` and ``self.step``.
+    A model state summarizes every token ids seen so far, thus each new token
+    id only cost one recurrent step instead of re-running the whole prefix.
+    Model states are (nested tuples or lists of) tensors which first
+    dimension is always the batch dimension ``B``.
+
     Parameters
     ==========
     kwargs: Dict, optional
@@ -143,6 +150,167 @@ class BaseModel(abc.ABC, torch.nn.Module):
             'method `pred` not implemented yet.',
         ]))
 
+    @abc.abstractmethod
+    def init_state(self, batch_size: int) -> Any:
+        r"""Create initial model state for step-wise inference.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        Any
+            Initial model state.
+            All tensors in model state have batch size ``batch_size`` on
+            their first dimension.
+
+        Raises
+        ======
+        NotImplementedError
+            When subclass do not implement initial model state.
+
+        See Also
+        ========
+        lmp.model.BaseModel.step
+        """
+        raise NotImplementedError(' '.join([
+            f'In class `{self.__class__.__name__}`:',
+            'method `init_state` not implemented yet.',
+        ]))
+
+    @abc.abstractmethod
+    def forward_step(
+            self,
+            batch_cur_tkids: torch.Tensor,
+            batch_prev_state: Any,
+    ) -> Tuple[torch.Tensor, Any]:
+        r"""Perform forward pass continuing from previous model state.
+
+        Parameters
+        ==========
+        batch_cur_tkids: torch.Tensor
+            Batch of token ids which are not yet seen by model.
+            ``batch_cur_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+        batch_prev_state: Any
+            Model state returned by ``self.init_state`` or previous call of
+            ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, Any]
+            Next token logits of ``batch_cur_tkids`` with shape ``(B, S, V)``
+            and model state after seeing ``batch_cur_tkids``.
+
+        Raises
+        ======
+        NotImplementedError
+            When subclass do not implement step-wise forward pass.
+        """
+        raise NotImplementedError(' '.join([
+            f'In class `{self.__class__.__name__}`:',
+            'method `forward_step` not implemented yet.',
+        ]))
+
+    @abc.abstractmethod
+    def step(
+            self,
+            batch_cur_tkids: torch.Tensor,
+            batch_prev_state: Any,
+    ) -> Tuple[torch.Tensor, Any]:
+        r"""Step-wise next token prediction.
+
+        Calling ``self.step`` on a sequence chunk by chunk gives the same
+        prediction as calling ``self.pred`` on the whole sequence.
+
+        Parameters
+        ==========
+        batch_cur_tkids: torch.Tensor
+            Batch of token ids which are not yet seen by model.
+            ``batch_cur_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+        batch_prev_state: Any
+            Model state returned by ``self.init_state`` or previous call of
+            ``self.step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, Any]
+            Next token prediction of ``batch_cur_tkids`` with shape
+            ``(B, S, V)`` and model state after seeing ``batch_cur_tkids``.
+
+        Raises
+        ======
+        NotImplementedError
+            When subclass do not implement step-wise next token prediction.
+
+        See Also
+        ========
+        lmp.model.BaseModel.init_state
+        lmp.model.BaseModel.pred
+        """
+        raise NotImplementedError(' '.join([
+            f'In class `{self.__class__.__name__}`:',
+            'method `step` not implemented yet.',
+        ]))
+
+    def select_state(
+            self,
+            batch_state: Any,
+            batch_idx: torch.Tensor,
+    ) -> Any:
+        r"""Select rows of model state along batch dimension.
+
+        Since the first dimension of every tensor in model state is the batch
+        dimension, the same ``batch_idx`` is applied to every tensor.
+        This can be used to drop finished sequences out of a batch, reorder
+        sequences or repeat sequences.
+
+        Parameters
+        ==========
+        batch_state: Any
+            Model state returned by ``self.init_state`` or ``self.step``.
+        batch_idx: torch.Tensor
+            Indices of rows to select.
+            ``batch_idx`` has shape ``(B')`` and ``dtype == torch.int64``.
+
+        Returns
+        =======
+        Any
+            Model state with batch size ``B'``.
+        """
+        if isinstance(batch_state, (list, tuple)):
+            return type(batch_state)(
+                self.select_state(batch_state=state, batch_idx=batch_idx)
+                for state in batch_state
+            )
+        return batch_state.index_select(0, batch_idx)
+
+    def cat_state(self, batch_states: Sequence[Any]) -> Any:
+        r"""Concatenate model states along batch dimension.
+
+        All model states must have seen the same number of token ids.
+
+        Parameters
+        ==========
+        batch_states: Sequence[Any]
+            Model states returned by ``self.init_state`` or ``self.step``.
+
+        Returns
+        =======
+        Any
+            Model state which batch size is the sum of batch sizes of
+            ``batch_states``.
+        """
+        if isinstance(batch_states[0], (list, tuple)):
+            return type(batch_states[0])(
+                self.cat_state(batch_states=states)
+                for states in zip(*batch_states)
+            )
+        return torch.cat(list(batch_states), dim=0)
+
     @torch.no_grad()
     def ppl(
             self,
@@ -424,6 +592,8 @@ class BaseModel(abc.ABC, torch.nn.Module):
         True
         >>> args.seed == 42
         True
+        >>> args.stride is None
+        True
         >>> args.tknzr_exp_name == 'my_tknzr_exp'
         True
         >>> args.ver == 'train'
@@ -538,3 +708,16 @@ class BaseModel(abc.ABC, torch.nn.Module):
             help='Random seed.',
             type=int,
         )
+        group.add_argument(
+            '--stride',
+            default=None,
+            help=' '.join([
+                'Cut text into overlapping windows of length `--max_seq_len`',
+                'starting at multiples of `--stride` instead of truncating',
+                'text.',
+                'Must equal to `--max_seq_len - 1` so that each token is',
+                'used as prediction target exactly once.',
+                'Truncate text if not set.',
+            ]),
+            type=int,
+        )
@@ -1,7 +1,8 @@
 r"""LSTM language model."""
 
-from typing import ClassVar, Dict, Optional
+from typing import ClassVar, Dict, Optional, Tuple
 
+import torch
 import torch.nn as nn
 
 from lmp.model._rnn import RNNModel
@@ -108,3 +109,23 @@ class LSTMModel(RNNModel):
                 dropout=p_hid,
                 batch_first=True
             )
+
+    def init_state(self, batch_size: int) -> Tuple[torch.Tensor, ...]:
+        r"""Create initial model state for step-wise inference.
+
+        LSTM layers need both hidden states and cell states, and both are
+        initialized with zeros.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, ...]
+            Initial hidden states and cell states.
+            Both have shape ``(B, L, H)`` and ``dtype == torch.float32``.
+        """
+        hid_state = super().init_state(batch_size=batch_size)
+        return (hid_state, torch.zeros_like(hid_state))
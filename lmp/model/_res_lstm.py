@@ -1,7 +1,8 @@
 r"""LSTM language model with residual connection."""
 
-from typing import ClassVar, Dict, Optional
+from typing import Any, ClassVar, Dict, List, Optional
 
+import torch
 import torch.nn as nn
 
 from lmp.model._res_rnn import ResRNNBlock, ResRNNModel
@@ -70,6 +71,29 @@ class ResLSTMBlock(ResRNNBlock):
             for _ in range(n_hid_lyr)
         ])
 
+    def init_state(self, batch_size: int) -> List[Any]:
+        r"""Create initial hidden states for step-wise inference.
+
+        Each LSTM layer need both hidden state and cell state, and both are
+        initialized with zeros.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        List[Any]
+            Zero initial hidden states and cell states for each layer in
+            ``self.recur``.
+            Each state has shape ``(B, 1, H)`` and ``dtype == torch.float32``.
+        """
+        return [
+            (hid_state, torch.zeros_like(hid_state))
+            for hid_state in super().init_state(batch_size=batch_size)
+        ]
+
 
 class ResLSTMModel(ResRNNModel):
     r"""LSTM language model with residual connection.
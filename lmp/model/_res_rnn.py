@@ -1,11 +1,11 @@
 r"""RNN language model with residual connection."""
 
-from typing import ClassVar, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import torch
 import torch.nn as nn
 
-from lmp.model._rnn import RNNModel
+from lmp.model._rnn import RNNModel, _swap_batch_dim
 from lmp.tknzr._base import BaseTknzr
 
 
@@ -165,6 +165,81 @@ class ResRNNBlock(nn.Module):
 
         return batch_out
 
+    def init_state(self, batch_size: int) -> List[Any]:
+        r"""Create initial hidden states for step-wise inference.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        List[Any]
+            Zero initial hidden states for each layer in ``self.recur``.
+            Each hidden state has shape ``(B, 1, H)`` and
+            ``dtype == torch.float32``.
+        """
+        return [
+            torch.zeros(
+                (batch_size, 1, recur.hidden_size),
+                device=recur.weight_hh_l0.device,
+            )
+            for recur in self.recur
+        ]
+
+    def forward_step(
+            self,
+            batch_tk_reps: torch.Tensor,
+            batch_prev_states: List[Any],
+    ) -> Tuple[torch.Tensor, List[Any]]:
+        r"""Perform forward pass continuing from previous hidden states.
+
+        Same algorithm as ``self.forward`` except that each layer in
+        ``self.recur`` start encoding from its previous hidden state.
+
+        Parameters
+        ==========
+        batch_tk_reps: torch.Tensor
+            Batch of current token hidden representation.
+            ``batch_tk_reps`` has shape ``(B, S, H)`` and
+            ``dtype == torch.float32``.
+        batch_prev_states: List[Any]
+            Hidden states of each layer returned by ``self.init_state`` or
+            previous call of ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, List[Any]]
+            Temporal features with shape ``(B, S, H)`` and hidden states of
+            each layer after seeing ``batch_tk_reps``.
+        """
+        # Initialize input of first block.
+        batch_in = batch_tk_reps
+        batch_cur_states = []
+
+        # Pair recurrent layer, dropout and previous hidden state.
+        for recur, dp, prev_state in zip(
+            self.recur,
+            self.dp,
+            batch_prev_states,
+        ):
+            # Encode temporal features.
+            # Input shape : `(B, S, H)`.
+            # Output shape: `(B, S, H)`.
+            batch_out, cur_state = recur(batch_in, _swap_batch_dim(prev_state))
+            batch_cur_states.append(_swap_batch_dim(cur_state))
+
+            # Drop features on output of residual connection.
+            # Input shape : `(B, S, H)`.
+            # Output shape: `(B, S, H)`.
+            batch_out = dp(batch_out + batch_in)
+
+            # Replace input of next block with output of previous block.
+            batch_in = batch_out
+
+        return batch_out, batch_cur_states
+
 
 class ResRNNModel(RNNModel):
     r"""RNN language model with residual connection.
@@ -346,3 +421,74 @@ class ResRNNModel(RNNModel):
         # Input  shape: `(B, S, E)`.
         # Output shape: `(B, S, V)`.
         return batch @ self.emb.weight.transpose(0, 1)
+
+    def init_state(self, batch_size: int) -> List[Any]:
+        r"""Create initial model state for step-wise inference.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        List[Any]
+            Initial hidden states of each residual connected recurrent layer.
+        """
+        return self.hid.init_state(batch_size=batch_size)
+
+    def forward_step(
+            self,
+            batch_cur_tkids: torch.Tensor,
+            batch_prev_state: Any,
+    ) -> Tuple[torch.Tensor, Any]:
+        r"""Perform forward pass continuing from previous model state.
+
+        Parameters
+        ==========
+        batch_cur_tkids: torch.Tensor
+            Batch of token ids which are not yet seen by model.
+            ``batch_cur_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+        batch_prev_state: Any
+            Model state returned by ``self.init_state`` or previous call of
+            ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, Any]
+            Next token logits of ``batch_cur_tkids`` with shape ``(B, S, V)``
+            and model state after seeing ``batch_cur_tkids``.
+        """
+        # Token embedding lookup.
+        # Input  shape: `(B, S)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.emb(batch_cur_tkids)
+
+        # Token embedding dropout.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.emb_dp(batch)
+
+        # Transform from embedding dimension to hidden dimension.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, H)`.
+        batch = self.pre_hid(batch)
+
+        # Encode temporal features starting from previous hidden states.
+        # Input  shape: `(B, S, H)`.
+        # Output shape: `(B, S, H)`.
+        batch, batch_cur_state = self.hid.forward_step(
+            batch_tk_reps=batch,
+            batch_prev_states=batch_prev_state,
+        )
+
+        # Transform from hidden dimension to embedding dimension.
+        # Input  shape: `(B, S, H)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.post_hid(batch)
+
+        # Transform from embedding dimension to vocabulary dimension.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, V)`.
+        return batch @ self.emb.weight.transpose(0, 1), batch_cur_state
@@ -1,7 +1,8 @@
 r"""Residual connected LSTM language model with self attention mechanism."""
 
-from typing import ClassVar, Dict, Optional
+from typing import Any, ClassVar, Dict, List, Optional
 
+import torch
 import torch.nn as nn
 
 from lmp.model._res_sattn_rnn import ResSAttnRNNBlock, ResSAttnRNNModel
@@ -59,6 +60,28 @@ class ResSAttnLSTMBlock(ResSAttnRNNBlock, SAttnRNNBlock):
             for _ in range(n_hid_lyr)
         ])
 
+    def init_state(self, batch_size: int) -> List[Any]:
+        r"""Create initial layer states for step-wise inference.
+
+        Each LSTM layer need both hidden state and cell state, and both are
+        initialized with zeros.
+        Key and value caches are initialized as empty sequences.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        List[Any]
+            Initial states for each layer in ``self.recur``.
+        """
+        return [
+            ((hid_state, torch.zeros_like(hid_state)), k, v)
+            for hid_state, k, v in super().init_state(batch_size=batch_size)
+        ]
+
 
 class ResSAttnLSTMModel(ResSAttnRNNModel):
     r"""Residual connected LSTM language model with self attention mechanism.
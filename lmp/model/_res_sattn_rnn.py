@@ -1,11 +1,12 @@
 r"""Residual connected RNN language model with self attention mechanism."""
 
 import math
-from typing import ClassVar, Dict, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import torch
 import torch.nn.functional as F
 
+from lmp.model._rnn import _swap_batch_dim
 from lmp.model._sattn_rnn import SAttnRNNBlock, SAttnRNNModel
 from lmp.tknzr._base import BaseTknzr
 
@@ -163,6 +164,97 @@ class ResSAttnRNNBlock(SAttnRNNBlock):
 
         return batch
 
+    def forward_step(
+            self,
+            batch_tk_reps: torch.Tensor,
+            batch_prev_states: List[Any],
+    ) -> Tuple[torch.Tensor, List[Any]]:
+        r"""Perform forward pass continuing from previous layer states.
+
+        Same algorithm as ``self.forward`` but reuse cached recurrent hidden
+        states, key and value features.
+        See :py:meth:`lmp.model.SAttnRNNBlock.forward_step` for details.
+
+        Parameters
+        ==========
+        batch_tk_reps: torch.Tensor
+            Batch of current token hidden representation.
+            ``batch_tk_reps`` has shape ``(B, S, H)`` and
+            ``dtype == torch.float32``.
+        batch_prev_states: List[Any]
+            Layer states returned by ``self.init_state`` or previous call of
+            ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, List[Any]]
+            Residual connected self attention recurrent features with shape
+            ``(B, S, H)`` and layer states after seeing ``batch_tk_reps``.
+        """
+        # Initialize input of first block.
+        batch = batch_tk_reps
+        batch_cur_states = []
+
+        # Auto-regressive masks are shared by all layers.
+        # Output shape: `(1, S, P+S)`.
+        batch_tk_mask = self.create_step_mask(
+            n_cur=batch.size(1),
+            n_prev=batch_prev_states[0][1].size(1),
+            device=batch.device,
+        )
+
+        # Self attention RNN loops.
+        for (recur, query, key, value, out, dp, prev_state) in zip(
+            self.recur,
+            self.query,
+            self.key,
+            self.value,
+            self.out,
+            self.dp,
+            batch_prev_states,
+        ):
+            prev_hid_state, prev_k, prev_v = prev_state
+
+            # Encode temporal features starting from previous hidden state.
+            # Input  shape: `(B, S, H)`.
+            # Output shape: `(B, S, H)`.
+            batch_recur, cur_hid_state = recur(
+                batch,
+                _swap_batch_dim(prev_hid_state),
+            )
+
+            # Transform temporal features to query, key and value features,
+            # then append key and value features to caches.
+            # Query         shape: `(B, S, H)`.
+            # Key and value shape: `(B, P+S, H)`.
+            q = query(batch_recur)
+            k = torch.cat([prev_k, key(batch_recur)], dim=1)
+            v = torch.cat([prev_v, value(batch_recur)], dim=1)
+
+            # Calculate self attention scores with query and cached key
+            # features.
+            # Input  shape: `(B, S, H)`.
+            # Output shape: `(B, S, P+S)`.
+            attn = q @ k.transpose(-1, -2) / math.sqrt(batch.size(-1))
+            attn.masked_fill_(batch_tk_mask, -1e9)
+            attn = F.softmax(attn, dim=-1)
+
+            # Use attention scores to calculate weighted sum on cached value
+            # features.
+            # Then perform one more linear tranformation on weighted sum.
+            # Finally add residual connection and dropout some features.
+            # Input  shape: `(B, S, P+S)`.
+            # Output shape: `(B, S, H)`.
+            batch = dp(out(attn @ v) + batch)
+
+            batch_cur_states.append((
+                _swap_batch_dim(cur_hid_state),
+                k,
+                v,
+            ))
+
+        return batch, batch_cur_states
+
 
 class ResSAttnRNNModel(SAttnRNNModel):
     r"""Residual connected RNN language model with self attention mechanism.
@@ -1,7 +1,7 @@
 r"""Vanilla RNN language model."""
 
 import argparse
-from typing import ClassVar, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import torch
 import torch.nn as nn
@@ -11,6 +11,19 @@ from lmp.model._base import BaseModel
 from lmp.tknzr._base import BaseTknzr
 
 
+def _swap_batch_dim(hid_state: Any) -> Any:
+    r"""Swap first two dimensions of recurrent hidden states.
+
+    Model states are batch first, while :py:class:`torch.nn.RNN`,
+    :py:class:`torch.nn.GRU` and :py:class:`torch.nn.LSTM` use shape
+    ``(L, B, H)`` for their hidden states (even if ``batch_first=True``).
+    LSTM hidden states are tuples of hidden and cell states.
+    """
+    if isinstance(hid_state, tuple):
+        return tuple(_swap_batch_dim(state) for state in hid_state)
+    return hid_state.transpose(0, 1).contiguous()
+
+
 class RNNModel(BaseModel):
     r"""Vanilla RNN language model.
 
@@ -354,6 +367,129 @@ class RNNModel(BaseModel):
         # Output dtype : `torch.float32`.
         return F.softmax(logits, dim=-1)
 
+    def init_state(self, batch_size: int) -> Any:
+        r"""Create initial model state for step-wise inference.
+
+        Initial hidden states of all recurrent layers are zeros, which is the
+        same as what ``self.hid`` used in ``self.forward``.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        torch.Tensor
+            Initial hidden states with shape ``(B, L, H)`` and
+            ``dtype == torch.float32``.
+        """
+        return torch.zeros(
+            (batch_size, self.hid.num_layers, self.hid.hidden_size),
+            device=self.emb.weight.device,
+        )
+
+    def forward_step(
+            self,
+            batch_cur_tkids: torch.Tensor,
+            batch_prev_state: Any,
+    ) -> Tuple[torch.Tensor, Any]:
+        r"""Perform forward pass continuing from previous model state.
+
+        Same algorithm as ``self.forward`` except that ``self.hid`` start
+        encoding from ``batch_prev_state`` instead of zeros.
+
+        Parameters
+        ==========
+        batch_cur_tkids: torch.Tensor
+            Batch of token ids which are not yet seen by model.
+            ``batch_cur_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+        batch_prev_state: Any
+            Model state returned by ``self.init_state`` or previous call of
+            ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, Any]
+            Next token logits of ``batch_cur_tkids`` with shape ``(B, S, V)``
+            and model state after seeing ``batch_cur_tkids``.
+        """
+        # Token embedding lookup.
+        # Input  shape: `(B, S)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.emb(batch_cur_tkids)
+
+        # Token embedding dropout.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.emb_dp(batch)
+
+        # Transform from embedding dimension to hidden dimension.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, H)`.
+        batch = self.pre_hid(batch)
+
+        # Encode temporal features starting from previous hidden states.
+        # Recurrent layers expect hidden states with shape `(L, B, H)`.
+        # Input  shape: `(B, S, H)`.
+        # Output shape: `(B, S, H)`.
+        batch, batch_cur_state = self.hid(
+            batch,
+            _swap_batch_dim(batch_prev_state),
+        )
+
+        # Transform from hidden dimension to embedding dimension.
+        # Input  shape: `(B, S, H)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.post_hid(batch)
+
+        # Transform from embedding dimension to vocabulary dimension.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, V)`.
+        return (
+            batch @ self.emb.weight.transpose(0, 1),
+            _swap_batch_dim(batch_cur_state),
+        )
+
+    def step(
+            self,
+            batch_cur_tkids: torch.Tensor,
+            batch_prev_state: Any,
+    ) -> Tuple[torch.Tensor, Any]:
+        r"""Step-wise next token prediction.
+
+        Use ``self.forward_step`` ouput logits to calculate next token
+        probabilities.
+        Feed the whole conditional text as the first chunk, then feed each
+        generated token id one by one.
+
+        Parameters
+        ==========
+        batch_cur_tkids: torch.Tensor
+            Batch of token ids which are not yet seen by model.
+            ``batch_cur_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+        batch_prev_state: Any
+            Model state returned by ``self.init_state`` or previous call of
+            ``self.step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, Any]
+            Softmax prediction for next token with shape ``(B, S, V)`` and
+            model state after seeing ``batch_cur_tkids``.
+        """
+        logits, batch_cur_state = self.forward_step(
+            batch_cur_tkids=batch_cur_tkids,
+            batch_prev_state=batch_prev_state,
+        )
+
+        # Convert logits to probabilities using softmax.
+        # Input  shape: `(B, S, V)`.
+        # Output shape: `(B, S, V)`.
+        return F.softmax(logits, dim=-1), batch_cur_state
+
     @staticmethod
     def train_parser(parser: argparse.ArgumentParser) -> None:
         r"""Training vanilla RNN language model CLI arguments parser.
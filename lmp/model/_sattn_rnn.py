@@ -1,13 +1,13 @@
 r"""RNN language model with self attention mechanism."""
 
 import math
-from typing import ClassVar, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
-from lmp.model._rnn import RNNModel
+from lmp.model._rnn import RNNModel, _swap_batch_dim
 from lmp.tknzr._base import BaseTknzr
 
 
@@ -54,6 +54,7 @@ class SAttnRNNBlock(nn.Module):
 
     - ``B``: Batch size.
     - ``H``: Hidden representation dimension.
+    - ``P``: Number of cached keys and values during step-wise inference.
     - ``S``: Length of sequence of tokens.
 
     Parameters
@@ -288,6 +289,180 @@ class SAttnRNNBlock(nn.Module):
 
         return batch
 
+    def init_state(self, batch_size: int) -> List[Any]:
+        r"""Create initial layer states for step-wise inference.
+
+        Each layer state is a tuple of recurrent hidden state, cached key
+        features and cached value features.
+        Recurrent hidden states are initialized with zeros and caches are
+        initialized as empty sequences.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        List[Any]
+            Initial states for each layer in ``self.recur``.
+            Hidden states have shape ``(B, 1, H)`` and caches have shape
+            ``(B, 0, H)``.
+        """
+        states = []
+        for recur, key in zip(self.recur, self.key):
+            hid_state = torch.zeros(
+                (batch_size, 1, recur.hidden_size),
+                device=key.weight.device,
+            )
+            cache = torch.zeros(
+                (batch_size, 0, key.out_features),
+                device=key.weight.device,
+            )
+            states.append((hid_state, cache, cache))
+
+        return states
+
+    def create_step_mask(
+            self,
+            n_cur: int,
+            n_prev: int,
+            device: torch.device,
+    ) -> torch.Tensor:
+        r"""Create auto-regressive self attention masks for cached keys.
+
+        Queries of current chunk can see all cached keys, and can only see
+        keys of current chunk up to themselves.
+
+        Unlike :py:meth:`lmp.model.SAttnRNNModel.create_mask`, no ``[pad]``
+        masks are applied.
+        ``create_mask`` masks every key of a ``[pad]`` query, thus a ``[pad]``
+        query attends uniformly to all keys including keys after it, which
+        cannot be reproduced when future keys are not seen yet.
+        Thus step-wise inputs must not contain ``[pad]``.
+        Inference methods never feed ``[pad]`` to model (see
+        :py:meth:`lmp.infer.BaseInfer.batch_gen_steps`).
+
+        Parameters
+        ==========
+        n_cur: int
+            Number of current token ids.
+        n_prev: int
+            Number of cached keys.
+        device: torch.device
+            Device of the created mask.
+
+        Returns
+        =======
+        torch.Tensor
+            Self attention masks with shape ``(1, n_cur, n_prev + n_cur)`` and
+            ``dtype == torch.bool``.
+        """
+        mask = torch.ones(
+            (1, n_cur, n_prev + n_cur),
+            dtype=torch.bool,
+            device=device,
+        )
+        return torch.triu(mask, diagonal=n_prev + 1)
+
+    def forward_step(
+            self,
+            batch_tk_reps: torch.Tensor,
+            batch_prev_states: List[Any],
+    ) -> Tuple[torch.Tensor, List[Any]]:
+        r"""Perform forward pass continuing from previous layer states.
+
+        Same algorithm as ``self.forward`` but only calculate query, key and
+        value features for current token hidden representations.
+        Key and value features of previous tokens are taken from caches in
+        ``batch_prev_states``, thus each step only calculate attention scores
+        of current queries against cached keys instead of the full ``S x S``
+        attention scores.
+        No ``[pad]`` masks are applied, thus results are the same as
+        ``self.forward`` only if current and previous tokens contain no
+        ``[pad]`` (see ``self.create_step_mask``).
+
+        Parameters
+        ==========
+        batch_tk_reps: torch.Tensor
+            Batch of current token hidden representation.
+            ``batch_tk_reps`` has shape ``(B, S, H)`` and
+            ``dtype == torch.float32``.
+            Must not be representations of ``[pad]``.
+        batch_prev_states: List[Any]
+            Layer states returned by ``self.init_state`` or previous call of
+            ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, List[Any]]
+            Self attention recurrent features with shape ``(B, S, H)`` and
+            layer states after seeing ``batch_tk_reps``.
+        """
+        # Initialize input of first block.
+        batch = batch_tk_reps
+        batch_cur_states = []
+
+        # Auto-regressive masks are shared by all layers.
+        # Output shape: `(1, S, P+S)`.
+        batch_tk_mask = self.create_step_mask(
+            n_cur=batch.size(1),
+            n_prev=batch_prev_states[0][1].size(1),
+            device=batch.device,
+        )
+
+        # Self attention RNN loops.
+        for (recur, query, key, value, out, dp, prev_state) in zip(
+            self.recur,
+            self.query,
+            self.key,
+            self.value,
+            self.out,
+            self.dp,
+            batch_prev_states,
+        ):
+            prev_hid_state, prev_k, prev_v = prev_state
+
+            # Encode temporal features starting from previous hidden state.
+            # Input  shape: `(B, S, H)`.
+            # Output shape: `(B, S, H)`.
+            batch_recur, cur_hid_state = recur(
+                batch,
+                _swap_batch_dim(prev_hid_state),
+            )
+
+            # Transform temporal features to query, key and value features,
+            # then append key and value features to caches.
+            # Query         shape: `(B, S, H)`.
+            # Key and value shape: `(B, P+S, H)`.
+            q = query(batch_recur)
+            k = torch.cat([prev_k, key(batch_recur)], dim=1)
+            v = torch.cat([prev_v, value(batch_recur)], dim=1)
+
+            # Calculate self attention scores with query and cached key
+            # features.
+            # Input  shape: `(B, S, H)`.
+            # Output shape: `(B, S, P+S)`.
+            attn = q @ k.transpose(-1, -2) / math.sqrt(batch.size(-1))
+            attn.masked_fill_(batch_tk_mask, -1e9)
+            attn = F.softmax(attn, dim=-1)
+
+            # Use attention scores to calculate weighted sum on cached value
+            # features.
+            # Then perform one more linear tranformation on weighted sum.
+            # Finally dropout transformed features.
+            # Input  shape: `(B, S, P+S)`.
+            # Output shape: `(B, S, H)`.
+            batch = dp(out(attn @ v))
+
+            batch_cur_states.append((
+                _swap_batch_dim(cur_hid_state),
+                k,
+                v,
+            ))
+
+        return batch, batch_cur_states
+
 
 class SAttnRNNModel(RNNModel):
     r"""RNN language model with self attention mechanism.
@@ -531,3 +706,83 @@ class SAttnRNNModel(RNNModel):
         # Input  shape: `(B, S, E)`.
         # Output shape: `(B, S, V)`.
         return batch @ self.emb.weight.transpose(0, 1)
+
+    def init_state(self, batch_size: int) -> List[Any]:
+        r"""Create initial model state for step-wise inference.
+
+        Parameters
+        ==========
+        batch_size: int
+            Number of sequences to generate in parallel.
+
+        Returns
+        =======
+        List[Any]
+            Initial recurrent hidden states and empty key / value caches of
+            each self attention layer.
+        """
+        return self.hid.init_state(batch_size=batch_size)
+
+    def forward_step(
+            self,
+            batch_cur_tkids: torch.Tensor,
+            batch_prev_state: Any,
+    ) -> Tuple[torch.Tensor, Any]:
+        r"""Perform forward pass continuing from previous model state.
+
+        Same algorithm as ``self.forward`` except that ``self.hid`` reuse
+        cached recurrent hidden states, key and value features.
+        ``[pad]`` masks of ``self.create_mask`` cannot be applied step by
+        step, thus step-wise prediction is the same as ``self.pred`` only on
+        token ids without ``[pad]``.
+        See :py:meth:`lmp.model.SAttnRNNBlock.create_step_mask` for details.
+
+        Parameters
+        ==========
+        batch_cur_tkids: torch.Tensor
+            Batch of token ids which are not yet seen by model.
+            ``batch_cur_tkids`` has shape ``(B, S)`` and
+            ``dtype == torch.int64``.
+            Must not contain ``[pad]``.
+        batch_prev_state: Any
+            Model state returned by ``self.init_state`` or previous call of
+            ``self.forward_step``.
+
+        Returns
+        =======
+        Tuple[torch.Tensor, Any]
+            Next token logits of ``batch_cur_tkids`` with shape ``(B, S, V)``
+            and model state after seeing ``batch_cur_tkids``.
+        """
+        # Token embedding lookup.
+        # Input  shape: `(B, S)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.emb(batch_cur_tkids)
+
+        # Token embedding dropout.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.emb_dp(batch)
+
+        # Transform from embedding dimension to hidden dimension.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, H)`.
+        batch = self.pre_hid(batch)
+
+        # Encode temporal features with cached layer states.
+        # Input  shape: `(B, S, H)`.
+        # Output shape: `(B, S, H)`.
+        batch, batch_cur_state = self.hid.forward_step(
+            batch_tk_reps=batch,
+            batch_prev_states=batch_prev_state,
+        )
+
+        # Transform from hidden dimension to embedding dimension.
+        # Input  shape: `(B, S, H)`.
+        # Output shape: `(B, S, E)`.
+        batch = self.post_hid(batch)
+
+        # Transform from embedding dimension to vocabulary dimension.
+        # Input  shape: `(B, S, E)`.
+        # Output shape: `(B, S, V)`.
+        return batch @ self.emb.weight.transpose(0, 1), batch_cur_state
@@ -0,0 +1,552 @@
+r"""Benchmark text generation throughput and latency.
+
+Measure performance of inference methods with randomly initialized language
+models.
+No pre-trained tokenizer or language model is needed, thus results only
+depend on model architecture, hyperparameters and inference method.
+Random-weight models generate meaningless text, but the amount of computation
+of each generation step is the same as pre-trained models.
+
+A character tokenizer with exactly ``--vocab_size`` tokens (including special
+tokens) is built from synthetic characters, and each conditional text consists
+of ``--prompt_len`` random characters.
+For each model in ``--model_names``, inference method in ``--infer_names``,
+batch size in ``--batch_sizes`` and maximum sequence length in ``--seq_lens``,
+generation is run ``--n_rep`` times after one warm up run.
+
+The following metrics are reported:
+
+- ``tkps``: Number of generated tokens per second.
+- ``ttft_ms``: Median time to first token (in milliseconds), i.e., time from
+  calling :py:meth:`lmp.infer.BaseInfer.batch_gen_steps` to the first written
+  generated token.
+- ``p50_ms``, ``p95_ms``, ``p99_ms``: Percentiles of per-token latency (in
+  milliseconds), i.e., time between consecutive writes of output buffer after
+  the first generated token.
+  Inference methods which write multiple tokens at once (e.g., beam search
+  and speculative decoding) report latency between writes.
+  Percentiles are ``null`` (printed as ``n/a``) if there is no latency sample,
+  e.g., beam search writes output buffer only once.
+- ``n_latency``, ``n_ttft``: Number of samples which latency percentiles and
+  time to first token are based on.
+  Fewer latency samples than generated tokens means multiple tokens are
+  written at once.
+- ``n_tk``: Total number of generated tokens of all timed runs.
+  Sequences may stop early when ``[eos]`` is generated.
+
+Results are printed and written to ``--out`` as JSON so that runs can be
+compared across commits.
+
+See Also
+========
+lmp.infer
+    All available inference methods.
+lmp.model
+    All available models.
+lmp.script.generate_text
+    Generate text using pre-trained language model.
+
+Examples
+========
+The following example benchmark all models with ``top-1`` and ``top-k``
+inference methods and write results to ``bench.json``.
+
+.. code-block::
+
+    python -m lmp.script.bench_infer \
+        --infer_names top-1 top-k \
+        --out bench.json
+
+The following example benchmark LSTM model with batch sizes ``1`` and ``32``
+and maximum sequence lengths ``64`` and ``256``.
+
+.. code-block::
+
+    python -m lmp.script.bench_infer \
+        --batch_sizes 1 32 \
+        --model_names LSTM \
+        --out bench.json \
+        --seq_lens 64 256
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+from typing import Dict, List, Optional
+
+import torch
+
+import lmp.util.infer
+import lmp.util.model
+import lmp.util.rand
+from lmp.infer import INFER_OPTS, BaseInfer, SpeculativeInfer
+from lmp.model import MODEL_OPTS, BaseModel
+from lmp.tknzr import BaseTknzr, CharTknzr
+
+
+def parse_arg() -> argparse.Namespace:
+    r"""Parse arguments from CLI.
+
+    Parse benchmark settings, model hyperparameters and inference method
+    hyperparameters.
+
+    --batch_sizes     Batch sizes to benchmark.
+    --beam_width      Beam search beam width.
+    --d_emb           Token embedding dimension.
+    --d_hid           Hidden dimension.
+    --infer_names     Inference methods to benchmark.
+    --k               Top-k inference method ``k``.
+    --model_names     Language models to benchmark.
+    --n_draft         Speculative decoding number of proposed tokens.
+    --n_hid_lyr       Number of hidden layers.
+    --n_rep           Number of timed runs.
+    --out             Output JSON file path.
+    --p               Top-p inference method ``p``.
+    --prompt_len      Number of characters of conditional text.
+    --seed            Random seed.
+    --seq_lens        Maximum sequence lengths to benchmark.
+    --vocab_size      Tokenizer vocabulary size.
+
+    Returns
+    =======
+    argparse.Namespace
+        Arguments from CLI.
+    """
+    # Create parser.
+    parser = argparse.ArgumentParser(
+        'python -m lmp.script.bench_infer',
+        description='Benchmark text generation throughput and latency.',
+    )
+
+    # Benchmark arguments.
+    parser.add_argument(
+        '--batch_sizes',
+        default=[1, 8, 32],
+        help='Batch sizes to benchmark.',
+        nargs='+',
+        type=int,
+    )
+    parser.add_argument(
+        '--infer_names',
+        choices=list(INFER_OPTS.keys()),
+        default=list(INFER_OPTS.keys()),
+        help='Inference methods to benchmark.',
+        nargs='+',
+        type=str,
+    )
+    parser.add_argument(
+        '--model_names',
+        choices=list(MODEL_OPTS.keys()),
+        default=list(MODEL_OPTS.keys()),
+        help='Language models to benchmark.',
+        nargs='+',
+        type=str,
+    )
+    parser.add_argument(
+        '--n_rep',
+        default=3,
+        help='Number of timed runs of each benchmark setting.',
+        type=int,
+    )
+    parser.add_argument(
+        '--out',
+        default='bench_infer.json',
+        help='Output JSON file path.',
+        type=str,
+    )
+    parser.add_argument(
+        '--prompt_len',
+        default=8,
+        help='Number of characters of conditional text.',
+        type=int,
+    )
+    parser.add_argument(
+        '--seed',
+        default=42,
+        help='Random seed.',
+        type=int,
+    )
+    parser.add_argument(
+        '--seq_lens',
+        default=[32, 128],
+        help='Maximum sequence lengths to benchmark.',
+        nargs='+',
+        type=int,
+    )
+    parser.add_argument(
+        '--vocab_size',
+        default=1000,
+        help='Tokenizer vocabulary size including special tokens.',
+        type=int,
+    )
+
+    # Model arguments.
+    parser.add_argument(
+        '--d_emb',
+        default=100,
+        help='Token embedding dimension.',
+        type=int,
+    )
+    parser.add_argument(
+        '--d_hid',
+        default=300,
+        help='Hidden dimension.',
+        type=int,
+    )
+    parser.add_argument(
+        '--n_hid_lyr',
+        default=2,
+        help=' '.join([
+            'Number of hidden layers.',
+            'Speculative decoding draft model always has 1 hidden layer.',
+        ]),
+        type=int,
+    )
+
+    # Inference method arguments.
+    parser.add_argument(
+        '--beam_width',
+        default=4,
+        help='Number of beams of beam search inference method.',
+        type=int,
+    )
+    parser.add_argument(
+        '--k',
+        default=10,
+        help='Number of candidates of top-k inference method.',
+        type=int,
+    )
+    parser.add_argument(
+        '--n_draft',
+        default=4,
+        help='Number of proposed tokens of speculative inference method.',
+        type=int,
+    )
+    parser.add_argument(
+        '--p',
+        default=0.9,
+        help='Cumulative probability threshold of top-p inference method.',
+        type=float,
+    )
+
+    return parser.parse_args()
+
+
+def create_tknzr(vocab_size: int) -> CharTknzr:
+    r"""Create character tokenizer with exactly ``vocab_size`` tokens.
+
+    Vocabulary consists of special tokens and consecutive CJK characters.
+
+    Parameters
+    ==========
+    vocab_size: int
+        Tokenizer vocabulary size including special tokens.
+
+    Returns
+    =======
+    lmp.tknzr.CharTknzr
+        Character tokenizer.
+    """
+    tknzr = CharTknzr(is_uncased=False, max_vocab=-1, min_count=1)
+    n_tk = max(0, vocab_size - tknzr.vocab_size)
+    tknzr.build_vocab([''.join(chr(0x4E00 + idx) for idx in range(n_tk))])
+    return tknzr
+
+
+def create_model(
+        args: argparse.Namespace,
+        model_name: str,
+        n_hid_lyr: int,
+        tknzr: BaseTknzr,
+) -> BaseModel:
+    r"""Create randomly initialized language model in evaluation mode.
+
+    Parameters
+    ==========
+    args: argparse.Namespace
+        Model hyperparameters from CLI.
+    model_name: str
+        Name of the language model to create.
+    n_hid_lyr: int
+        Number of hidden layers.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer shared by all models.
+
+    Returns
+    =======
+    lmp.model.BaseModel
+        Randomly initialized language model.
+    """
+    model = lmp.util.model.create(
+        d_emb=args.d_emb,
+        d_hid=args.d_hid,
+        model_name=model_name,
+        n_hid_lyr=n_hid_lyr,
+        n_post_hid_lyr=1,
+        n_pre_hid_lyr=1,
+        p_emb=0.0,
+        p_hid=0.0,
+        tknzr=tknzr,
+    )
+
+    # Set model to evaluation model.
+    # This turn off dropout layers in model.
+    return model.eval()
+
+
+def percentile(vals: List[float], q: float) -> Optional[float]:
+    r"""Calculate percentile with linear interpolation.
+
+    Parameters
+    ==========
+    vals: List[float]
+        Values to calculate percentile.
+    q: float
+        Percentile in range ``[0, 100]``.
+
+    Returns
+    =======
+    Optional[float]
+        The ``q``-th percentile of ``vals``.
+        Return ``None`` if ``vals`` is empty.
+    """
+    if not vals:
+        return None
+
+    vals = sorted(vals)
+    pos = (len(vals) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(vals) - 1)
+    return vals[lower] + (vals[upper] - vals[lower]) * (pos - lower)
+
+
+@torch.no_grad()
+def bench(
+        batch_txt: List[str],
+        device: torch.device,
+        infer: BaseInfer,
+        model: BaseModel,
+        n_rep: int,
+        tknzr: BaseTknzr,
+) -> Dict:
+    r"""Benchmark inference method on batch of conditional text.
+
+    Parameters
+    ==========
+    batch_txt: List[str]
+        Batch of conditional text.
+    device: torch.device
+        Model running device.
+    infer: lmp.infer.BaseInfer
+        Inference method to benchmark.
+    model: lmp.model.BaseModel
+        Language model to generate text.
+    n_rep: int
+        Number of timed runs.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer shared by all models.
+
+    Returns
+    =======
+    Dict
+        Throughput, time to first token, per-token latency percentiles (in
+        milliseconds) and number of samples of each.
+        Latency percentiles are ``None`` if there is no latency sample.
+    """
+    def sync() -> None:
+        if device.type == 'cuda':
+            torch.cuda.synchronize(device)
+
+    # Warm up is not timed.
+    for _ in infer.batch_gen_steps(
+        model=model,
+        tknzr=tknzr,
+        batch_txt=batch_txt,
+    ):
+        pass
+
+    n_tk = 0
+    total_sec = 0.0
+    ttfts: List[float] = []
+    latencies: List[float] = []
+    for _ in range(n_rep):
+        sync()
+        start = prev = time.perf_counter()
+        prompt_len = -1
+        n_step = 0
+        for batch_tkids, out_seq_len in infer.batch_gen_steps(
+            model=model,
+            tknzr=tknzr,
+            batch_txt=batch_txt,
+        ):
+            sync()
+            now = time.perf_counter()
+
+            # The first output contains only conditional text.
+            if prompt_len == -1:
+                prompt_len = out_seq_len
+                continue
+
+            # Time to the first generated token includes conditional text
+            # encoding and prefill.
+            if n_step == 0:
+                ttfts.append(now - start)
+            else:
+                latencies.append(now - prev)
+            prev = now
+            n_step += 1
+
+        total_sec += prev - start
+
+        # Count generated token ids up to `[eos]` of each sequence.
+        for tkids in batch_tkids[:, prompt_len:out_seq_len].tolist():
+            if tknzr.eos_tkid in tkids:
+                tkids = tkids[:tkids.index(tknzr.eos_tkid) + 1]
+            n_tk += len(tkids)
+
+    def to_ms(sec: Optional[float]) -> Optional[float]:
+        return None if sec is None else sec * 1000
+
+    return {
+        'n_latency': len(latencies),
+        'n_tk': n_tk,
+        'n_ttft': len(ttfts),
+        'p50_ms': to_ms(percentile(latencies, 50)),
+        'p95_ms': to_ms(percentile(latencies, 95)),
+        'p99_ms': to_ms(percentile(latencies, 99)),
+        'tkps': n_tk / total_sec if total_sec > 0 else 0.0,
+        'ttft_ms': to_ms(percentile(ttfts, 50)),
+    }
+
+
+def fmt_ms(ms: Optional[float]) -> str:
+    r"""Format milliseconds for printing.
+
+    Parameters
+    ==========
+    ms: Optional[float]
+        Milliseconds, or ``None`` if there is no sample.
+
+    Returns
+    =======
+    str
+        Formatted milliseconds, or ``n/a`` if ``ms`` is ``None``.
+    """
+    if ms is None:
+        return f'{"n/a":>9s}'
+    return f'{ms:7.2f}ms'
+
+
+def main() -> None:
+    r"""Script entry point."""
+    # Parse command-line argument.
+    args = parse_arg()
+
+    # Set random seed for reproducibility.
+    lmp.util.rand.set_seed(seed=args.seed)
+
+    # Get model running device.
+    device = torch.device('cpu')
+    if torch.cuda.is_available():
+        device = torch.device('cuda')
+
+    # Create tokenizer and random conditional text.
+    tknzr = create_tknzr(vocab_size=args.vocab_size)
+    chars = [
+        tk
+        for tk in tknzr.tk2id
+        if len(tk) == 1
+    ]
+    max_batch_size = max(args.batch_sizes)
+    all_txt = [
+        ''.join(random.choice(chars) for _ in range(args.prompt_len))
+        for _ in range(max_batch_size)
+    ]
+
+    results = []
+    for model_name in args.model_names:
+        # Move model to running device.
+        model = create_model(
+            args=args,
+            model_name=model_name,
+            n_hid_lyr=args.n_hid_lyr,
+            tknzr=tknzr,
+        ).to(device)
+        draft_model = create_model(
+            args=args,
+            model_name=model_name,
+            n_hid_lyr=1,
+            tknzr=tknzr,
+        ).to(device)
+
+        for infer_name in args.infer_names:
+            for seq_len in args.seq_lens:
+                # Get inference method.
+                infer = lmp.util.infer.create(
+                    beam_width=args.beam_width,
+                    draft_ckpt=-1,
+                    draft_exp_name='',
+                    infer_name=infer_name,
+                    k=args.k,
+                    max_seq_len=seq_len,
+                    n_draft=args.n_draft,
+                    p=args.p,
+                )
+
+                # Use random draft model instead of loading checkpoint.
+                if isinstance(infer, SpeculativeInfer):
+                    infer.draft_model = draft_model
+
+                for batch_size in args.batch_sizes:
+                    result = {
+                        'batch_size': batch_size,
+                        'infer_name': infer_name,
+                        'model_name': model_name,
+                        'seq_len': seq_len,
+                        **bench(
+                            batch_txt=all_txt[:batch_size],
+                            device=device,
+                            infer=infer,
+                            model=model,
+                            n_rep=args.n_rep,
+                            tknzr=tknzr,
+                        ),
+                    }
+                    results.append(result)
+
+                    # Output result as soon as it is measured.
+                    print(' '.join([
+                        f'{model_name:>16s}',
+                        f'{infer_name:>12s}',
+                        f'B={batch_size:<4d}',
+                        f'S={seq_len:<4d}',
+                        f'tk/s={result["tkps"]:10.1f}',
+                        f'ttft={fmt_ms(result["ttft_ms"])}',
+                        f'p50={fmt_ms(result["p50_ms"])}',
+                        f'p95={fmt_ms(result["p95_ms"])}',
+                        f'p99={fmt_ms(result["p99_ms"])}',
+                        f'n={result["n_latency"]}',
+                    ]))
+
+    # Write results with benchmark settings and environment.
+    with open(args.out, 'w', encoding='utf-8') as output_file:
+        json.dump(
+            {
+                'args': args.__dict__,
+                'env': {
+                    'device': str(device),
+                    'python': platform.python_version(),
+                    'torch': torch.__version__,
+                },
+                'results': results,
+            },
+            output_file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,807 @@
+r"""Benchmark tokenizers.
+
+Measure performance of tokenizer hot paths.
+Each benchmark is run ``--n_rep`` times and the fastest run is reported, so
+that results are less affected by other processes.
+Samples are either synthetic text or samples of dataset ``--dset_name``.
+Synthetic text contain fullwidth characters, uppercase letters and repeated
+whitespaces so that normalization is not a no-op.
+Like datasets, synthetic samples are normalized by
+:py:func:`lmp.dset.util.norm` before benchmarking.
+
+Available benchmarks:
+
+- ``batch_dec``: Cost of decoding padded batches.
+  Compare decoding each row with ``tknzr.dec`` with ``tknzr.batch_dec`` on
+  :py:class:`numpy.ndarray`.
+- ``enc``: Cost of token id lookup.
+  Compare ``BaseTknzr._enc_full`` (look up each token in ``tk2id``) with
+  tokenizer's own ``tknzr._enc_full`` (e.g., codepoint lookup table of
+  :py:class:`lmp.tknzr.CharTknzr`).
+  Both bypass :py:class:`lmp.tknzr.EncCache`.
+- ``enc_cache``: Cost of encoding duplicated text.
+  Samples are drawn with replacement from ``10%`` of samples, then encoded
+  with and without :py:class:`lmp.tknzr.EncCache`.
+- ``load``: Cost of loading vocabulary.
+  Compare tokenizer load time of JSON vocabulary with binary memory-mapped
+  vocabulary (see :py:class:`lmp.tknzr.MmapVocab`).
+  Private (anonymous) resident memory increased by loading is measured in a
+  new process on Linux.
+  File-backed pages of memory-mapped vocabulary are shared through page
+  cache, thus they are not counted.
+- ``trunc``: Cost of encoding long text with maximum sequence length.
+  Every ``100`` samples are joined into a long text, then encoded with
+  ``max_seq_len=128``.
+  Compare encoding the whole text and then truncating with
+  ``tknzr.enc(txt, max_seq_len=128)``, which only tokenizes needed text
+  prefix.
+- ``norm``: Cost of redundant text normalization.
+  Compare counting tokens with ``tknzr.tknz(tknzr.norm(txt))`` (text is
+  normalized twice), ``tknzr.tknz(txt)`` (text is normalized once) and
+  ``tknzr.tknz(txt, normalized=True)`` (text normalized by dataset is only
+  case converted).
+  Also compare ``tknzr.batch_enc`` with and without ``normalized=True``.
+- ``batch_enc``: Cost of converting encoded batch into tensors.
+  Compare ``torch.LongTensor(tknzr.batch_enc(batch_txt))`` with
+  ``tknzr.batch_enc(batch_txt, return_tensors='np')`` and
+  ``tknzr.batch_enc(batch_txt, return_tensors='pt')``.
+- ``wordpiece``: Encoding throughput compared with
+  :py:class:`lmp.tknzr.BertWordPiece`.
+  A :py:class:`lmp.tknzr.BertWordPiece` is trained on samples, then both
+  tokenizers encode batches into NumPy arrays in one thread and in
+  ``4`` threads.
+  :py:class:`lmp.tknzr.BertWordPiece` encodes without holding GIL, thus it
+  is expected to scale with threads.
+  Decoding each row of encoded batches with ``wordpiece.dec`` is also
+  compared with ``wordpiece.batch_dec`` on :py:class:`torch.Tensor`.
+
+Results are printed and written to ``--out`` as JSON so that runs can be
+compared across commits.
+
+See Also
+========
+lmp.script.bench_infer
+    Benchmark text generation throughput and latency.
+lmp.tknzr
+    All available tokenizers.
+
+Examples
+========
+The following example run all benchmarks on synthetic text.
+
+.. code-block::
+
+    python -m lmp.script.bench_tknzr --out bench.json
+
+The following example run ``norm`` benchmark on WikiText-2 training set.
+
+.. code-block::
+
+    python -m lmp.script.bench_tknzr \
+        --bench_names norm \
+        --dset_name wikitext-2 \
+        --ver train
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import torch
+
+import lmp.dset
+import lmp.dset.util
+import lmp.path
+import lmp.util.dset
+import lmp.util.rand
+import lmp.util.tknzr
+from lmp.tknzr import TKNZR_OPTS, BaseTknzr, BertWordPiece, EncCache
+
+
+def parse_arg() -> argparse.Namespace:
+    r"""Parse arguments from CLI.
+
+    --bench_names  Benchmarks to run.
+    --dset_name    Dataset to benchmark on.
+    --is_uncased   Whether tokenizers are case-insensitive.
+    --max_vocab    Tokenizer maximum vocabulary size.
+    --n_rep        Number of runs of each benchmark.
+    --n_spl        Number of synthetic samples.
+    --out          Output JSON file path.
+    --seed         Random seed.
+    --spl_len      Number of words in each synthetic sample.
+    --tknzr_names  Tokenizers to benchmark.
+    --ver          Dataset version.
+
+    Returns
+    =======
+    argparse.Namespace
+        Arguments from CLI.
+    """
+    # Create parser.
+    parser = argparse.ArgumentParser(
+        'python -m lmp.script.bench_tknzr',
+        description='Benchmark tokenizers.',
+    )
+
+    parser.add_argument(
+        '--bench_names',
+        choices=list(BENCH_OPTS.keys()),
+        default=list(BENCH_OPTS.keys()),
+        help='Benchmarks to run.',
+        nargs='+',
+        type=str,
+    )
+    parser.add_argument(
+        '--dset_name',
+        choices=lmp.dset.DSET_OPTS.keys(),
+        default=None,
+        help='Dataset to benchmark on. Use synthetic text if not set.',
+        type=str,
+    )
+    parser.add_argument(
+        '--is_uncased',
+        action='store_true',
+        help='Convert all text and tokens into lowercase if set.',
+    )
+    parser.add_argument(
+        '--max_vocab',
+        default=10000,
+        help='Tokenizer maximum vocabulary size.',
+        type=int,
+    )
+    parser.add_argument(
+        '--n_rep',
+        default=3,
+        help='Number of runs of each benchmark.',
+        type=int,
+    )
+    parser.add_argument(
+        '--n_spl',
+        default=20000,
+        help='Number of synthetic samples.',
+        type=int,
+    )
+    parser.add_argument(
+        '--out',
+        default='bench_tknzr.json',
+        help='Output JSON file path.',
+        type=str,
+    )
+    parser.add_argument(
+        '--seed',
+        default=42,
+        help='Random seed.',
+        type=int,
+    )
+    parser.add_argument(
+        '--spl_len',
+        default=50,
+        help='Number of words in each synthetic sample.',
+        type=int,
+    )
+    parser.add_argument(
+        '--tknzr_names',
+        choices=list(TKNZR_OPTS.keys()),
+        default=list(TKNZR_OPTS.keys()),
+        help='Tokenizers to benchmark.',
+        nargs='+',
+        type=str,
+    )
+    parser.add_argument(
+        '--ver',
+        default=None,
+        help='Dataset version.',
+        type=str,
+    )
+
+    return parser.parse_args()
+
+
+def load_spls(args: argparse.Namespace) -> List[str]:
+    r"""Load dataset samples or create synthetic samples.
+
+    Parameters
+    ==========
+    args: argparse.Namespace
+        Benchmark settings from CLI.
+
+    Returns
+    =======
+    List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    """
+    if args.dset_name is not None:
+        dset = lmp.util.dset.load(dset_name=args.dset_name, ver=args.ver)
+        spls = list(dset)
+        if dset.normalized:
+            return spls
+        return [lmp.dset.util.norm(spl) for spl in spls]
+
+    # Words are made of ASCII letters and fullwidth digits.
+    chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ０１２３４５６７８９'
+    words = [
+        ''.join(random.choice(chars) for _ in range(random.randint(1, 8)))
+        for _ in range(5000)
+    ]
+    spls = [
+        ''.join(
+            random.choice(words) + random.choice([' ', ' ', ' ', '  ', '\t'])
+            for _ in range(args.spl_len)
+        )
+        for _ in range(args.n_spl)
+    ]
+    return [lmp.dset.util.norm(spl) for spl in spls]
+
+
+def timeit(fn: Callable[[], object], n_rep: int) -> float:
+    r"""Get the fastest run time of a function.
+
+    Parameters
+    ==========
+    fn: Callable[[], object]
+        Function to be timed.
+    n_rep: int
+        Number of runs.
+
+    Returns
+    =======
+    float
+        The fastest run time in seconds.
+    """
+    best = float('inf')
+    for _ in range(n_rep):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_batch_dec(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of decoding padded batches.
+
+    Samples are encoded in batches of size ``32`` with maximum sequence length
+    ``128`` and then decoded with special tokens removed.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting.
+    """
+    batch_size = 32
+    all_batch_tkids = [
+        tknzr.batch_enc(
+            spls[idx:idx + batch_size],
+            max_seq_len=128,
+            normalized=True,
+            return_tensors='np',
+        )[0]
+        for idx in range(0, len(spls), batch_size)
+    ]
+
+    def dec(vectorized: bool) -> None:
+        for batch_tkids in all_batch_tkids:
+            if vectorized:
+                tknzr.batch_dec(batch_tkids, rm_sp_tks=True)
+            else:
+                for tkids in batch_tkids.tolist():
+                    tknzr.dec(tkids, rm_sp_tks=True)
+
+    return {
+        'dec_sec': timeit(lambda: dec(vectorized=False), n_rep=n_rep),
+        'batch_dec_sec': timeit(lambda: dec(vectorized=True), n_rep=n_rep),
+    }
+
+
+def bench_enc(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of token id lookup.
+
+    ``tknzr.enc`` dispatches to ``tknzr._enc_full`` for every tokenizer, thus
+    ``_enc_full`` is called directly to compare lookup implementations.
+    Encode cache is disabled during benchmarking.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting.
+    """
+    def enc(base: bool) -> None:
+        for spl in spls:
+            if base:
+                BaseTknzr._enc_full(tknzr, spl, normalized=True)
+            else:
+                tknzr._enc_full(spl, normalized=True)
+
+    enc_cache = tknzr.enc_cache
+    tknzr.enc_cache = None
+    try:
+        return {
+            'base_enc_sec': timeit(lambda: enc(base=True), n_rep=n_rep),
+            'enc_sec': timeit(lambda: enc(base=False), n_rep=n_rep),
+        }
+    finally:
+        tknzr.enc_cache = enc_cache
+
+
+def bench_enc_cache(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of encoding duplicated text.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting and cache hit rate.
+    """
+    uniq_spls = spls[:max(1, len(spls) // 10)]
+    dup_spls = [random.choice(uniq_spls) for _ in range(len(spls))]
+
+    def enc() -> None:
+        for spl in dup_spls:
+            tknzr.enc(spl, normalized=True)
+
+    no_cache_sec = timeit(enc, n_rep=n_rep)
+
+    tknzr.enc_cache = EncCache(max_entry=len(uniq_spls))
+    cache_sec = timeit(enc, n_rep=n_rep)
+    hit_rate = tknzr.enc_cache.stats()['hit_rate']
+    tknzr.enc_cache = None
+
+    return {
+        'cache_sec': cache_sec,
+        'hit_rate': hit_rate,
+        'no_cache_sec': no_cache_sec,
+    }
+
+
+# Measure private resident memory increased by loading tokenizer.
+RSS_SCRIPT = '''
+import sys
+
+import lmp.util.tknzr
+
+
+def rss_anon_kb():
+    with open('/proc/self/status', 'r', encoding='utf-8') as status_file:
+        for line in status_file:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1])
+
+
+before = rss_anon_kb()
+tknzr = lmp.util.tknzr.load(exp_name=sys.argv[2], tknzr_name=sys.argv[1])
+print(rss_anon_kb() - before)
+'''
+
+
+def bench_load(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of loading vocabulary.
+
+    Tokenizer is saved in both JSON and binary vocabulary formats under
+    temporary experiments, which are removed after benchmarking.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Unused.
+        Intently left for benchmark interface.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Load time (in seconds) and private resident memory increase (in KB)
+        of each vocabulary format.
+    """
+    result = {}
+    for vocab_fmt in ['json', 'bin']:
+        exp_name = f'bench_tknzr_{tknzr.tknzr_name}_{vocab_fmt}'
+        tknzr.save(exp_name, vocab_fmt=vocab_fmt)
+
+        result[f'{vocab_fmt}_load_sec'] = timeit(
+            lambda: tknzr.__class__.load(exp_name),
+            n_rep=n_rep,
+        )
+
+        # `/proc` only exists on Linux.
+        if os.path.exists('/proc/self/status'):
+            output = subprocess.run(
+                [sys.executable, '-c', RSS_SCRIPT, tknzr.tknzr_name, exp_name],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+            result[f'{vocab_fmt}_rss_anon_kb'] = float(output)
+
+        shutil.rmtree(os.path.join(lmp.path.EXP_PATH, exp_name))
+
+    return result
+
+
+def bench_norm(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of redundant text normalization.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting.
+    """
+    def count(normalized: bool, norm_twice: bool) -> None:
+        for spl in spls:
+            if norm_twice:
+                tknzr.tknz(tknzr.norm(spl))
+            else:
+                tknzr.tknz(spl, normalized=normalized)
+
+    return {
+        'batch_enc_sec': timeit(
+            lambda: tknzr.batch_enc(spls),
+            n_rep=n_rep,
+        ),
+        'batch_enc_normalized_sec': timeit(
+            lambda: tknzr.batch_enc(spls, normalized=True),
+            n_rep=n_rep,
+        ),
+        'tknz_norm_twice_sec': timeit(
+            lambda: count(normalized=False, norm_twice=True),
+            n_rep=n_rep,
+        ),
+        'tknz_norm_once_sec': timeit(
+            lambda: count(normalized=False, norm_twice=False),
+            n_rep=n_rep,
+        ),
+        'tknz_normalized_sec': timeit(
+            lambda: count(normalized=True, norm_twice=False),
+            n_rep=n_rep,
+        ),
+    }
+
+
+def bench_batch_enc(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of converting encoded batch into tensors.
+
+    Samples are encoded in batches of size ``32`` with maximum sequence length
+    ``128``, which is similar to training settings.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting.
+    """
+    batch_size = 32
+    max_seq_len = 128
+
+    def enc(return_tensors: Optional[str]) -> None:
+        for idx in range(0, len(spls), batch_size):
+            batch_txt = spls[idx:idx + batch_size]
+            if return_tensors is None:
+                torch.LongTensor(tknzr.batch_enc(
+                    batch_txt,
+                    max_seq_len=max_seq_len,
+                    normalized=True,
+                ))
+            else:
+                tknzr.batch_enc(
+                    batch_txt,
+                    max_seq_len=max_seq_len,
+                    normalized=True,
+                    return_tensors=return_tensors,
+                )
+
+    return {
+        'list_sec': timeit(lambda: enc(return_tensors=None), n_rep=n_rep),
+        'np_sec': timeit(lambda: enc(return_tensors='np'), n_rep=n_rep),
+        'pt_sec': timeit(lambda: enc(return_tensors='pt'), n_rep=n_rep),
+    }
+
+
+def bench_trunc(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark cost of encoding long text with maximum sequence length.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting.
+    """
+    max_seq_len = 128
+    long_spls = [
+        ' '.join(spls[idx:idx + 100])
+        for idx in range(0, len(spls), 100)
+    ]
+
+    def enc(early_exit: bool) -> None:
+        for spl in long_spls:
+            if early_exit:
+                tknzr.enc(spl, max_seq_len=max_seq_len, normalized=True)
+            else:
+                lmp.dset.util.trunc_to_max(
+                    tknzr.enc(spl, normalized=True),
+                    max_seq_len=max_seq_len,
+                )
+
+    return {
+        'early_exit_sec': timeit(lambda: enc(early_exit=True), n_rep=n_rep),
+        'full_sec': timeit(lambda: enc(early_exit=False), n_rep=n_rep),
+    }
+
+
+def bench_wordpiece(
+        n_rep: int,
+        spls: List[str],
+        tknzr: BaseTknzr,
+) -> Dict[str, float]:
+    r"""Benchmark throughput compared with BertWordPiece.
+
+    :py:class:`lmp.tknzr.BertWordPiece` is trained on samples under a
+    temporary experiment, which is removed after training.
+    Samples are encoded in batches of size ``32`` with maximum sequence length
+    ``128``.
+
+    Parameters
+    ==========
+    n_rep: int
+        Number of runs.
+    spls: List[str]
+        Samples normalized by :py:func:`lmp.dset.util.norm`.
+    tknzr: lmp.tknzr.BaseTknzr
+        Tokenizer to benchmark.
+
+    Returns
+    =======
+    Dict[str, float]
+        Run time (in seconds) of each setting.
+    """
+    batch_size = 32
+    max_seq_len = 128
+    n_thread = 4
+
+    exp_name = f'bench_tknzr_{tknzr.tknzr_name}_wordpiece'
+    with tempfile.NamedTemporaryFile(
+        'w',
+        encoding='utf-8',
+        suffix='.txt',
+    ) as spl_file:
+        spl_file.write('\n'.join(spls))
+        spl_file.flush()
+
+        wordpiece = BertWordPiece()
+        wordpiece.train(
+            exp_name=exp_name,
+            files=[spl_file.name],
+            min_count=1,
+            vocab_size=tknzr.vocab_size,
+        )
+    shutil.rmtree(os.path.join(lmp.path.EXP_PATH, exp_name))
+
+    all_batch_txt = [
+        spls[idx:idx + batch_size]
+        for idx in range(0, len(spls), batch_size)
+    ]
+
+    def enc_tknzr(batch_txt: List[str]) -> None:
+        tknzr.batch_enc(
+            batch_txt,
+            max_seq_len=max_seq_len,
+            normalized=True,
+            return_tensors='np',
+        )
+
+    def enc_wordpiece(batch_txt: List[str]) -> None:
+        wordpiece.batch_enc(
+            batch_txt,
+            max_seq_len=max_seq_len,
+            return_tensors='np',
+        )
+
+    all_batch_tkids = [
+        wordpiece.batch_enc(
+            batch_txt,
+            max_seq_len=max_seq_len,
+            return_tensors='pt',
+        )[0]
+        for batch_txt in all_batch_txt
+    ]
+
+    def dec(use_batch: bool) -> None:
+        for batch_tkids in all_batch_tkids:
+            if use_batch:
+                wordpiece.batch_dec(batch_tkids, rm_sp_tks=True)
+            else:
+                [
+                    wordpiece.dec(tkids, rm_sp_tks=True)
+                    for tkids in batch_tkids.tolist()
+                ]
+
+    def enc(fn: Callable[[List[str]], None], n_thread: int) -> None:
+        if n_thread == 1:
+            for batch_txt in all_batch_txt:
+                fn(batch_txt)
+            return
+
+        with ThreadPoolExecutor(max_workers=n_thread) as executor:
+            for _ in executor.map(fn, all_batch_txt):
+                pass
+
+    return {
+        'tknzr_sec': timeit(lambda: enc(enc_tknzr, 1), n_rep=n_rep),
+        'tknzr_thread_sec': timeit(
+            lambda: enc(enc_tknzr, n_thread),
+            n_rep=n_rep,
+        ),
+        'wordpiece_batch_dec_sec': timeit(
+            lambda: dec(use_batch=True),
+            n_rep=n_rep,
+        ),
+        'wordpiece_dec_sec': timeit(lambda: dec(use_batch=False), n_rep=n_rep),
+        'wordpiece_sec': timeit(lambda: enc(enc_wordpiece, 1), n_rep=n_rep),
+        'wordpiece_thread_sec': timeit(
+            lambda: enc(enc_wordpiece, n_thread),
+            n_rep=n_rep,
+        ),
+    }
+
+
+BENCH_OPTS: Dict[str, Callable[..., Dict[str, float]]] = {
+    'batch_dec': bench_batch_dec,
+    'batch_enc': bench_batch_enc,
+    'enc': bench_enc,
+    'enc_cache': bench_enc_cache,
+    'load': bench_load,
+    'norm': bench_norm,
+    'trunc': bench_trunc,
+    'wordpiece': bench_wordpiece,
+}
+
+
+def main() -> None:
+    r"""Script entry point."""
+    # Parse command-line argument.
+    args = parse_arg()
+
+    # Set random seed for reproducibility.
+    lmp.util.rand.set_seed(seed=args.seed)
+
+    spls = load_spls(args=args)
+
+    results = []
+    for tknzr_name in args.tknzr_names:
+        # Build tokenizer's vocabulary on benchmark samples.
+        tknzr = lmp.util.tknzr.create(
+            is_uncased=args.is_uncased,
+            max_vocab=args.max_vocab,
+            min_count=1,
+            tknzr_name=tknzr_name,
+        )
+        tknzr.build_vocab(spls, normalized=True)
+
+        for bench_name in args.bench_names:
+            result = {
+                'bench_name': bench_name,
+                'tknzr_name': tknzr_name,
+                **BENCH_OPTS[bench_name](
+                    n_rep=args.n_rep,
+                    spls=spls,
+                    tknzr=tknzr,
+                ),
+            }
+            results.append(result)
+
+            # Output result as soon as it is measured.
+            print(' '.join(
+                [f'{tknzr_name:>10s}', f'{bench_name:>6s}']
+                + [
+                    f'{key}={val:.4f}'
+                    for key, val in result.items()
+                    if isinstance(val, float)
+                ]
+            ))
+
+    # Write results with benchmark settings and environment.
+    with open(args.out, 'w', encoding='utf-8') as output_file:
+        json.dump(
+            {
+                'args': args.__dict__,
+                'env': {'python': platform.python_version()},
+                'n_spl': len(spls),
+                'results': results,
+            },
+            output_file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+if __name__ == '__main__':
+    main()
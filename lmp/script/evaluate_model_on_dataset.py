@@ -61,6 +61,22 @@ less memory than training, thus we can use larger batch size by increasing
         --ckpt -1 \
         --exp_name my_exp \
         --ver valid
+
+By default text longer than model's maximum sequence length are truncated.
+Set ``--stride`` to split long text into windows and evaluate perplexity on
+all tokens.
+Perplexity is then averaged over windows instead of text.
+``--stride`` must equal to model's maximum sequence length minus ``1`` so
+that each token is used as prediction target exactly once.
+
+.. code-block::
+
+    python -m lmp.script.evaluate_model_on_dataset wikitext-2 \
+        --batch_size 32 \
+        --first_ckpt 5000 \
+        --exp_name my_exp \
+        --stride 127 \
+        --ver valid
 """
 
 import argparse
@@ -87,6 +103,8 @@ def parse_arg() -> argparse.Namespace:
     --batch_size  Evaluation batch size.
     --ckpt        Pre-trained model checkpoint.
     --exp_name    Pre-trained tokenizer experiment name.
+    --stride      Number of tokens between starts of consecutive windows.
+                  Default to ``None`` (truncate long text).
     --ver         Version of the dataset.
                   Default to ``dset``'s default version.
 
@@ -147,6 +165,19 @@ def parse_arg() -> argparse.Namespace:
             ]),
             type=int,
         )
+        dset_parser.add_argument(
+            '--stride',
+            default=None,
+            help=' '.join([
+                'Split text into overlapping windows of model maximum',
+                'sequence length, and start each window `--stride` tokens',
+                'after the previous one.',
+                'Must equal to model maximum sequence length minus 1 so that',
+                'each token is used as prediction target exactly once.',
+                'Long text are truncated if not set.',
+            ]),
+            type=int,
+        )
         dset_parser.add_argument(
             '--ver',
             default=None,
@@ -161,6 +192,42 @@ def parse_arg() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def ppl(
+        batch_tkids: torch.Tensor,
+        device: torch.device,
+        model: lmp.model.BaseModel,
+) -> float:
+    r"""Calculate average perplexity of a mini-batch.
+
+    Parameters
+    ==========
+    batch_tkids: torch.Tensor
+        Batch of token ids with shape ``(B, S)`` and
+        ``dtype == torch.int64``.
+    device: torch.device
+        Model running device.
+    model: lmp.model.BaseModel
+        Language model to be evaluated.
+
+    Returns
+    =======
+    float
+        Average perplexity of the mini-batch.
+    """
+    # Move tensors to model running device.
+    batch_tkids = batch_tkids.to(device)
+
+    # Format batch token ids to satisfy language model training format.
+    batch_prev_tkids = batch_tkids[..., :-1]
+    batch_next_tkids = batch_tkids[..., 1:]
+
+    # Calculate perplexity.
+    return model.ppl(
+        batch_next_tkids=batch_next_tkids,
+        batch_prev_tkids=batch_prev_tkids,
+    )
+
+
 def main() -> None:
     r"""Script entry point."""
     # Parse command-line argument.
@@ -179,6 +246,14 @@ def main() -> None:
     # Load pre-trained model configuration.
     model_cfg = lmp.util.cfg.load(exp_name=args.exp_name)
 
+    # Perplexity is averaged over all positions of windows, thus overlapping
+    # prediction targets would be counted more than once.
+    if args.stride is not None and args.stride != model_cfg.max_seq_len - 1:
+        raise ValueError(' '.join([
+            '`--stride` must equal to model maximum sequence length minus 1,',
+            f'i.e., `--stride {model_cfg.max_seq_len - 1}`.',
+        ]))
+
     # Load pre-trained tokenizer configuration.
     tknzr_cfg = lmp.util.cfg.load(exp_name=model_cfg.tknzr_exp_name)
 
@@ -196,6 +271,20 @@ def main() -> None:
     # Get tensorboard logger instance.
     writer = lmp.util.log.get_tb_logger(exp_name=args.exp_name)
 
+    # Split all text into overlapping windows once, and reuse windows for
+    # every checkpoint.
+    # Windows are written directly into `torch.Tensor` with
+    # `dtype == torch.int64`.
+    all_win_tkids = None
+    if args.stride is not None:
+        all_win_tkids, _, _ = tknzr.batch_enc_windows(
+            batch_txt=list(dset),
+            max_seq_len=model_cfg.max_seq_len,
+            normalized=dset.normalized,
+            return_tensors='pt',
+            stride=args.stride,
+        )
+
     # Load pre-trained checkpoints range from `args.first_ckpt` to
     # `args.last_ckpt`.
     for ckpt in lmp.util.model.list_ckpts(
@@ -219,33 +308,33 @@ def main() -> None:
 
         # Record average perplexity.
         avg_ppl = 0.0
-        for batch_txt in tqdm(dldr):
-
-            # Encode batch text into batch of token ids.
-            batch_tkids = tknzr.batch_enc(
-                batch_txt=batch_txt,
-                max_seq_len=model_cfg.max_seq_len,
-            )
-
-            # Convert batch of token ids to `torch.Tensor` with
-            # `dtype == torch.int64`.
-            batch_tkids = torch.LongTensor(batch_tkids)
-
-            # Move tensors to model running device.
-            batch_tkids = batch_tkids.to(device)
-
-            # Format batch token ids to satisfy language model training format.
-            batch_prev_tkids = batch_tkids[..., :-1]
-            batch_next_tkids = batch_tkids[..., 1:]
-
-            # Calculate perplexity.
-            batch_avg_ppl = model.ppl(
-                batch_next_tkids=batch_next_tkids,
-                batch_prev_tkids=batch_prev_tkids,
-            )
-
-            # Accumulate average perplexity.
-            avg_ppl += batch_avg_ppl * len(batch_txt) / len(dset)
+        if all_win_tkids is None:
+            for batch_txt in tqdm(dldr):
+
+                # Encode batch text into batch of token ids.
+                # Token ids are written directly into `torch.Tensor` with
+                # `dtype == torch.int64`.
+                batch_tkids, _, _ = tknzr.batch_enc(
+                    batch_txt=batch_txt,
+                    max_seq_len=model_cfg.max_seq_len,
+                    normalized=dset.normalized,
+                    return_tensors='pt',
+                )
+
+                # Accumulate average perplexity.
+                avg_ppl += ppl(
+                    batch_tkids=batch_tkids,
+                    device=device,
+                    model=model,
+                ) * len(batch_txt) / len(dset)
+        else:
+            for batch_tkids in tqdm(all_win_tkids.split(args.batch_size)):
+                # Accumulate average perplexity over windows.
+                avg_ppl += ppl(
+                    batch_tkids=batch_tkids,
+                    device=device,
+                    model=model,
+                ) * batch_tkids.size(0) / all_win_tkids.size(0)
 
         # Log average perplexity on dataset to CLI and tensorboard.
         writer.add_scalar(f'ppl/{args.dset_name}/{args.ver}', avg_ppl, ckpt)
@@ -126,14 +126,14 @@ def main() -> None:
 
     # Encode text into token ids.
     # Wrap as batch with only one sample since `model.ppl` only accept batch.
-    batch_tkids = tknzr.batch_enc(
+    # Token ids are written directly into `torch.Tensor` with
+    # `dtype == torch.int64`.
+    batch_tkids, _, _ = tknzr.batch_enc(
         batch_txt=[args.txt],
         max_seq_len=model_cfg.max_seq_len,
+        return_tensors='pt',
     )
 
-    # Convert token ids to `torch.Tensor` with `dtype == torch.int64`.
-    batch_tkids = torch.LongTensor(batch_tkids)
-
     # Move tensors to model running device.
     batch_tkids = batch_tkids.to(device)
 
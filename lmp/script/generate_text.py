@@ -28,6 +28,31 @@ It load pre-trained language model on checkpoint number ``5000``.
         --ckpt 5000 \
         --exp_name my_exp \
         --txt "Hello world"
+
+Add ``--stream`` to print generated text as soon as each token is generated.
+
+.. code-block::
+
+    python -m lmp.script.generate_text top-1 \
+        --ckpt 5000 \
+        --exp_name my_exp \
+        --stream \
+        --txt "Hello world"
+
+Add ``--num_return_sequences`` to generate multiple text with the same
+conditional text.
+Conditional text is fed to model only once and all generated text are sampled
+in one batch.
+Generated text are reproducible with the same ``--seed``.
+
+.. code-block::
+
+    python -m lmp.script.generate_text top-k \
+        --ckpt 5000 \
+        --exp_name my_exp \
+        --k 10 \
+        --num_return_sequences 4 \
+        --txt "Hello world"
 """
 
 import argparse
@@ -122,11 +147,27 @@ def main() -> None:
     # Move model to running device.
     model = model.to(device)
 
+    # Stream text with specified inference method.
+    # Print conditional text first, then print newly generated text as soon
+    # as it is generated.
+    if args.stream:
+        print(args.txt, end='', flush=True)
+        for txt in infer.stream(model=model, tknzr=tknzr, txt=args.txt):
+            print(txt, end='', flush=True)
+        print()
+        return
+
     # Generate text with specified inference method.
-    txt = infer.gen(model=model, tknzr=tknzr, txt=args.txt)
+    batch_txt = infer.batch_gen(
+        model=model,
+        tknzr=tknzr,
+        batch_txt=[args.txt],
+        num_return_sequences=args.num_return_sequences,
+    )
 
     # Output generate text.
-    print(txt)
+    for txt in batch_txt:
+        print(txt)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,625 @@
+r"""Serve pre-trained language model for text generation.
+
+Long-lived text generation server.
+Tokenizer and pre-trained language model are loaded only once and stay
+resident, so each request only cost text generation.
+Concurrent requests are collected into micro-batches and are generated
+together with :py:meth:`lmp.infer.BaseInfer.batch_gen`.
+A micro-batch is sent to language model when it reaches ``--max_batch_size``
+requests or when its first request has waited for ``--max_wait_ms``
+milliseconds, whichever comes first.
+
+Two front-ends are provided, and both run locally without external services:
+
+- HTTP (default): ``POST /gen`` with JSON body ``{"txt": "..."}`` respond
+  with JSON ``{"txt": "..."}``.
+  ``GET /metrics`` respond with server metrics.
+- stdin-JSONL (``--stdin``): each line on stdin is a JSON object
+  ``{"id": ..., "txt": "..."}`` and each generated result is written to
+  stdout as a JSON line ``{"id": ..., "txt": "..."}``.
+  Results may be written in different order than requests, thus ``id`` is
+  used to match requests and results.
+  Line ``{"metrics": true}`` write server metrics to stdout.
+
+Server metrics include current queue depth, maximum queue depth, number of
+served requests, number of micro-batches and micro-batch size histogram.
+
+With ``--prefix_cache_mb`` greater than ``0``, model states of prompt prefixes
+are cached with :py:class:`lmp.infer.PrefixStateCache`, so requests sharing
+the same prompt template skip re-running their common prefix.
+Prefix cache hits and misses are included in server metrics.
+Beam search and speculative decoding do not use prefix cache, thus
+``--prefix_cache_mb`` is rejected for them.
+
+With ``--enc_cache_size`` greater than ``0``, encoded prompts are cached with
+:py:class:`lmp.tknzr.EncCache`, so duplicated prompts are tokenized only
+once.
+Encode cache hit rate is included in server metrics.
+
+See Also
+========
+lmp.infer
+    All available inference methods.
+lmp.script.generate_text
+    Generate text using pre-trained language model.
+
+Examples
+========
+The following example serve pre-trained language model experiment ``my_exp``
+on checkpoint number ``5000`` with ``top-1`` inference method.
+Server listen on ``http://127.0.0.1:8000``.
+
+.. code-block::
+
+    python -m lmp.script.serve top-1 \
+        --ckpt 5000 \
+        --exp_name my_exp \
+        --port 8000
+
+Then request text generation with any HTTP client.
+
+.. code-block::
+
+    curl -X POST http://127.0.0.1:8000/gen -d '{"txt": "Hello world"}'
+    curl http://127.0.0.1:8000/metrics
+
+The following example read requests from stdin and write results to stdout.
+Requests are collected for at most ``20`` milliseconds and at most ``64``
+requests are generated together.
+
+.. code-block::
+
+    python -m lmp.script.serve top-1 \
+        --ckpt 5000 \
+        --exp_name my_exp \
+        --max_batch_size 64 \
+        --max_wait_ms 20 \
+        --stdin < requests.jsonl
+
+The following example cache at most ``256`` MB of prompt prefix model states.
+
+.. code-block::
+
+    python -m lmp.script.serve top-1 \
+        --ckpt 5000 \
+        --exp_name my_exp \
+        --prefix_cache_mb 256
+
+The following example cache at most ``10000`` encoded prompts.
+
+.. code-block::
+
+    python -m lmp.script.serve top-1 \
+        --ckpt 5000 \
+        --enc_cache_size 10000 \
+        --exp_name my_exp
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import sys
+from typing import Dict, List, Tuple
+
+import torch
+
+import lmp.util.cfg
+import lmp.util.infer
+import lmp.util.model
+import lmp.util.rand
+import lmp.util.tknzr
+from lmp.infer import INFER_OPTS, BaseInfer, PrefixStateCache
+from lmp.model import BaseModel
+from lmp.tknzr import BaseTknzr, EncCache
+
+
+def parse_arg() -> argparse.Namespace:
+    r"""Parse arguments from CLI.
+
+    Argument must begin with a inference method name ``infer_name``.
+    All arguments are added with inference method's static method
+    ``infer_parser``.
+    Text segments are given by requests, thus ``--txt`` is not required.
+    Each request is responded with exactly one generated text as a whole,
+    thus ``--num_return_sequences`` other than ``1`` and ``--stream`` are
+    rejected.
+
+    Returns
+    =======
+    argparse.Namespace
+        Arguments from CLI.
+    """
+    # Create parser.
+    parser = argparse.ArgumentParser(
+        'python -m lmp.script.serve',
+        description='Serve language model for text generation.',
+    )
+
+    # Use inference method name to create subparser for all inference methods.
+    subparsers = parser.add_subparsers(dest='infer_name', required=True)
+
+    for infer_name, infer_clss in INFER_OPTS.items():
+        infer_parser = subparsers.add_parser(
+            infer_name,
+            description=f'Use {infer_name} as inference method.',
+        )
+
+        # Add inference method specific arguments.
+        infer_clss.infer_parser(infer_parser)
+
+        # Text segments are given by requests.
+        for action in infer_parser._actions:
+            if action.dest == 'txt':
+                action.required = False
+
+        # Server arguments.
+        group = infer_parser.add_argument_group('server arguments')
+        group.add_argument(
+            '--enc_cache_size',
+            default=0,
+            help=' '.join([
+                'Maximum number of cached encoded prompts.',
+                'Set to 0 to disable encode caching.',
+            ]),
+            type=int,
+        )
+        group.add_argument(
+            '--host',
+            default='127.0.0.1',
+            help='HTTP server host.',
+            type=str,
+        )
+        group.add_argument(
+            '--max_batch_size',
+            default=32,
+            help='Maximum number of requests in a micro-batch.',
+            type=int,
+        )
+        group.add_argument(
+            '--max_wait_ms',
+            default=10.0,
+            help=' '.join([
+                'Maximum waiting time (in milliseconds) to collect a',
+                'micro-batch.',
+            ]),
+            type=float,
+        )
+        group.add_argument(
+            '--port',
+            default=8000,
+            help='HTTP server port.',
+            type=int,
+        )
+        group.add_argument(
+            '--prefix_cache_mb',
+            default=0.0,
+            help=' '.join([
+                'Maximum memory (in MB) of cached prompt prefix model states.',
+                'Set to 0 to disable prefix caching.',
+            ]),
+            type=float,
+        )
+        group.add_argument(
+            '--stdin',
+            action='store_true',
+            help='Read JSONL requests from stdin instead of serving HTTP.',
+        )
+
+    args = parser.parse_args()
+
+    # Server responds each request with one generated text as a whole.
+    if args.num_return_sequences != 1:
+        parser.error('`--num_return_sequences` is not supported by server.')
+    if args.stream:
+        parser.error('`--stream` is not supported by server.')
+    # Inference methods overriding `batch_gen_steps` (e.g., beam search and
+    # speculative decoding) do not use prefix cache.
+    infer_clss = INFER_OPTS[args.infer_name]
+    uses_prefix_cache = (
+        infer_clss.batch_gen_steps is BaseInfer.batch_gen_steps
+    )
+    if args.prefix_cache_mb > 0 and not uses_prefix_cache:
+        parser.error(
+            f'`--prefix_cache_mb` is not supported by {args.infer_name}.'
+        )
+
+    return args
+
+
+class MicroBatcher:
+    r"""Collect concurrent requests into micro-batches.
+
+    Requests are put into a queue.
+    A single worker take requests out of queue, wait at most ``max_wait_ms``
+    milliseconds for more requests (up to ``max_batch_size`` requests), then
+    generate text for the whole micro-batch at once.
+    Generation run in a dedicated thread so that event loop keep accepting
+    requests during generation.
+
+    Parameters
+    ==========
+    infer: lmp.infer.BaseInfer
+        Inference method to generate text.
+    max_batch_size: int
+        Maximum number of requests in a micro-batch.
+    max_wait_ms: float
+        Maximum waiting time (in milliseconds) to collect a micro-batch.
+    model: lmp.model.BaseModel
+        Pre-trained language model to generate text.
+    tknzr: lmp.tknzr.BaseTknzr
+        Pre-trained tokenizer for text segment encoding.
+
+    Attributes
+    ==========
+    batch_size_hist: Dict[int, int]
+        Number of micro-batches for each micro-batch size.
+    max_queue_depth: int
+        Maximum number of requests waiting in queue ever seen.
+    n_batch: int
+        Number of generated micro-batches.
+    n_req: int
+        Number of served requests.
+    queue: asyncio.Queue
+        Queue of waiting requests.
+    """
+
+    def __init__(
+            self,
+            infer: BaseInfer,
+            max_batch_size: int,
+            max_wait_ms: float,
+            model: BaseModel,
+            tknzr: BaseTknzr,
+    ):
+        if not max_batch_size > 0:
+            raise ValueError(
+                '`max_batch_size` must satisfy `max_batch_size > 0`.'
+            )
+        if not max_wait_ms >= 0:
+            raise ValueError('`max_wait_ms` must satisfy `max_wait_ms >= 0`.')
+
+        self.infer = infer
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.model = model
+        self.tknzr = tknzr
+
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batch_size_hist: Dict[int, int] = collections.Counter()
+        self.max_queue_depth = 0
+        self.n_batch = 0
+        self.n_req = 0
+
+        # Model is not thread-safe, thus only one thread is used.
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    async def gen(self, txt: str) -> str:
+        r"""Put text segment into queue and wait for generated text.
+
+        Parameters
+        ==========
+        txt: str
+            Text segment to condition on.
+
+        Returns
+        =======
+        str
+            Generated text.
+
+        Raises
+        ======
+        TypeError
+            If ``txt`` is not an instance of :py:class:`str`.
+        """
+        # Reject invalid text before it joins a micro-batch, so that it
+        # cannot fail other requests in the same micro-batch.
+        if not isinstance(txt, str):
+            raise TypeError('`txt` must be an instance of `str`.')
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((txt, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def run(self) -> None:
+        r"""Worker loop which generate text for each micro-batch.
+
+        Returns
+        =======
+        None
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Wait for the first request of a micro-batch.
+            batch: List[Tuple[str, asyncio.Future]] = [await self.queue.get()]
+
+            # Collect more requests until micro-batch is full or time is up.
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self.queue.get(), timeout),
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            # Update metrics.
+            self.batch_size_hist[len(batch)] += 1
+            self.n_batch += 1
+            self.n_req += len(batch)
+
+            # Generate text in dedicated thread.
+            try:
+                batch_out = await loop.run_in_executor(
+                    self.executor,
+                    self.infer.batch_gen,
+                    self.model,
+                    self.tknzr,
+                    [txt for txt, _ in batch],
+                )
+            except Exception as err:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(err)
+                continue
+
+            for (_, future), out in zip(batch, batch_out):
+                if not future.done():
+                    future.set_result(out)
+
+    def metrics(self) -> Dict:
+        r"""Get server metrics.
+
+        Returns
+        =======
+        Dict
+            Current queue depth, maximum queue depth, number of served
+            requests, number of micro-batches, mean micro-batch size,
+            micro-batch size histogram, prefix cache statistics and encode
+            cache statistics.
+        """
+        metrics = {
+            'batch_size_hist': {
+                str(size): count
+                for size, count in sorted(self.batch_size_hist.items())
+            },
+            'max_queue_depth': self.max_queue_depth,
+            'mean_batch_size': self.n_req / max(1, self.n_batch),
+            'n_batch': self.n_batch,
+            'n_req': self.n_req,
+            'queue_depth': self.queue.qsize(),
+        }
+        if self.infer.prefix_cache is not None:
+            metrics['prefix_cache'] = self.infer.prefix_cache.stats()
+        if self.tknzr.enc_cache is not None:
+            metrics['enc_cache'] = self.tknzr.enc_cache.stats()
+        return metrics
+
+
+async def serve_http(batcher: MicroBatcher, host: str, port: int) -> None:
+    r"""Serve text generation with HTTP.
+
+    Parameters
+    ==========
+    batcher: lmp.script.serve.MicroBatcher
+        Micro-batcher which generate text.
+    host: str
+        HTTP server host.
+    port: int
+        HTTP server port.
+
+    Returns
+    =======
+    None
+    """
+    async def handle(
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+    ) -> None:
+        status, body = '404 Not Found', {'error': 'not found'}
+
+        try:
+            # Parse request line and headers.
+            method, path, _ = (await reader.readline()).decode().split(' ', 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+
+            if method == 'GET' and path == '/metrics':
+                status, body = '200 OK', batcher.metrics()
+            elif method == 'POST' and path == '/gen':
+                n_byte = int(headers.get('content-length', 0))
+                req = json.loads(await reader.readexactly(n_byte))
+                if not isinstance(req, dict):
+                    raise ValueError('Request body must be a JSON object.')
+                if not isinstance(req.get('txt'), str):
+                    raise ValueError('`txt` must be an instance of `str`.')
+                status, body = '200 OK', {'txt': await batcher.gen(req['txt'])}
+        except (ValueError, KeyError, asyncio.IncompleteReadError) as err:
+            status, body = '400 Bad Request', {'error': str(err)}
+        except Exception as err:
+            # Generation errors are forwarded by micro-batcher.
+            status, body = '500 Internal Server Error', {'error': str(err)}
+
+        data = json.dumps(body, ensure_ascii=False).encode()
+        writer.write(''.join([
+            f'HTTP/1.1 {status}\r\n',
+            'Content-Type: application/json; charset=utf-8\r\n',
+            f'Content-Length: {len(data)}\r\n',
+            'Connection: close\r\n',
+            '\r\n',
+        ]).encode() + data)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def serve_stdin(batcher: MicroBatcher) -> None:
+    r"""Serve text generation with JSONL on stdin and stdout.
+
+    Parameters
+    ==========
+    batcher: lmp.script.serve.MicroBatcher
+        Micro-batcher which generate text.
+
+    Returns
+    =======
+    None
+    """
+    loop = asyncio.get_running_loop()
+
+    def write(obj: Dict) -> None:
+        print(json.dumps(obj, ensure_ascii=False), flush=True)
+
+    async def handle(req: Dict) -> None:
+        try:
+            write({'id': req.get('id'), 'txt': await batcher.gen(req['txt'])})
+        except Exception as err:
+            write({'id': req.get('id'), 'error': str(err)})
+
+    tasks = []
+    while True:
+        # Read stdin without blocking event loop.
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+
+        # End of requests.
+        if not line:
+            break
+
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            req = json.loads(line)
+        except ValueError as err:
+            write({'error': str(err)})
+            continue
+
+        if not isinstance(req, dict):
+            write({'error': 'Request must be a JSON object.'})
+            continue
+
+        if req.get('metrics'):
+            write(batcher.metrics())
+            continue
+
+        if not isinstance(req.get('txt'), str):
+            write({
+                'id': req.get('id'),
+                'error': '`txt` must be an instance of `str`.',
+            })
+            continue
+
+        tasks.append(asyncio.create_task(handle(req)))
+
+    # Wait for all requests to finish.
+    await asyncio.gather(*tasks)
+
+
+async def serve(args: argparse.Namespace, batcher: MicroBatcher) -> None:
+    r"""Start micro-batch worker and front-end.
+
+    Parameters
+    ==========
+    args: argparse.Namespace
+        Arguments from CLI.
+    batcher: lmp.script.serve.MicroBatcher
+        Micro-batcher which generate text.
+
+    Returns
+    =======
+    None
+    """
+    worker = asyncio.create_task(batcher.run())
+
+    try:
+        if args.stdin:
+            await serve_stdin(batcher=batcher)
+        else:
+            await serve_http(batcher=batcher, host=args.host, port=args.port)
+    finally:
+        worker.cancel()
+
+
+def main() -> None:
+    r"""Script entry point."""
+    # Parse command-line argument.
+    args = parse_arg()
+
+    # Set random seed for reproducibility.
+    lmp.util.rand.set_seed(seed=args.seed)
+
+    # Load pre-trained model configuration.
+    model_cfg = lmp.util.cfg.load(exp_name=args.exp_name)
+
+    # Load pre-trained tokenizer configuration.
+    tknzr_cfg = lmp.util.cfg.load(exp_name=model_cfg.tknzr_exp_name)
+
+    # Load pre-trained tokenizer instance.
+    tknzr = lmp.util.tknzr.load(
+        exp_name=tknzr_cfg.exp_name,
+        tknzr_name=tknzr_cfg.tknzr_name,
+    )
+
+    # Load pre-trained model instance.
+    model = lmp.util.model.load(
+        ckpt=args.ckpt,
+        tknzr=tknzr,
+        **model_cfg.__dict__,
+    )
+
+    # Get inference method.
+    infer = lmp.util.infer.create(
+        max_seq_len=model_cfg.max_seq_len,
+        **args.__dict__,
+    )
+
+    # Cache model states of prompt prefixes.
+    if args.prefix_cache_mb > 0:
+        infer.prefix_cache = PrefixStateCache(
+            max_byte=int(args.prefix_cache_mb * 2 ** 20),
+        )
+
+    # Cache encoded prompts.
+    if args.enc_cache_size > 0:
+        tknzr.enc_cache = EncCache(max_entry=args.enc_cache_size)
+
+    # Get model running device.
+    device = torch.device('cpu')
+    if torch.cuda.is_available():
+        device = torch.device('cuda')
+
+    # Set model to evaluation model.
+    # This turn off dropout layers in model.
+    model = model.eval()
+
+    # Move model to running device.
+    model = model.to(device)
+
+    # Keep model and tokenizer resident and serve requests.
+    batcher = MicroBatcher(
+        infer=infer,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        model=model,
+        tknzr=tknzr,
+    )
+    asyncio.run(serve(args=args, batcher=batcher))
+
+
+if __name__ == '__main__':
+    main()
@@ -48,6 +48,40 @@ other scripts.
 We only save checkpoint for each ``--ckpt_step`` step and log performance for
 each ``--log_step``.
 
+By default text longer than ``--max_seq_len`` are truncated.
+Set ``--stride`` to split long text into overlapping windows of
+``--max_seq_len`` tokens instead, so that all tokens are used for training.
+``--stride`` must equal to ``--max_seq_len - 1`` so that each token is used
+as prediction target exactly once, since loss is averaged over all positions
+of windows.
+
+.. code-block:: sh
+
+    python -m lmp.script.train_model RNN \
+        --batch_size 32 \
+        --beta1 0.9 \
+        --beta2 0.99 \
+        --ckpt_step 1000 \
+        --dset_name wikitext-2 \
+        --eps 1e-8 \
+        --exp_name my_model_exp \
+        --log_step 200 \
+        --lr 1e-4 \
+        --max_norm 1 \
+        --max_seq_len 128 \
+        --n_epoch 10 \
+        --stride 127 \
+        --tknzr_exp_name my_tknzr_exp \
+        --ver train \
+        --d_emb 100 \
+        --d_hid 300 \
+        --n_hid_lyr 2 \
+        --n_post_hid_lyr 2 \
+        --n_pre_hid_lyr 2 \
+        --p_emb 0.1 \
+        --p_hid 0.1 \
+        --wd 1e-2
+
 One can train more epochs by increasing ``--n_epoch``, but be careful model
 might be overfitting if trained to much epochs.
 
@@ -201,7 +235,16 @@ def parse_arg() -> argparse.Namespace:
         # Add customized arguments.
         model_clss.train_parser(model_parser)
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # Loss is averaged over all positions of windows, thus overlapping
+    # prediction targets would be counted more than once.
+    if args.stride is not None and args.stride != args.max_seq_len - 1:
+        parser.error(
+            '`--stride` must satisfy `--stride == --max_seq_len - 1`.'
+        )
+
+    return args
 
 
 def main() -> None:
@@ -288,73 +331,87 @@ def main() -> None:
         )
         for batch_txt in tqdm_dldr:
             # Encode batch text into batch token ids.
-            batch_tkids = tknzr.batch_enc(
-                batch_txt=batch_txt,
-                max_seq_len=args.max_seq_len,
-            )
-
-            # Convert batch token ids to `torch.Tensor` with
+            # Token ids are written directly into `torch.Tensor` with
             # `dtype == torch.int64`.
-            batch_tkids = torch.LongTensor(batch_tkids)
-
-            # Move tensors to model running device.
-            batch_tkids = batch_tkids.to(device)
-
-            # Format batch token ids to satisfy language model training format.
-            batch_prev_tkids = batch_tkids[..., :-1]
-            batch_next_tkids = batch_tkids[..., 1:]
+            if args.stride is None:
+                all_tkids, _, _ = tknzr.batch_enc(
+                    batch_txt=batch_txt,
+                    max_seq_len=args.max_seq_len,
+                    normalized=dset.normalized,
+                    return_tensors='pt',
+                )
+            # Cut text into overlapping windows so that all tokens are used.
+            else:
+                all_tkids, _, _ = tknzr.batch_enc_windows(
+                    batch_txt=batch_txt,
+                    max_seq_len=args.max_seq_len,
+                    normalized=dset.normalized,
+                    return_tensors='pt',
+                    stride=args.stride,
+                )
 
-            # Calculate loss using loss function.
-            loss = model.loss_fn(
-                batch_next_tkids=batch_next_tkids,
-                batch_prev_tkids=batch_prev_tkids,
-            )
+            # Long text may be cut into many windows, thus windows are split
+            # into mini-batches with at most `args.batch_size` windows.
+            for batch_tkids in all_tkids.split(args.batch_size):
+                # Move tensors to model running device.
+                batch_tkids = batch_tkids.to(device)
+
+                # Format batch token ids to satisfy language model training
+                # format.
+                batch_prev_tkids = batch_tkids[..., :-1]
+                batch_next_tkids = batch_tkids[..., 1:]
+
+                # Calculate loss using loss function.
+                loss = model.loss_fn(
+                    batch_next_tkids=batch_next_tkids,
+                    batch_prev_tkids=batch_prev_tkids,
+                )
 
-            # Accumulate average loss.
-            avg_loss += loss.item()
+                # Accumulate average loss.
+                avg_loss += loss.item()
 
-            # Backward pass / back propagation.
-            loss.backward()
+                # Backward pass / back propagation.
+                loss.backward()
 
-            # Perform gradient clipping to avoid gradient explosion.
-            torch.nn.utils.clip_grad_norm_(
-                model.parameters(),
-                max_norm=args.max_norm,
-            )
+                # Perform gradient clipping to avoid gradient explosion.
+                torch.nn.utils.clip_grad_norm_(
+                    model.parameters(),
+                    max_norm=args.max_norm,
+                )
 
-            # Gradient descent.
-            optim.step()
+                # Gradient descent.
+                optim.step()
 
-            # Clean up gradient.
-            # This is needed only in `torch`.
-            optim.zero_grad()
+                # Clean up gradient.
+                # This is needed only in `torch`.
+                optim.zero_grad()
 
-            # Increment global step.
-            step += 1
+                # Increment global step.
+                step += 1
 
-            # Save checkpoint for each `ckpt_step` step.
-            if step % args.ckpt_step == 0:
-                model.save(ckpt=step, exp_name=args.exp_name)
+                # Save checkpoint for each `ckpt_step` step.
+                if step % args.ckpt_step == 0:
+                    model.save(ckpt=step, exp_name=args.exp_name)
 
-            # Log performance for each `log_step` step.
-            if step % args.log_step == 0:
-                avg_loss = avg_loss / args.log_step
+                # Log performance for each `log_step` step.
+                if step % args.log_step == 0:
+                    avg_loss = avg_loss / args.log_step
 
-                # Log on CLI.
-                tqdm_dldr.set_description(
-                    f'epoch: {epoch}, loss: {avg_loss:.6f}',
-                )
+                    # Log on CLI.
+                    tqdm_dldr.set_description(
+                        f'epoch: {epoch}, loss: {avg_loss:.6f}',
+                    )
 
-                # Log on tensorboard
-                writer.add_scalar(
-                    f'loss/{args.dset_name}/{args.ver}',
-                    avg_loss,
-                    step,
-                )
+                    # Log on tensorboard
+                    writer.add_scalar(
+                        f'loss/{args.dset_name}/{args.ver}',
+                        avg_loss,
+                        step,
+                    )
 
-                # Refresh log performance.
-                pre_avg_loss = avg_loss
-                avg_loss = 0.0
+                    # Refresh log performance.
+                    pre_avg_loss = avg_loss
+                    avg_loss = 0.0
 
     # Save last checkpoint.
     model.save(ckpt=step, exp_name=args.exp_name)
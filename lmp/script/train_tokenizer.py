@@ -74,6 +74,48 @@ different case.
         --min_count 5 \
         --ver train
 
+Use ``--n_workers`` to count tokens with multiple processes.
+The vocabulary is exactly the same as counting with a single process.
+
+.. code-block:: sh
+
+    python -m lmp.script.train_tokenizer whitespace \
+        --dset_name wikitext-2 \
+        --exp_name my_exp \
+        --max_vocab 10000 \
+        --min_count 5 \
+        --n_workers 4 \
+        --ver train
+
+Use ``--stream`` to count tokens with bounded memory on huge datasets.
+Token frequency is approximately counted with at most ``--n_counter``
+counters, and error bounds are printed after counting.
+
+.. code-block:: sh
+
+    python -m lmp.script.train_tokenizer whitespace \
+        --dset_name wikitext-2 \
+        --exp_name my_exp \
+        --max_vocab 10000 \
+        --min_count 5 \
+        --n_counter 100000 \
+        --stream \
+        --ver train
+
+Use ``--vocab_fmt bin`` to save vocabulary in binary format.
+Binary vocabulary is memory-mapped without parsing when loaded, thus
+multiple processes (e.g., server workers) share one copy in page cache.
+
+.. code-block:: sh
+
+    python -m lmp.script.train_tokenizer whitespace \
+        --dset_name wikitext-2 \
+        --exp_name my_exp \
+        --max_vocab 10000 \
+        --min_count 5 \
+        --ver train \
+        --vocab_fmt bin
+
 Use ``-h`` or ``--help`` options to get list of available tokenizers.
 
 .. code-block:: sh
@@ -137,11 +179,29 @@ def main() -> None:
     # Get new tokenizer instance.
     tknzr = lmp.util.tknzr.create(**args.__dict__)
 
+    # Build tokenizer's vocabulary with bounded memory and output error
+    # bounds of token frequency.
+    if args.stream:
+        counter = tknzr.build_vocab_stream(
+            dset,
+            n_counter=args.n_counter,
+            normalized=dset.normalized,
+        )
+        print(' '.join([
+            f'Counted {counter.n_tk} tokens with {len(counter)} counters.',
+            'Token frequency is overestimated by at most',
+            f'{counter.err_bound}.',
+        ]))
     # Build tokenizer's vocabulary.
-    tknzr.build_vocab(dset)
+    else:
+        tknzr.build_vocab(
+            dset,
+            n_workers=args.n_workers,
+            normalized=dset.normalized,
+        )
 
     # Save training result.
-    tknzr.save(args.exp_name)
+    tknzr.save(args.exp_name, vocab_fmt=args.vocab_fmt)
 
 
 if __name__ == '__main__':
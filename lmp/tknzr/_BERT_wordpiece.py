@@ -2,10 +2,26 @@ r""":term:`Tokenizer` base class."""
 
 import abc
 import argparse
+import itertools
 import json
 import os
 import re
-from typing import ClassVar, Dict, List, Optional, Sequence
+import threading
+import typing
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import torch
 from tokenizers import BertWordPieceTokenizer
 from tokenizers import Tokenizer, AddedToken, decoders, trainers, normalizers
 from tokenizers.models import WordPiece
@@ -75,6 +91,67 @@ class BertWordPiece():
             )
             self.processor.decoder = decoders.WordPiece(prefix="")
 
+        # Shared processor is never mutated after construction, thus it can be
+        # used by multiple threads at the same time.
+        # Truncation and padding are configured on per-thread copies instead.
+        self.processor.no_truncation()
+        self.processor.no_padding()
+        self.local = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Thread-local processors cannot be pickled.
+        state = self.__dict__.copy()
+        del state['local']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.local = threading.local()
+
+    def _processor_of(self, max_seq_len: int) -> Tokenizer:
+        r"""Get processor which truncates and pads to maximum sequence length.
+
+        ``Tokenizer.enable_truncation`` and ``Tokenizer.enable_padding``
+        mutate processor, thus calling them on shared processor races with
+        other callers and leaks settings into later calls.
+        Each thread instead owns one copy of processor for each maximum
+        sequence length, which is created on first use.
+
+        Parameters
+        ==========
+        max_seq_len: int
+            Truncate and pad each encoded sequence to maximum sequence length.
+            If ``max_seq_len == -1``, then sequences are not truncated and are
+            padded to the longest sequence in a batch.
+
+        Returns
+        =======
+        tokenizers.Tokenizer
+            Processor owned by current thread.
+        """
+        processors = getattr(self.local, 'processors', None)
+        if processors is None:
+            processors = self.local.processors = {}
+
+        processor = processors.get(max_seq_len)
+        if processor is None:
+            processor = Tokenizer.from_str(self.processor.to_str())
+            if max_seq_len == -1:
+                processor.enable_padding(
+                    pad_id=self.__class__.pad_tkid,
+                    pad_token=self.__class__.pad_tk,
+                )
+            else:
+                processor.enable_truncation(max_length=max_seq_len)
+                processor.enable_padding(
+                    length=max_seq_len,
+                    pad_id=self.__class__.pad_tkid,
+                    pad_token=self.__class__.pad_tk,
+                )
+            processors[max_seq_len] = processor
+
+        return processor
+
     def save(self, exp_name: str) -> None:
         file_dir = os.path.join(lmp.path.EXP_PATH, exp_name)
         file_path = os.path.join(file_dir, self.__class__.file_name)
@@ -116,20 +193,23 @@ class BertWordPiece():
 
         return cls(file_path=file_path, **cfg.__dict__)
 
-    def tknz(self, txt: str) -> List[str]:
+    def tknz(self, txt: str, *, normalized: bool = False) -> List[str]:
         out = self.processor.encode(txt)
         return out.tokens
 
-    def enc(self, txt: str, *, max_seq_len: Optional[int] = -1) -> List[int]:
-        if max_seq_len != -1:
-            self.processor.enable_truncation(max_length=max_seq_len)
-            self.processor.enable_padding(
-                length=max_seq_len,
-                pad_id=self.__class__.pad_tkid,
-                pad_token=self.__class__.pad_tk,
-            )
-        out = self.processor.encode(txt)
-        return out.ids
+    def enc(
+            self,
+            txt: str,
+            *,
+            max_seq_len: Optional[int] = -1,
+            normalized: bool = False,
+    ) -> List[int]:
+        # `normalized` is accepted for compatibility with
+        # `lmp.tknzr.BaseTknzr.enc`.  Normalizer of processor is idempotent,
+        # thus normalized text is normalized again without changes.
+        if max_seq_len == -1:
+            return self.processor.encode(txt).ids
+        return self._processor_of(max_seq_len).encode(txt).ids
 
     def dec(
             self,
@@ -140,36 +220,208 @@ class BertWordPiece():
 
         out = self.processor.decode(tkids, skip_special_tokens=False)
         if rm_sp_tks:
-            out.replace(self.__class__.bos_tk, "")
-            out.replace(self.__class__.pad_tk, "")
-            out.replace(self.__class__.eos_tk, " ")
+            out = self._rm_sp_tks(out)
         return out
 
+    def _rm_sp_tks(self, txt: str) -> str:
+        r"""Remove special tokens from decoded text.
+
+        ``[bos]`` and ``[pad]`` are removed and ``[eos]`` is replaced with
+        whitespace.
+
+        Parameters
+        ==========
+        txt: str
+            Decoded text.
+
+        Returns
+        =======
+        str
+            Decoded text without special tokens.
+        """
+        txt = txt.replace(self.__class__.bos_tk, '')
+        txt = txt.replace(self.__class__.pad_tk, '')
+        return txt.replace(self.__class__.eos_tk, ' ')
+
+    @typing.overload
     def batch_enc(
             self,
             batch_txt: Sequence[str],
             *,
             max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: None = None,
     ) -> List[List[int]]:
-        if max_seq_len != -1:
-            self.processor.enable_truncation(max_length=max_seq_len)
-            self.processor.enable_padding(
-                length=max_seq_len,
-                pad_id=self.__class__.pad_tkid,
-                pad_token=self.__class__.pad_tk,
+        ...
+
+    @typing.overload
+    def batch_enc(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: Literal['np'],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ...
+
+    @typing.overload
+    def batch_enc(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: Literal['pt'],
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        ...
+
+    def batch_enc(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: Optional[str] = None,
+    ) -> Union[
+        List[List[int]],
+        Tuple[np.ndarray, np.ndarray, np.ndarray],
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor],
+    ]:
+        r"""Encode batch of text into batch of sequences of token ids.
+
+        Whole batch is encoded by one ``Tokenizer.encode_batch`` call, which
+        runs in parallel without holding GIL.
+        Truncation and padding are done by a processor owned by current
+        thread, thus this method can be called by multiple threads at the
+        same time.
+
+        Parameters
+        ==========
+        batch_txt: Sequence[str]
+            Batch of text to be encoded.
+        max_seq_len: int, optional
+            Truncate and pad each token ids sequence in the batch to maximum
+            sequence length.
+            If ``max_seq_len == -1``, then ``max_seq_len`` will be set to the
+            longest encoded sequence in ``batch_txt``.
+            Defaults to ``-1``.
+        normalized: bool, optional
+            Whether text in ``batch_txt`` are already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            Accepted for compatibility with
+            :py:meth:`lmp.tknzr.BaseTknzr.batch_enc`.
+            Normalizer of processor is idempotent, thus text are always
+            normalized by processor.
+            Defaults to ``False``.
+        return_tensors: Optional[str], optional
+            Return Python lists if set to ``None``, NumPy arrays if set to
+            ``'np'`` and PyTorch tensors if set to ``'pt'``.
+            Defaults to ``None``.
+
+        Returns
+        =======
+        Union[List[List[int]], Tuple[np.ndarray, np.ndarray, np.ndarray],
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]
+            Encoded batch of sequence of token ids if ``return_tensors`` is
+            ``None``.
+            Otherwise encoded token ids (shape ``(B, max_seq_len)``,
+            ``dtype == int64``), sequence lengths (shape ``(B)``,
+            ``dtype == int64``) and attention mask (shape
+            ``(B, max_seq_len)``, ``dtype == bool``, ``True`` for
+            non-padding positions).
+
+        Raises
+        ======
+        ValueError
+            If ``return_tensors`` is not ``None``, ``'np'`` or ``'pt'``.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.batch_enc
+        """
+        if return_tensors not in [None, 'np', 'pt']:
+            raise ValueError(
+                '`return_tensors` must be `None`, `\'np\'` or `\'pt\'`.'
             )
-        out = self.processor.encode_batch(batch_txt)
-        return out.ids
+
+        out = self._processor_of(max_seq_len).encode_batch(list(batch_txt))
+
+        if return_tensors is None:
+            return [encoding.ids for encoding in out]
+
+        # All sequences have the same length after padding, thus ids and
+        # attention masks are streamed into flat arrays and reshaped without
+        # creating intermediate nested lists.
+        seq_len = len(out[0]) if out else max(max_seq_len, 0)
+        batch_tkids = np.fromiter(
+            itertools.chain.from_iterable(encoding.ids for encoding in out),
+            dtype=np.int64,
+            count=len(out) * seq_len,
+        ).reshape(len(out), seq_len)
+        batch_mask = np.fromiter(
+            itertools.chain.from_iterable(
+                encoding.attention_mask for encoding in out
+            ),
+            dtype=np.bool_,
+            count=len(out) * seq_len,
+        ).reshape(len(out), seq_len)
+        batch_len = batch_mask.sum(axis=1, dtype=np.int64)
+
+        if return_tensors == 'pt':
+            return (
+                torch.from_numpy(batch_tkids),
+                torch.from_numpy(batch_len),
+                torch.from_numpy(batch_mask),
+            )
+        return batch_tkids, batch_len, batch_mask
 
     def batch_dec(
             self,
-            batch_tkids: Sequence[Sequence[int]],
+            batch_tkids: Union[
+                Sequence[Sequence[int]],
+                np.ndarray,
+                torch.Tensor,
+            ],
             *,
             rm_sp_tks: bool = False,
     ) -> List[str]:
+        r"""Decode batch of sequences of token ids back to batch of text.
+
+        Whole batch is decoded by one ``Tokenizer.decode_batch`` call instead
+        of one call for each sequence.
 
-        # Decode each sequence of token ids in the batch.
-        return [self.dec(tkids, rm_sp_tks=rm_sp_tks) for tkids in batch_tkids]
+        Parameters
+        ==========
+        batch_tkids: Union[Sequence[Sequence[int]], np.ndarray, torch.Tensor]
+            Batch of sequences of token ids to be decoded.
+            Arrays and tensors must have shape ``(B, S)``.
+        rm_sp_tks: bool, optional
+            Whether to remove special tokens.
+            If ``rm_sp_tks == True``, then remove ``[bos]``, ``[pad]`` and
+            replace ``[eos]`` with whitespace.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        List[str]
+            Batch of decoded text.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.batch_dec
+        """
+        # Convert arrays and tensors into nested lists with one call.
+        if isinstance(batch_tkids, (np.ndarray, torch.Tensor)):
+            batch_tkids = batch_tkids.tolist()
+
+        batch_txt = self.processor.decode_batch(
+            list(batch_tkids),
+            skip_special_tokens=False,
+        )
+        if rm_sp_tks:
+            return [self._rm_sp_tks(txt) for txt in batch_txt]
+        return batch_txt
 
     def train(
         self,
@@ -202,6 +454,9 @@ class BertWordPiece():
         )
         self.processor.train(files=files, trainer=trainer)
         self.processor.add_tokens(add_tokens)
+
+        # Drop per-thread processors built with previous vocabulary.
+        self.local = threading.local()
         self.save(exp_name)
 
     @property
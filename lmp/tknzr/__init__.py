@@ -32,9 +32,25 @@ from typing import Dict, Final, List, Type
 
 from lmp.tknzr._base import BaseTknzr
 from lmp.tknzr._char import CharTknzr
+from lmp.tknzr._enc_cache import EncCache
+from lmp.tknzr._mmap_vocab import MmapVocab
+from lmp.tknzr._space_saving import SpaceSavingCounter
 from lmp.tknzr._ws import WsTknzr
 from lmp.tknzr._BERT_wordpiece import BertWordPiece
 
+__all__ = [
+    'ALL_TKNZRS',
+    'BaseTknzr',
+    'BertWordPiece',
+    'CharTknzr',
+    'EncCache',
+    'MmapVocab',
+    'SUBWORD_TKNZR_OPTS',
+    'SpaceSavingCounter',
+    'TKNZR_OPTS',
+    'WsTknzr',
+]
+
 ALL_TKNZRS: Final[List[Type[BaseTknzr]]] = [
     CharTknzr,
     WsTknzr,
@@ -2,15 +2,36 @@ r""":term:`Tokenizer` base class."""
 
 import abc
 import argparse
+import concurrent.futures
+import functools
 import json
+import math
 import os
+import re
 import typing
 from collections import Counter
-from typing import ClassVar, Dict, List, Optional, Sequence
+from typing import (
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import torch
 
 import lmp.dset
 import lmp.dset.util
 import lmp.path
+from lmp.tknzr._enc_cache import EncCache
+from lmp.tknzr._mmap_vocab import MmapVocab, write_vocab
+from lmp.tknzr._space_saving import SpaceSavingCounter
 
 
 class BaseTknzr(abc.ABC):
@@ -45,13 +66,14 @@ class BaseTknzr(abc.ABC):
         vocabulary.
         Must be larger than ``0``.
         See :py:meth:`lmp.tknzr.BaseTknzr.build_vocab`.
-    tk2id: Dict[str, int], optional
+    tk2id: Union[Dict[str, int], lmp.tknzr.MmapVocab], optional
         Token to id lookup table.
         If ``tk2id`` is given, then initialize token to id lookup table with
         ``tk2id``.
         Otherwise initialize lookup table with special tokens only.
         Keys in ``tk2id`` must be ``str``, and values in ``tk2id`` must be
         non-negative integers.
+        Memory-mapped vocabulary is used as is and cannot be extended.
         See :py:meth:`lmp.tknzr.BaseTknzr.build_vocab`.
     kwargs: Dict, optional
         Useless parameter.
@@ -65,6 +87,12 @@ class BaseTknzr(abc.ABC):
         encoded by :py:attr:`lmp.tknzr.BaseTknzr.enc`.
     bos_tkid: ClassVar[int]
         Special token id of :py:attr:`lmp.tknzr.BaseTknzr.bos_tk`.
+    enc_cache: Optional[lmp.tknzr.EncCache]
+        Cache of encoded text.
+        Set to ``None`` to disable caching, which is the default.
+        Assign a :py:class:`lmp.tknzr.EncCache` instance to encode duplicated
+        text only once.
+        Cache is cleared whenever vocabulary is built.
     eos_tk: ClassVar[str]
         Special token which represents the end of a text.
         Text will be appended with :py:attr:`lmp.tknzr.BaseTknzr.eos_tk` when
@@ -73,8 +101,11 @@ class BaseTknzr(abc.ABC):
         Special token id of :py:attr:`lmp.tknzr.BaseTknzr.eos_tk`.
     file_name: ClassVar[str]
         Tokenizer's configuration file name.
-    id2tk: Dict[int, str]
+    id2tk: List[str]
         Id (a non-negative integer) to token (a string) lookup table.
+        Token of id ``tkid`` is ``id2tk[tkid]``.
+        Ids which are not in vocabulary but smaller than ``len(id2tk)`` are
+        mapped to :py:attr:`lmp.tknzr.BaseTknzr.unk_tk`.
     is_uncased: bool
         When performing :py:meth:`lmp.tknzr.BaseTknzr.norm`, convert text into
         lowercase if :py:attr:`lmp.tknzr.BaseTknzr.is_uncased` is ``True``.
@@ -91,7 +122,12 @@ class BaseTknzr(abc.ABC):
         :py:attr:`lmp.tknzr.BaseTknzr.enc`.
     pad_tkid: ClassVar[int]
         Special token id of :py:attr:`lmp.tknzr.BaseTknzr.pad_tk`.
-    tk2id: Dict[str, int]
+    safe_cut_pattern: ClassVar[re.Pattern]
+        Characters before which text can be cut without changing
+        normalization and tokenization of text prefix.
+        See :py:meth:`lmp.tknzr.BaseTknzr.tknz_prefix` for details.
+        Defaults to ASCII whitespaces.
+    tk2id: Union[Dict[str, int], lmp.tknzr.MmapVocab]
         Token (a string) to id (a non-negative integer) lookup table.
     tknzr_name: ClassVar[str]
         Display name for tokenizer on CLI.
@@ -107,6 +143,8 @@ class BaseTknzr(abc.ABC):
         Token ids in a sequence may be replaced with
         :py:attr:`lmp.tknzr.BaseTknzr.unk_tkid` when decoded by
         :py:attr:`lmp.tknzr.BaseTknzr.dec`.
+    vocab_file_name: ClassVar[str]
+        Tokenizer's binary vocabulary file name.
 
     Raises
     ======
@@ -127,9 +165,11 @@ class BaseTknzr(abc.ABC):
     file_name: ClassVar[str] = 'tknzr.json'
     pad_tk: ClassVar[str] = '[pad]'
     pad_tkid: ClassVar[int] = 2
+    safe_cut_pattern: ClassVar[re.Pattern] = re.compile(r'[\t\n\v\f\r ]')
     tknzr_name: ClassVar[str] = 'base'
     unk_tk: ClassVar[str] = '[unk]'
     unk_tkid: ClassVar[int] = 3
+    vocab_file_name: ClassVar[str] = 'tknzr.vocab'
 
     def __init__(
             self,
@@ -137,7 +177,7 @@ class BaseTknzr(abc.ABC):
             max_vocab: int,
             min_count: int,
             *,
-            tk2id: Optional[Dict[str, int]] = None,
+            tk2id: Optional[Union[Dict[str, int], MmapVocab]] = None,
             **kwargs: Optional[Dict],
     ):
         #######################################################################
@@ -185,11 +225,16 @@ class BaseTknzr(abc.ABC):
 
         # ---------------------------------------------------------------------
         # Checking parameter `tk2id`.
-        self.tk2id: Dict[str, int] = {}
-        self.id2tk: Dict[int, str] = {}
+        self.tk2id: Union[Dict[str, int], MmapVocab] = {}
+        self.id2tk: Sequence[str] = []
+
+        # Memory-mapped vocabulary is checked when it is written.
+        if isinstance(tk2id, MmapVocab):
+            self.tk2id = tk2id
+            self.id2tk = tk2id.id2tk
 
         # Only perform checking when `tk2id` is given.
-        if tk2id is not None:
+        elif tk2id is not None:
             if not isinstance(tk2id, dict):
                 raise TypeError('`tk2id` must be an instance of `dict`.')
             for k, v in tk2id.items():
@@ -208,7 +253,12 @@ class BaseTknzr(abc.ABC):
 
             # Load pre-trained vocabulary.
             self.tk2id = tk2id
-            self.id2tk = {v: k for k, v in tk2id.items()}
+            id2tk = [self.__class__.unk_tk] * (
+                max(tk2id.values(), default=-1) + 1
+            )
+            for k, v in tk2id.items():
+                id2tk[v] = k
+            self.id2tk = id2tk
 
         # Initialize vocabulary with special tokens.
         else:
@@ -219,11 +269,19 @@ class BaseTknzr(abc.ABC):
                 (self.__class__.unk_tk, self.__class__.unk_tkid),
             ]:
                 self.tk2id[tk] = tkid
-                self.id2tk[tkid] = tk
+            id2tk = [self.__class__.unk_tk] * len(self.tk2id)
+            for tk, tkid in self.tk2id.items():
+                id2tk[tkid] = tk
+            self.id2tk = id2tk
         # Finish checking parameter `tk2id`.
         # ---------------------------------------------------------------------
 
-    def save(self, exp_name: str) -> None:
+        # Object array version of `self.id2tk` used by `self.batch_dec`.
+        self.id2tk_arr: Optional[np.ndarray] = None
+
+        self.enc_cache: Optional[EncCache] = None
+
+    def save(self, exp_name: str, *, vocab_fmt: str = 'json') -> None:
         r"""Save :term:`tokenizer` configuration in JSON format.
 
         Save trained tokenizer's configuration into JSON format and named it as
@@ -231,10 +289,20 @@ class BaseTknzr(abc.ABC):
         This method will create a directory for each tokenizer training
         experiment if that directory is not created before.
 
+        If ``vocab_fmt == 'bin'``, then vocabulary is not saved in JSON but
+        in binary format and named as
+        :py:attr:`lmp.tknzr.BaseTknzr.vocab_file_name`.
+        Binary vocabulary is memory-mapped when loaded.
+        See :py:class:`lmp.tknzr.MmapVocab` for details.
+
         Parameters
         ==========
         exp_name: str
             Training experiment name of the tokenizer.
+        vocab_fmt: str, optional
+            Vocabulary format.
+            Must be either ``'json'`` or ``'bin'``.
+            Defaults to ``'json'``.
 
         Raises
         ======
@@ -242,6 +310,8 @@ class BaseTknzr(abc.ABC):
             When experiment directory path already exists but is not a
             directory, or when expeirment file path already exists but is a
             directory.
+        ValueError
+            When ``vocab_fmt`` is neither ``'json'`` nor ``'bin'``.
 
         See Also
         ========
@@ -255,6 +325,9 @@ class BaseTknzr(abc.ABC):
         >>> tknzr.save('my_exp')
         None
         """
+        if vocab_fmt not in ['json', 'bin']:
+            raise ValueError('`vocab_fmt` must be `\'json\'` or `\'bin\'`.')
+
         file_dir = os.path.join(lmp.path.EXP_PATH, exp_name)
         file_path = os.path.join(file_dir, self.__class__.file_name)
 
@@ -267,14 +340,26 @@ class BaseTknzr(abc.ABC):
         elif os.path.isdir(file_path):
             raise FileExistsError(f'{file_path} is a directory.')
 
+        cfg = {
+            'is_uncased': self.is_uncased,
+            'max_vocab': self.max_vocab,
+            'min_count': self.min_count,
+        }
+        if vocab_fmt == 'json':
+            cfg['tk2id'] = dict(self.tk2id)
+        else:
+            write_vocab(
+                file_path=os.path.join(
+                    file_dir,
+                    self.__class__.vocab_file_name,
+                ),
+                id2tk=self.id2tk,
+                tk2id=self.tk2id,
+            )
+
         with open(file_path, 'w', encoding='utf8') as output_file:
             json.dump(
-                {
-                    'is_uncased': self.is_uncased,
-                    'max_vocab': self.max_vocab,
-                    'min_count': self.min_count,
-                    'tk2id': self.tk2id,
-                },
+                cfg,
                 output_file,
                 ensure_ascii=False
             )
@@ -286,6 +371,8 @@ class BaseTknzr(abc.ABC):
         Load pre-trained tokenizer using previously saved configuration.
         This class method only work if pre-trained tokenizer exists under
         :term:`experiment` ``exp_name``.
+        If vocabulary was saved in binary format, then it is memory-mapped
+        without parsing.
 
         Parameters
         ==========
@@ -335,20 +422,37 @@ class BaseTknzr(abc.ABC):
             ]))
 
         with open(file_path, 'r', encoding='utf-8') as input_file:
-            return cls(**json.load(input_file))
+            cfg = json.load(input_file)
+
+        # Vocabulary is saved in binary format.
+        if 'tk2id' not in cfg:
+            cfg['tk2id'] = MmapVocab(os.path.join(
+                lmp.path.EXP_PATH,
+                exp_name,
+                cls.vocab_file_name,
+            ))
+
+        return cls(**cfg)
 
-    def norm(self, txt: str) -> str:
+    def norm(self, txt: str, *, normalized: bool = False) -> str:
         r"""Perform normalization on text.
 
         Text will first be normalized using :py:func:`lmp.dset.util.norm`, then
         perform case conversion.
         If :py:attr:`lmp.tknzr.BaseTknzr.is_uncased` is ``True``, then output
         text will be converted into lowercase.
+        If ``normalized == True``, then text is assumed to be normalized by
+        :py:func:`lmp.dset.util.norm` already (for example, samples of dataset
+        with ``normalized == True``), and only case conversion is performed.
 
         Parameters
         ==========
         txt: str
             Text to be normalized.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            Defaults to ``False``.
 
         Returns
         =======
@@ -366,22 +470,29 @@ class BaseTknzr(abc.ABC):
         >>> tknzr.norm('ABC')
         'abc'
         """
-        norm_txt = lmp.dset.util.norm(txt)
+        norm_txt = txt if normalized else lmp.dset.util.norm(txt)
         if self.is_uncased:
             return norm_txt.lower()
         return norm_txt
 
     @abc.abstractmethod
-    def tknz(self, txt: str) -> List[str]:
+    def tknz(self, txt: str, *, normalized: bool = False) -> List[str]:
         r"""Perform :term:`tokenization` on text.
 
         Text will first be normalized by :py:meth:`lmp.tknzr.BaseTknz.norm`,
         then be tokenized into list of tokens.
+        Text is normalized exactly once, thus callers should not normalize
+        text before calling this method.
 
         Parameters
         ==========
         txt: str
             Text to be tokenized.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
 
         Returns
         =======
@@ -403,6 +514,74 @@ class BaseTknzr(abc.ABC):
             'method `tknz` not implemented yet.',
         ]))
 
+    def tknz_prefix(
+            self,
+            txt: str,
+            *,
+            max_n_tk: int,
+            normalized: bool = False,
+    ) -> List[str]:
+        r"""Tokenize only the text prefix needed to get ``max_n_tk`` tokens.
+
+        Give the same result as ``self.tknz(txt)[:max_n_tk]``, but text is
+        normalized and tokenized in growing prefixes and tokenization stops
+        as soon as ``max_n_tk`` tokens are collected.
+        Thus encoding long text (e.g., news articles) with small maximum
+        sequence length only processes a small prefix of text.
+
+        Text is only cut before characters matching
+        :py:attr:`lmp.tknzr.BaseTknzr.safe_cut_pattern`.
+        Cutting before ASCII whitespaces does not change :term:`NFKC`
+        normalization, whitespace collapsing, lowercasing (including final
+        sigma) and whitespace-separated tokens of text prefix, thus tokens of
+        text prefix are exactly the leading tokens of text.
+        Subclasses whose tokens may contain whitespaces must override
+        ``safe_cut_pattern``.
+
+        Parameters
+        ==========
+        txt: str
+            Text to be tokenized.
+        max_n_tk: int
+            Maximum number of tokens.
+            Tokenize the whole text if ``max_n_tk == -1``.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        List[str]
+            At most ``max_n_tk`` leading tokens of text.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.enc
+        lmp.tknzr.BaseTknzr.tknz
+        """
+        if max_n_tk == -1:
+            return self.tknz(txt, normalized=normalized)
+        if max_n_tk == 0:
+            return []
+
+        # Guess prefix length from token budget, then double prefix length
+        # until enough tokens are collected.
+        n_char = 4 * max_n_tk + 16
+        while n_char < len(txt):
+            match = self.__class__.safe_cut_pattern.search(txt, n_char)
+            if match is None:
+                break
+
+            tks = self.tknz(txt[:match.start()], normalized=normalized)
+            if len(tks) >= max_n_tk:
+                return tks[:max_n_tk]
+
+            n_char = 2 * match.start()
+
+        return self.tknz(txt, normalized=normalized)[:max_n_tk]
+
     @abc.abstractmethod
     def dtknz(self, tks: Sequence[str]) -> str:
         r"""Convert :term:`tokens` back to text.
@@ -436,7 +615,13 @@ class BaseTknzr(abc.ABC):
             'method `dtknz` not implemented yet.',
         ]))
 
-    def enc(self, txt: str, *, max_seq_len: Optional[int] = -1) -> List[int]:
+    def enc(
+            self,
+            txt: str,
+            *,
+            max_seq_len: Optional[int] = -1,
+            normalized: bool = False,
+    ) -> List[int]:
         r"""Encode text into sequence of :term:`token id`\s.
 
         Text will first be tokenized into sequence to tokens, then formatted
@@ -473,6 +658,11 @@ class BaseTknzr(abc.ABC):
             If ``max_seq_len == -1``, then sequence will neither be truncated
             nor be padded.
             Defaults to ``-1``.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
 
         Returns
         =======
@@ -486,20 +676,20 @@ class BaseTknzr(abc.ABC):
         lmp.tknzr.BaseTknzr.dec
         lmp.tknzr.BaseTknzr.tknz
         """
-        # Prepend `[bos]` token id.
-        tkids = [self.__class__.bos_tkid]
-
-        # Convert tokens into token ids.
-        for tk in self.tknz(txt):
-            # Perform token id lookup.
-            try:
-                tkids.append(self.tk2id[tk])
-            # Convert unknown tokens into `[unk]` token id.
-            except KeyError:
-                tkids.append(self.unk_tkid)
+        # Only tokenize text needed by maximum sequence length.
+        # `[bos]` takes one position, and `[eos]` is truncated whenever
+        # `max_seq_len - 1` tokens are collected.
+        tkids = self._enc_cached(
+            txt,
+            max_n_tk=self._max_n_tk(max_seq_len),
+            normalized=normalized,
+        )
 
-        # Append `[eos]` token id.
-        tkids.append(self.__class__.eos_tkid)
+        # Copy cached or array token ids into new list.
+        if isinstance(tkids, np.ndarray):
+            tkids = tkids.tolist()
+        elif not isinstance(tkids, list):
+            tkids = list(tkids)
 
         # First truncate sequence to maximum sequence length, then pad sequence
         # to maximum sequence length.
@@ -553,30 +743,67 @@ class BaseTknzr(abc.ABC):
         """
         # Remove special token ids.
         if rm_sp_tks:
-            sp_tkids = [
+            sp_tkids = {
                 self.__class__.bos_tkid,
                 self.__class__.eos_tkid,
                 self.__class__.pad_tkid,
-            ]
-            tkids = list(filter(lambda tkid: tkid not in sp_tkids, tkids))
+            }
+            tkids = [tkid for tkid in tkids if tkid not in sp_tkids]
 
-        tks = []
         # Convert token ids into tokens.
-        for tkid in tkids:
-            try:
-                tks.append(self.id2tk[tkid])
-            # Convert unknown token ids into `[unk]` token.
-            except KeyError:
-                tks.append(self.__class__.unk_tk)
+        # Convert unknown token ids into `[unk]` token.
+        id2tk = self.id2tk
+        n_id = len(id2tk)
+        unk_tk = self.__class__.unk_tk
+        tks = [id2tk[tkid] if 0 <= tkid < n_id else unk_tk for tkid in tkids]
 
         return self.dtknz(tks)
 
+    @typing.overload
     def batch_enc(
             self,
             batch_txt: Sequence[str],
             *,
             max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: None = None,
     ) -> List[List[int]]:
+        ...
+
+    @typing.overload
+    def batch_enc(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: Literal['np'],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ...
+
+    @typing.overload
+    def batch_enc(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: Literal['pt'],
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        ...
+
+    def batch_enc(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int = -1,
+            normalized: bool = False,
+            return_tensors: Optional[str] = None,
+    ) -> Union[
+        List[List[int]],
+        Tuple[np.ndarray, np.ndarray, np.ndarray],
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor],
+    ]:
         r"""Encode batch of text into batch of sequences of token ids.
 
         Each text in ``batch_txt`` will be encoded with
@@ -586,6 +813,17 @@ class BaseTknzr(abc.ABC):
         If ``max_seq_len == -1``, then ``max_seq_len`` will be set to the
         longest encoded sequence in ``batch_txt``.
 
+        If ``return_tensors`` is ``'np'`` or ``'pt'``, then encoded token ids
+        are written into a preallocated ``[pad]``-filled array of shape
+        ``(B, max_seq_len)`` and ``dtype == int64`` where ``B`` is the batch
+        size.
+        Each sequence is truncated by writing only its first ``max_seq_len``
+        token ids, thus no intermediate truncated or padded lists are created.
+        Sequence lengths (shape ``(B)``, ``dtype == int64``) and attention
+        mask (shape ``(B, max_seq_len)``, ``dtype == bool``, ``True`` for
+        non-padding positions) are returned along with token ids.
+        PyTorch tensors share memory with NumPy arrays.
+
         Parameters
         ==========
         batch_txt: Sequence[str],
@@ -596,11 +834,28 @@ class BaseTknzr(abc.ABC):
             If ``max_seq_len == -1``, then ``max_seq_len`` will be set to the
             longest encoded sequence in ``batch_txt``.
             Defaults to ``-1``.
+        normalized: bool, optional
+            Whether text in ``batch_txt`` are already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+        return_tensors: Optional[str], optional
+            Return Python lists if set to ``None``, NumPy arrays if set to
+            ``'np'`` and PyTorch tensors if set to ``'pt'``.
+            Defaults to ``None``.
 
         Returns
         =======
-        List[List[int]]
-            Encoded batch of sequence of token ids.
+        Union[List[List[int]], Tuple[np.ndarray, np.ndarray, np.ndarray],
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]
+            Encoded batch of sequence of token ids if ``return_tensors`` is
+            ``None``.
+            Otherwise encoded token ids, sequence lengths and attention mask.
+
+        Raises
+        ======
+        ValueError
+            If ``return_tensors`` is not ``None``, ``'np'`` or ``'pt'``.
 
         See Also
         ========
@@ -609,7 +864,37 @@ class BaseTknzr(abc.ABC):
         lmp.tknzr.BaseTknzr.batch_dec
         lmp.tknzr.BaseTknzr.enc
         """
-        batch_tkids = [self.enc(txt, max_seq_len=-1) for txt in batch_txt]
+        if return_tensors not in [None, 'np', 'pt']:
+            raise ValueError(
+                '`return_tensors` must be `None`, `\'np\'` or `\'pt\'`.'
+            )
+
+        # Write token ids into preallocated arrays.
+        if return_tensors is not None:
+            batch_tkids_arr, batch_len, batch_mask = self._fill_arr(
+                batch_tkids=[
+                    self._enc_cached(
+                        txt,
+                        max_n_tk=self._max_n_tk(max_seq_len),
+                        normalized=normalized,
+                    )
+                    for txt in batch_txt
+                ],
+                max_seq_len=max_seq_len,
+            )
+            if return_tensors == 'pt':
+                return (
+                    torch.from_numpy(batch_tkids_arr),
+                    torch.from_numpy(batch_len),
+                    torch.from_numpy(batch_mask),
+                )
+            return batch_tkids_arr, batch_len, batch_mask
+
+        # Only tokenize text needed by maximum sequence length.
+        batch_tkids = [
+            self.enc(txt, max_seq_len=max_seq_len, normalized=normalized)
+            for txt in batch_txt
+        ]
 
         # Return empty list when input empty batch.
         if not batch_tkids:
@@ -636,20 +921,438 @@ class BaseTknzr(abc.ABC):
             for tkids in batch_tkids
         ]
 
-    def batch_dec(
+    def enc_windows(
+            self,
+            txt: str,
+            *,
+            max_seq_len: int,
+            stride: int,
+            normalized: bool = False,
+    ) -> np.ndarray:
+        r"""Encode text into fixed-length overlapping windows of token ids.
+
+        Text is encoded into ``[bos] tk_1 ... tk_n [eos]`` without truncation,
+        then cut into windows of length ``max_seq_len`` starting at multiples
+        of ``stride``.
+        Only the first window start with ``[bos]`` and only the last window
+        end with ``[eos]``.
+        The last window is padded with ``[pad]``.
+        Windows are added until the last token id is covered, thus number of
+        windows is ``1`` if sequence length ``N <= max_seq_len`` and
+        ``1 + ceil((N - max_seq_len) / stride)`` otherwise.
+
+        With ``stride == max_seq_len - 1``, consecutive windows share exactly
+        one token id, thus each next token prediction target (i.e.,
+        ``window[1:]``) appears exactly once.
+        Smaller ``stride`` gives each prediction more context, but the first
+        ``max_seq_len - 1 - stride`` prediction targets of each window after
+        the first one also appear in the previous window.
+        Thus loss or perplexity averaged over all positions of windows
+        weights those targets more than once.
+
+        Parameters
+        ==========
+        txt: str
+            Text to be encoded.
+        max_seq_len: int
+            Window length.
+            Must satisfy ``max_seq_len >= 2``.
+        stride: int
+            Number of token ids between starts of consecutive windows.
+            Must satisfy ``0 < stride < max_seq_len``.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        np.ndarray
+            Windows of token ids with shape ``(W, max_seq_len)`` and
+            ``dtype == int64``.
+
+        Raises
+        ======
+        TypeError
+            If ``max_seq_len`` or ``stride`` is not an instance of
+            :py:class:`int`.
+        ValueError
+            If ``max_seq_len < 2`` or ``stride`` is not in range
+            ``[1, max_seq_len - 1]``.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.batch_enc_windows
+        lmp.tknzr.BaseTknzr.enc
+
+        Examples
+        ========
+        >>> from lmp.tknzr import CharTknzr
+        >>> tknzr = CharTknzr(is_uncased=False, max_vocab=10, min_count=1)
+        >>> tknzr.build_vocab(['abc'])
+        >>> tknzr.enc_windows('abcab', max_seq_len=4, stride=3)
+        array([[0, 4, 5, 6],
+               [6, 4, 5, 1]])
+        """
+        batch_tkids, _, _ = self.batch_enc_windows(
+            [txt],
+            max_seq_len=max_seq_len,
+            normalized=normalized,
+            stride=stride,
+        )
+        return batch_tkids
+
+    @typing.overload
+    def batch_enc_windows(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int,
+            stride: int,
+            normalized: bool = False,
+            return_tensors: Literal['np'] = 'np',
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ...
+
+    @typing.overload
+    def batch_enc_windows(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int,
+            stride: int,
+            normalized: bool = False,
+            return_tensors: Literal['pt'],
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        ...
+
+    def batch_enc_windows(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            max_seq_len: int,
+            stride: int,
+            normalized: bool = False,
+            return_tensors: str = 'np',
+    ) -> Union[
+        Tuple[np.ndarray, np.ndarray, np.ndarray],
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor],
+    ]:
+        r"""Encode batch of text into fixed-length overlapping windows.
+
+        Each text in ``batch_txt`` is cut into windows as in
+        :py:meth:`lmp.tknzr.BaseTknzr.enc_windows`.
+        Windows of all text are written into one preallocated ``[pad]``-filled
+        array of shape ``(W, max_seq_len)`` in text order, where ``W`` is the
+        total number of windows.
+        Since only the last window of each text is padded, long text are used
+        in full without padding every text to the longest one.
+
+        Parameters
+        ==========
+        batch_txt: Sequence[str]
+            Batch of text to be encoded.
+        max_seq_len: int
+            Window length.
+            Must satisfy ``max_seq_len >= 2``.
+        stride: int
+            Number of token ids between starts of consecutive windows.
+            Must satisfy ``0 < stride < max_seq_len``.
+        normalized: bool, optional
+            Whether text in ``batch_txt`` are already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+        return_tensors: str, optional
+            Return NumPy arrays if set to ``'np'`` and PyTorch tensors if set
+            to ``'pt'``.
+            Defaults to ``'np'``.
+
+        Returns
+        =======
+        Union[Tuple[np.ndarray, np.ndarray, np.ndarray],
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]
+            Windows of token ids (shape ``(W, max_seq_len)``), window lengths
+            without padding (shape ``(W)``) and attention mask (shape
+            ``(W, max_seq_len)``, ``True`` for non-padding positions).
+
+        Raises
+        ======
+        TypeError
+            If ``max_seq_len`` or ``stride`` is not an instance of
+            :py:class:`int`.
+        ValueError
+            If ``max_seq_len < 2``, ``stride`` is not in range
+            ``[1, max_seq_len - 1]`` or ``return_tensors`` is neither ``'np'``
+            nor ``'pt'``.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.batch_enc
+        lmp.tknzr.BaseTknzr.enc_windows
+        """
+        if not isinstance(max_seq_len, int):
+            raise TypeError('`max_seq_len` must be an instance of `int`.')
+        if not isinstance(stride, int):
+            raise TypeError('`stride` must be an instance of `int`.')
+        if not max_seq_len >= 2:
+            raise ValueError('`max_seq_len` must satisfy `max_seq_len >= 2`.')
+        if not 0 < stride < max_seq_len:
+            raise ValueError(
+                '`stride` must satisfy `0 < stride < max_seq_len`.'
+            )
+        if return_tensors not in ['np', 'pt']:
+            raise ValueError('`return_tensors` must be `\'np\'` or `\'pt\'`.')
+
+        batch_full_tkids = [
+            self._enc_cached(txt, normalized=normalized)
+            for txt in batch_txt
+        ]
+
+        # Number of windows of each text.
+        batch_n_win = [
+            1 + max(0, -(-(len(tkids) - max_seq_len) // stride))
+            for tkids in batch_full_tkids
+        ]
+
+        # Preallocate output buffer filled with `[pad]`.
+        # Shape: (W, max_seq_len).
+        batch_tkids = np.full(
+            (sum(batch_n_win), max_seq_len),
+            self.__class__.pad_tkid,
+            dtype=np.int64,
+        )
+        # Shape: (W).
+        batch_len = np.empty(len(batch_tkids), dtype=np.int64)
+
+        win_idx = 0
+        for tkids, n_win in zip(batch_full_tkids, batch_n_win):
+            tkids = np.asarray(tkids, dtype=np.int64)
+
+            # Windows except the last one are full, thus they are copied from
+            # a strided view of token ids at once.
+            if n_win > 1:
+                batch_tkids[win_idx:win_idx + n_win - 1] = (
+                    np.lib.stride_tricks.sliding_window_view(
+                        tkids[:(n_win - 2) * stride + max_seq_len],
+                        max_seq_len,
+                    )[::stride]
+                )
+                batch_len[win_idx:win_idx + n_win - 1] = max_seq_len
+
+            # The last window is padded.
+            last_tkids = tkids[(n_win - 1) * stride:]
+            batch_tkids[win_idx + n_win - 1, :len(last_tkids)] = last_tkids
+            batch_len[win_idx + n_win - 1] = len(last_tkids)
+
+            win_idx += n_win
+
+        # Attention mask is `True` for non-padding positions.
+        # Shape: (W, max_seq_len).
+        batch_mask = np.arange(max_seq_len) < batch_len[:, None]
+
+        if return_tensors == 'pt':
+            return (
+                torch.from_numpy(batch_tkids),
+                torch.from_numpy(batch_len),
+                torch.from_numpy(batch_mask),
+            )
+        return batch_tkids, batch_len, batch_mask
+
+    @staticmethod
+    def _max_n_tk(max_seq_len: Optional[int]) -> int:
+        r"""Get number of tokens needed by maximum sequence length.
+
+        Parameters
+        ==========
+        max_seq_len: Optional[int]
+            Maximum sequence length.
+            ``-1`` or ``None`` means no length limit.
+
+        Returns
+        =======
+        int
+            Number of tokens needed, or ``-1`` if all tokens are needed.
+        """
+        if max_seq_len is None or max_seq_len == -1:
+            return -1
+        return max(0, max_seq_len - 1)
+
+    def _enc_full(
+            self,
+            txt: str,
+            *,
+            max_n_tk: int = -1,
+            normalized: bool = False,
+    ) -> Sequence[int]:
+        r"""Encode text into token ids without truncation and padding.
+
+        Subclasses can override this method to return token ids in faster
+        containers such as :py:class:`numpy.ndarray`.
+
+        Parameters
+        ==========
+        txt: str
+            Text to be encoded.
+        max_n_tk: int, optional
+            Maximum number of tokens to be encoded.
+            See :py:meth:`lmp.tknzr.BaseTknzr.tknz_prefix` for details.
+            Defaults to ``-1``.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        Sequence[int]
+            Encoded token ids including ``[bos]`` and ``[eos]``.
+        """
+        # Prepend `[bos]` token id.
+        tkids = [self.__class__.bos_tkid]
+
+        # Convert tokens into token ids.
+        for tk in self.tknz_prefix(
+                txt,
+                max_n_tk=max_n_tk,
+                normalized=normalized,
+        ):
+            # Perform token id lookup.
+            try:
+                tkids.append(self.tk2id[tk])
+            # Convert unknown tokens into `[unk]` token id.
+            except KeyError:
+                tkids.append(self.unk_tkid)
+
+        # Append `[eos]` token id.
+        tkids.append(self.__class__.eos_tkid)
+
+        return tkids
+
+    def _enc_cached(
+            self,
+            txt: str,
+            *,
+            max_n_tk: int = -1,
+            normalized: bool = False,
+    ) -> Sequence[int]:
+        r"""Encode text with :py:attr:`lmp.tknzr.BaseTknzr.enc_cache`.
+
+        Token ids are cached with token budget ``max_n_tk`` as part of the
+        key.
+        If ``self.enc_cache is None``, then text is always encoded.
+
+        Parameters
+        ==========
+        txt: str
+            Text to be encoded.
+        max_n_tk: int, optional
+            Maximum number of tokens to be encoded.
+            See :py:meth:`lmp.tknzr.BaseTknzr.tknz_prefix` for details.
+            Defaults to ``-1``.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        Sequence[int]
+            Encoded token ids including ``[bos]`` and ``[eos]``.
+            Cached token ids are immutable.
+        """
+        enc_cache = self.enc_cache
+        if enc_cache is None:
+            return self._enc_full(
+                txt,
+                max_n_tk=max_n_tk,
+                normalized=normalized,
+            )
+
+        key = (txt, max_n_tk, normalized)
+        tkids = enc_cache.get(key)
+        if tkids is None:
+            tkids = enc_cache.put(
+                key,
+                self._enc_full(
+                    txt,
+                    max_n_tk=max_n_tk,
+                    normalized=normalized,
+                ),
+            )
+        return tkids
+
+    def _fill_arr(
             self,
             batch_tkids: Sequence[Sequence[int]],
+            max_seq_len: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        r"""Write batch of token ids into preallocated arrays.
+
+        Parameters
+        ==========
+        batch_tkids: Sequence[Sequence[int]]
+            Batch of token ids with different lengths.
+        max_seq_len: int
+            Truncate and pad each token ids sequence to maximum sequence
+            length.
+            If ``max_seq_len == -1``, then ``max_seq_len`` will be set to the
+            longest sequence in ``batch_tkids``.
+
+        Returns
+        =======
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            Padded token ids, sequence lengths and attention mask.
+        """
+        # Truncated sequence lengths.
+        batch_len = np.fromiter(
+            map(len, batch_tkids),
+            dtype=np.int64,
+            count=len(batch_tkids),
+        )
+        if max_seq_len == -1:
+            max_seq_len = int(batch_len.max()) if len(batch_tkids) else 0
+        np.minimum(batch_len, max_seq_len, out=batch_len)
+
+        # Preallocate output buffer filled with `[pad]`.
+        batch_tkids_arr = np.full(
+            (len(batch_tkids), max_seq_len),
+            self.__class__.pad_tkid,
+            dtype=np.int64,
+        )
+        for idx, (tkids, seq_len) in enumerate(zip(batch_tkids, batch_len)):
+            batch_tkids_arr[idx, :seq_len] = tkids[:seq_len]
+
+        # Attention mask is `True` for non-padding positions.
+        batch_mask = np.arange(max_seq_len) < batch_len[:, None]
+
+        return batch_tkids_arr, batch_len, batch_mask
+
+    def batch_dec(
+            self,
+            batch_tkids: Union[
+                Sequence[Sequence[int]],
+                np.ndarray,
+                torch.Tensor,
+            ],
             *,
             rm_sp_tks: bool = False,
     ) -> List[str]:
         r"""Decode batch of sequences of :term:`token id`\s back to batch of text.
 
-        Each sequence of token ids in `batch_tkids` will be decoded with
-        ``self.dec()``.
+        If ``batch_tkids`` is a :py:class:`numpy.ndarray` or a
+        :py:class:`torch.Tensor` with shape ``(B, S)``, then all token ids are
+        converted into tokens with one lookup on
+        :py:attr:`lmp.tknzr.BaseTknzr.id2tk`, special tokens are removed with
+        a boolean mask and tokens in each row are detokenized.
+        Otherwise each sequence of token ids in ``batch_tkids`` will be
+        decoded with :py:meth:`lmp.tknzr.BaseTknzr.dec`.
+        Both ways give the same result.
 
         Parameters
         ==========
-        batch_tkids: Sequence[Sequence[int]]
+        batch_tkids: Union[Sequence[Sequence[int]], np.ndarray, torch.Tensor]
             Batch of sequences of token ids to be decoded.
         rm_sp_tks: bool, optional
             Whether to remove special tokens.
@@ -666,17 +1369,77 @@ class BaseTknzr(abc.ABC):
         lmp.tknzr.BaseTknzr.batch_enc
         lmp.tknzr.BaseTknzr.dec
         """
+        if isinstance(batch_tkids, torch.Tensor):
+            batch_tkids = batch_tkids.cpu().numpy()
+
         # Decode each sequence of token ids in the batch.
-        return [self.dec(tkids, rm_sp_tks=rm_sp_tks) for tkids in batch_tkids]
+        if not isinstance(batch_tkids, np.ndarray):
+            return [
+                self.dec(tkids, rm_sp_tks=rm_sp_tks)
+                for tkids in batch_tkids
+            ]
+
+        # Rebuild object array when vocabulary changes.
+        # The extra last element is `[unk]` token.
+        n_id = len(self.id2tk)
+        if self.id2tk_arr is None or len(self.id2tk_arr) != n_id + 1:
+            self.id2tk_arr = np.array(
+                [*self.id2tk, self.__class__.unk_tk],
+                dtype=object,
+            )
+
+        # Convert unknown token ids into `[unk]` token.
+        # Shape: (B, S).
+        batch_tks = self.id2tk_arr[
+            np.where(
+                (0 <= batch_tkids) & (batch_tkids < n_id),
+                batch_tkids,
+                n_id,
+            )
+        ]
 
-    def build_vocab(self, batch_txt: Sequence[str]) -> None:
+        if not rm_sp_tks:
+            return [self.dtknz(tks.tolist()) for tks in batch_tks]
+
+        # Remove special tokens.
+        # Shape: (B, S).
+        batch_mask = ~np.isin(
+            batch_tkids,
+            [
+                self.__class__.bos_tkid,
+                self.__class__.eos_tkid,
+                self.__class__.pad_tkid,
+            ],
+        )
+
+        return [
+            self.dtknz(tks[mask].tolist())
+            for tks, mask in zip(batch_tks, batch_mask)
+        ]
+
+    def build_vocab(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            n_workers: int = 1,
+            normalized: bool = False,
+    ) -> None:
         r"""Build :term:`vocabulary` for tokenizer.
 
         Build vocabulary based on :term:`token` frequency.
-        Each text in ``batch_text`` will first be normalized then tokenized.
+        Each text in ``batch_text`` will be tokenized (which normalize text
+        exactly once).
         We then count each token's frequency and build vocabulary based on
         token's frequency.
         Vocabulary is sorted by token frenquency in descending order.
+        Tokens with the same frequency are sorted by their first occurrence
+        in ``batch_txt``.
+
+        If ``n_workers > 1``, then ``batch_txt`` is split into contiguous
+        shards and tokens of each shard are counted in a process pool.
+        Counters of shards are merged in shard order, thus first occurrence
+        order of tokens is preserved and the vocabulary is exactly the same
+        as counting with a single process.
 
         If a token is going to be added to vocabulary, then its token id will
         be assign to the largest token id + 1.
@@ -693,24 +1456,138 @@ class BaseTknzr(abc.ABC):
         ==========
         batch_txt: Sequence[str]
             Source of text to build vocabulary.
+        n_workers: int, optional
+            Number of worker processes to count tokens.
+            Must satisfy ``n_workers >= 1``.
+            Defaults to ``1``.
+        normalized: bool, optional
+            Whether text in ``batch_txt`` are already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
 
         Returns
         =======
         None
 
+        Raises
+        ======
+        TypeError
+            If ``n_workers`` is not an instance of :py:class:`int`.
+        ValueError
+            If ``n_workers < 1``.
+
         See Also
         ========
         lmp.tknzr.BaseTknzr.norm
         lmp.tknzr.BaseTknzr.tknz
         lmp.tknzr.BaseTknzr.vocab_size
         """
+        if not isinstance(n_workers, int):
+            raise TypeError('`n_workers` must be an instance of `int`.')
+        if n_workers < 1:
+            raise ValueError('`n_workers` must be larger than `0`.')
+
         # Count each token's frequency.
-        c: typing.Counter[str] = Counter()
-        for txt in batch_txt:
-            c.update(self.tknz(self.norm(txt)))
+        if n_workers == 1:
+            c = self.count_tks(batch_txt, normalized=normalized)
+        else:
+            c = Counter()
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=n_workers,
+            ) as executor:
+                # Results are returned in shard order.
+                for shard_c in executor.map(
+                    functools.partial(self.count_tks, normalized=normalized),
+                    self._shard(batch_txt, n_shard=4 * n_workers),
+                ):
+                    c.update(shard_c)
+
+        self._add_tks(c.most_common())
+
+    def build_vocab_stream(
+            self,
+            txt_iter: Iterable[str],
+            *,
+            n_counter: Optional[int] = None,
+            normalized: bool = False,
+    ) -> SpaceSavingCounter:
+        r"""Build :term:`vocabulary` with bounded memory.
+
+        Same as :py:meth:`lmp.tknzr.BaseTknzr.build_vocab` except that token
+        frequency is approximately counted with
+        :py:class:`lmp.tknzr.SpaceSavingCounter`.
+        At most ``n_counter`` distinct tokens are counted at any time, thus
+        memory usage does not grow with the number of distinct tokens.
+        Text are consumed one by one from ``txt_iter``, thus text do not need
+        to be loaded into memory at once.
+
+        Frequent tokens are counted with small error.
+        Every token which frequency is larger than ``counter.err_bound`` is
+        guaranteed to be counted, where ``counter`` is the returned counter.
+
+        Parameters
+        ==========
+        txt_iter: Iterable[str]
+            Source of text to build vocabulary.
+        n_counter: Optional[int], optional
+            Maximum number of counters.
+            If set to ``None``, then use ``4 * self.max_vocab`` counters.
+            Must be given when ``self.max_vocab == -1``.
+            Defaults to ``None``.
+        normalized: bool, optional
+            Whether text in ``txt_iter`` are already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        lmp.tknzr.SpaceSavingCounter
+            Token frequency counter with error bounds of each counted token.
+
+        Raises
+        ======
+        ValueError
+            If ``n_counter`` is ``None`` and ``self.max_vocab == -1``.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.build_vocab
+        lmp.tknzr.SpaceSavingCounter
+        """
+        # Size counters from vocabulary size limit.
+        if n_counter is None:
+            if self.max_vocab == -1:
+                raise ValueError(
+                    '`n_counter` must be given when `max_vocab == -1`.'
+                )
+            n_counter = 4 * self.max_vocab
+
+        # Approximately count each token's frequency.
+        counter = SpaceSavingCounter(n_counter=n_counter)
+        for txt in txt_iter:
+            counter.update(self.tknz(txt, normalized=normalized))
+
+        self._add_tks(counter.most_common())
 
+        return counter
+
+    def _add_tks(self, tk_counts: Iterable[Tuple[str, int]]) -> None:
+        r"""Add tokens to :term:`vocabulary` by frequency.
+
+        Parameters
+        ==========
+        tk_counts: Iterable[Tuple[str, int]]
+            Pairs of token and its frequency sorted by frequency in descending
+            order.
+
+        Returns
+        =======
+        None
+        """
         max_id = max(self.tk2id.values()) + 1
-        for tk, tk_count in c.most_common():
+        for tk, tk_count in tk_counts:
             # Stop adding tokens when pass vocabulary size limit.
             # If `self.max_vocab == 1`, then add as many tokens as possible.
             if self.max_vocab != -1 and max_id >= self.max_vocab:
@@ -729,9 +1606,80 @@ class BaseTknzr(abc.ABC):
 
             # Add token to vocabulary.
             self.tk2id[tk] = max_id
-            self.id2tk[max_id] = tk
+            self.id2tk.append(tk)
             max_id += 1
 
+        # Cached token ids are encoded with old vocabulary.
+        if self.enc_cache is not None:
+            self.enc_cache.clear()
+
+    def count_tks(
+            self,
+            batch_txt: Sequence[str],
+            *,
+            normalized: bool = False,
+    ) -> typing.Counter[str]:
+        r"""Count :term:`token` frequency.
+
+        Each text in ``batch_txt`` will be tokenized (which normalize text
+        exactly once).
+        Tokens are inserted into counter in their first occurrence order.
+
+        Parameters
+        ==========
+        batch_txt: Sequence[str]
+            Source of text to count tokens.
+        normalized: bool, optional
+            Whether text in ``batch_txt`` are already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        typing.Counter[str]
+            Frequency of each token.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.build_vocab
+        """
+        c: typing.Counter[str] = Counter()
+        for txt in batch_txt:
+            c.update(self.tknz(txt, normalized=normalized))
+
+        return c
+
+    @staticmethod
+    def _shard(
+            batch_txt: Sequence[str],
+            n_shard: int,
+    ) -> Iterator[List[str]]:
+        r"""Split text into contiguous shards.
+
+        Parameters
+        ==========
+        batch_txt: Sequence[str]
+            Text to be split.
+        n_shard: int
+            Maximum number of shards.
+
+        Yields
+        ======
+        List[str]
+            Contiguous shard of ``batch_txt``.
+        """
+        shard_size = max(1, math.ceil(len(batch_txt) / n_shard))
+        shard: List[str] = []
+        for txt in batch_txt:
+            shard.append(txt)
+            if len(shard) == shard_size:
+                yield shard
+                shard = []
+
+        if shard:
+            yield shard
+
     @property
     def vocab_size(self) -> int:
         r"""Get :term:`vocabulary` size of the tokenizer.
@@ -784,8 +1732,16 @@ class BaseTknzr(abc.ABC):
         True
         >>> args.min_count == 2
         True
+        >>> args.n_counter is None
+        True
+        >>> args.n_workers == 1
+        True
+        >>> args.stream == False
+        True
         >>> args.ver == 'train'
         True
+        >>> args.vocab_fmt == 'json'
+        True
         """
         # Required arguments.
         group = parser.add_argument_group('common arguments')
@@ -833,3 +1789,36 @@ class BaseTknzr(abc.ABC):
             action='store_true',
             help='Convert all text and tokens into lowercase if set.',
         )
+        group.add_argument(
+            '--n_counter',
+            default=None,
+            help=' '.join([
+                'Maximum number of token counters when `--stream` is set.',
+                'Defaults to 4 times `--max_vocab`.',
+            ]),
+            type=int,
+        )
+        group.add_argument(
+            '--n_workers',
+            default=1,
+            help='Number of worker processes to build vocabulary.',
+            type=int,
+        )
+        group.add_argument(
+            '--stream',
+            action='store_true',
+            help=' '.join([
+                'Approximately count tokens with bounded memory if set.',
+                'Ignore `--n_workers` if set.',
+            ]),
+        )
+        group.add_argument(
+            '--vocab_fmt',
+            choices=['bin', 'json'],
+            default='json',
+            help=' '.join([
+                'Vocabulary format.',
+                'Binary vocabulary is memory-mapped when loaded.',
+            ]),
+            type=str,
+        )
@@ -1,9 +1,13 @@
 r"""Character :term:`tokenizer` class."""
 
 
-from typing import ClassVar, List, Sequence
+import re
+from typing import ClassVar, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from lmp.tknzr._base import BaseTknzr
+from lmp.tknzr._mmap_vocab import MmapVocab
 
 
 class CharTknzr(BaseTknzr):
@@ -11,6 +15,13 @@ class CharTknzr(BaseTknzr):
 
     Tokenize text into (unicode) character.
 
+    Encoding is done with a codepoint lookup table instead of looking up
+    each character in ``tk2id``.
+    Codepoints in the Basic Multilingual Plane (BMP, ``U+0000`` to
+    ``U+FFFF``) are mapped into token ids by a dense array, and the rest
+    codepoints are mapped by a fallback dictionary.
+    The lookup table is rebuilt whenever vocabulary size changes.
+
     Parameters
     ==========
     is_uncased: bool
@@ -21,7 +32,7 @@ class CharTknzr(BaseTknzr):
     min_count: int
         Minimum token frequency for each token to be included in tokenizer's
         vocabulary.
-    tk2id: Dict[str, int], optional
+    tk2id: Union[Dict[str, int], lmp.tknzr.MmapVocab], optional
         Token (a string) to id (an integer) lookup table.
         If ``tk2id is not None``, then initialize lookup table with ``tk2id``.
         Otherwise initialize lookup table with special tokens only.
@@ -31,6 +42,10 @@ class CharTknzr(BaseTknzr):
 
     Attributes
     ==========
+    safe_cut_pattern: ClassVar[re.Pattern]
+        ASCII whitespaces, ASCII digits and CJK unified ideographs.
+        Text without whitespaces (e.g., Chinese poems) can be cut before
+        these characters without changing normalization of text prefix.
     tknzr_name: ClassVar[str]
         Tokenizer name is ``character``.
         Used for command line argument parsing.
@@ -54,9 +69,179 @@ class CharTknzr(BaseTknzr):
     >>> tknzr.dtknz(['a', 'b', 'c'])
     'abc'
     """
+    safe_cut_pattern: ClassVar[re.Pattern] = re.compile(
+        r'[\t\n\v\f\r 0-9\u4e00-\u9fff]'
+    )
     tknzr_name: ClassVar[str] = 'character'
 
-    def tknz(self, txt: str) -> List[str]:
+    def __init__(
+            self,
+            is_uncased: bool,
+            max_vocab: int,
+            min_count: int,
+            *,
+            tk2id: Optional[Union[Dict[str, int], MmapVocab]] = None,
+            **kwargs: Optional[Dict],
+    ):
+        super().__init__(
+            is_uncased=is_uncased,
+            max_vocab=max_vocab,
+            min_count=min_count,
+            tk2id=tk2id,
+            **kwargs,
+        )
+
+        # Codepoint lookup table and vocabulary size when table was built.
+        self.cp_tbl: Optional[Tuple[np.ndarray, Dict[int, int]]] = None
+        self.cp_tbl_vocab_size = -1
+
+    def build_cp_tbl(self) -> Tuple[np.ndarray, Dict[int, int]]:
+        r"""Build codepoint to token id lookup table.
+
+        Only single character tokens are included in lookup table, since
+        :py:meth:`lmp.tknzr.CharTknzr.tknz` never produce multi-character
+        tokens.
+        Lookup table is cached and only rebuilt when vocabulary size changes.
+
+        Returns
+        =======
+        Tuple[np.ndarray, Dict[int, int]]
+            Token ids of BMP codepoints (shape ``(65536)``,
+            ``dtype == int64``) and token ids of the rest codepoints.
+            Codepoints not in vocabulary are mapped to ``[unk]`` token id.
+        """
+        is_stale = self.cp_tbl_vocab_size != len(self.tk2id)
+        if self.cp_tbl is not None and not is_stale:
+            return self.cp_tbl
+
+        bmp_tbl = np.full(0x10000, self.__class__.unk_tkid, dtype=np.int64)
+        fallback_tbl = {}
+        for tk, tkid in self.tk2id.items():
+            if len(tk) != 1:
+                continue
+            cp = ord(tk)
+            if cp < 0x10000:
+                bmp_tbl[cp] = tkid
+            else:
+                fallback_tbl[cp] = tkid
+
+        self.cp_tbl = (bmp_tbl, fallback_tbl)
+        self.cp_tbl_vocab_size = len(self.tk2id)
+        return self.cp_tbl
+
+    def enc_arr(self, txt: str, *, normalized: bool = False) -> np.ndarray:
+        r"""Encode text into array of :term:`token id`\s.
+
+        Normalized text is converted into codepoints with
+        :py:func:`numpy.frombuffer` on its UTF-32 encoding, then all
+        codepoints are mapped into token ids at once.
+        ``[bos]`` and ``[eos]`` are added and no truncation or padding is
+        performed.
+
+        Parameters
+        ==========
+        txt: str
+            Text to be encoded.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        np.ndarray
+            Encoded token ids with shape ``(len(txt) + 2)`` and
+            ``dtype == int64``.
+
+        See Also
+        ========
+        lmp.tknzr.BaseTknzr.enc
+        lmp.tknzr.CharTknzr.build_cp_tbl
+
+        Examples
+        ========
+        >>> from lmp.tknzr import CharTknzr
+        >>> tknzr = CharTknzr(is_uncased=False, max_vocab=10, min_count=1)
+        >>> tknzr.build_vocab(['abc'])
+        >>> tknzr.enc_arr('abd')
+        array([0, 4, 5, 3, 1])
+        """
+        bmp_tbl, fallback_tbl = self.build_cp_tbl()
+
+        # Shape: (S).
+        cps = np.frombuffer(
+            self.norm(txt, normalized=normalized).encode(
+                'utf-32-le',
+                'surrogatepass',
+            ),
+            dtype='<u4',
+        )
+
+        # Shape: (S + 2).
+        tkids = np.empty(len(cps) + 2, dtype=np.int64)
+        tkids[0] = self.__class__.bos_tkid
+        tkids[-1] = self.__class__.eos_tkid
+
+        # Characters outside of BMP are rare, thus they are looked up one by
+        # one.
+        is_bmp = cps < 0x10000
+        if is_bmp.all():
+            np.take(bmp_tbl, cps, out=tkids[1:-1])
+        else:
+            np.take(bmp_tbl, np.where(is_bmp, cps, 0), out=tkids[1:-1])
+            for idx in np.flatnonzero(~is_bmp):
+                tkids[idx + 1] = fallback_tbl.get(
+                    int(cps[idx]),
+                    self.__class__.unk_tkid,
+                )
+
+        return tkids
+
+    def _enc_full(
+            self,
+            txt: str,
+            *,
+            max_n_tk: int = -1,
+            normalized: bool = False,
+    ) -> Sequence[int]:
+        r"""Encode text into token ids array.
+
+        Let :py:meth:`lmp.tknzr.BaseTknzr.enc` and
+        :py:meth:`lmp.tknzr.BaseTknzr.batch_enc` use
+        :py:meth:`lmp.tknzr.CharTknzr.enc_arr`.
+
+        Parameters
+        ==========
+        txt: str
+            Text to be encoded.
+        max_n_tk: int, optional
+            Maximum number of tokens to be encoded.
+            See :py:meth:`lmp.tknzr.BaseTknzr.tknz_prefix` for details.
+            Defaults to ``-1``.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            Defaults to ``False``.
+
+        Returns
+        =======
+        Sequence[int]
+            Encoded token ids including ``[bos]`` and ``[eos]``.
+        """
+        # Characters are tokens, thus joined tokens are normalized text
+        # prefix.
+        if max_n_tk != -1:
+            txt = ''.join(self.tknz_prefix(
+                txt,
+                max_n_tk=max_n_tk,
+                normalized=normalized,
+            ))
+            normalized = True
+
+        return self.enc_arr(txt, normalized=normalized)
+
+    def tknz(self, txt: str, *, normalized: bool = False) -> List[str]:
         r"""Perform character :term:`tokenization` on text.
 
         Text will first be normalized by :py:meth:`lmp.tknzr.BaseTknz.norm`,
@@ -66,6 +251,11 @@ class CharTknzr(BaseTknzr):
         ==========
         txt: str
             Text to be tokenized.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
 
         Returns
         =======
@@ -87,7 +277,7 @@ class CharTknzr(BaseTknzr):
         ['a', 'b', 'c', ' ', 'd', 'e', 'f']
         """
         # First do normalization, then perform tokenization.
-        return list(self.norm(txt))
+        return list(self.norm(txt, normalized=normalized))
 
     def dtknz(self, tks: Sequence[str]) -> str:
         r"""Convert :term:`tokens` back to text.
@@ -0,0 +1,238 @@
+r"""Thread-safe LRU cache of encoded text."""
+
+import collections
+import sys
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+
+
+def _n_byte(key: Hashable, tkids: Sequence[int]) -> int:
+    r"""Estimate memory usage of a cache entry.
+
+    Parameters
+    ==========
+    key: Hashable
+        Cache key which contains the encoded text.
+    tkids: Sequence[int]
+        Encoded token ids.
+
+    Returns
+    =======
+    int
+        Estimated number of bytes of key and token ids.
+    """
+    if isinstance(tkids, np.ndarray):
+        return sys.getsizeof(key) + sys.getsizeof(key[0]) + tkids.nbytes
+    return sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(tkids)
+
+
+class EncCache:
+    r"""LRU cache of encoded text.
+
+    Map text (and encoding options) to encoded token ids, so that duplicated
+    text (e.g., titles, short prompts and poem lines) are normalized and
+    tokenized only once.
+    Entries are evicted in least recently used order whenever number of
+    entries exceeds ``max_entry`` or estimated total size exceeds
+    ``max_byte``.
+
+    All methods are guarded by a lock, thus a cache can be shared across
+    threads.
+    Cached token ids are stored as immutable objects (tuples or read-only
+    arrays), thus callers cannot modify cached values.
+
+    Parameters
+    ==========
+    max_entry: Optional[int], optional
+        Maximum number of cached entries.
+        Must satisfy ``max_entry > 0``.
+        Set to ``None`` to not limit number of entries.
+        Defaults to ``None``.
+    max_byte: Optional[int], optional
+        Maximum estimated total number of bytes of cached entries.
+        Must satisfy ``max_byte > 0``.
+        Set to ``None`` to not limit memory usage.
+        Defaults to ``None``.
+
+    Attributes
+    ==========
+    max_byte: Optional[int]
+        Maximum estimated total number of bytes of cached entries.
+    max_entry: Optional[int]
+        Maximum number of cached entries.
+    n_byte: int
+        Current estimated total number of bytes of cached entries.
+    n_hit: int
+        Number of lookups which found cached token ids.
+    n_miss: int
+        Number of lookups which found no cached token ids.
+
+    Raises
+    ======
+    TypeError
+        If ``max_entry`` or ``max_byte`` is neither ``None`` nor an instance
+        of :py:class:`int`.
+    ValueError
+        If both ``max_entry`` and ``max_byte`` are ``None``, or if any of
+        them is not positive.
+
+    See Also
+    ========
+    lmp.tknzr.BaseTknzr.enc
+
+    Examples
+    ========
+    >>> from lmp.tknzr import CharTknzr, EncCache
+    >>> tknzr = CharTknzr(is_uncased=False, max_vocab=10, min_count=1)
+    >>> tknzr.enc_cache = EncCache(max_entry=1000)
+    >>> tknzr.enc('abc') == tknzr.enc('abc')
+    True
+    >>> tknzr.enc_cache.stats()['n_hit']
+    1
+    """
+
+    def __init__(
+            self,
+            *,
+            max_entry: Optional[int] = None,
+            max_byte: Optional[int] = None,
+    ):
+        if max_entry is not None and not isinstance(max_entry, int):
+            raise TypeError('`max_entry` must be an instance of `int`.')
+        if max_byte is not None and not isinstance(max_byte, int):
+            raise TypeError('`max_byte` must be an instance of `int`.')
+        if max_entry is None and max_byte is None:
+            raise ValueError(
+                'At least one of `max_entry` and `max_byte` must be given.'
+            )
+        if max_entry is not None and not max_entry > 0:
+            raise ValueError('`max_entry` must satisfy `max_entry > 0`.')
+        if max_byte is not None and not max_byte > 0:
+            raise ValueError('`max_byte` must satisfy `max_byte > 0`.')
+
+        self.max_byte = max_byte
+        self.max_entry = max_entry
+        self.n_byte = 0
+        self.n_hit = 0
+        self.n_miss = 0
+
+        # Cached entries in least recently used order.
+        self.lru: collections.OrderedDict = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks cannot be pickled, thus cache is copied to other processes
+        # (e.g., workers building vocabulary) as an empty cache.
+        state = self.__dict__.copy()
+        del state['lock']
+        state['lru'] = collections.OrderedDict()
+        state['n_byte'] = 0
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.lru)
+
+    def get(self, key: Hashable) -> Optional[Sequence[int]]:
+        r"""Get cached token ids.
+
+        Parameters
+        ==========
+        key: Hashable
+            Cache key whose first element is the encoded text.
+
+        Returns
+        =======
+        Optional[Sequence[int]]
+            Cached token ids, or ``None`` if ``key`` is not cached.
+        """
+        with self.lock:
+            entry = self.lru.get(key)
+            if entry is None:
+                self.n_miss += 1
+                return None
+
+            self.n_hit += 1
+            self.lru.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, tkids: Sequence[int]) -> Sequence[int]:
+        r"""Cache token ids.
+
+        Least recently used entries are evicted if size limits are exceeded.
+
+        Parameters
+        ==========
+        key: Hashable
+            Cache key whose first element is the encoded text.
+        tkids: Sequence[int]
+            Encoded token ids.
+
+        Returns
+        =======
+        Sequence[int]
+            Immutable copy of ``tkids`` which is stored in cache.
+        """
+        if isinstance(tkids, np.ndarray):
+            tkids.flags.writeable = False
+        else:
+            tkids = tuple(tkids)
+
+        n_byte = _n_byte(key, tkids)
+        if self.max_byte is not None and n_byte > self.max_byte:
+            return tkids
+
+        with self.lock:
+            # Replace existing entry.
+            if key in self.lru:
+                self.n_byte -= self.lru.pop(key)[1]
+
+            self.lru[key] = (tkids, n_byte)
+            self.n_byte += n_byte
+
+            # Evict least recently used entries.
+            while (
+                (self.max_entry is not None and len(self.lru) > self.max_entry)
+                or (self.max_byte is not None and self.n_byte > self.max_byte)
+            ):
+                self.n_byte -= self.lru.popitem(last=False)[1][1]
+
+        return tkids
+
+    def clear(self) -> None:
+        r"""Remove all cached entries.
+
+        Cached token ids become invalid when vocabulary changes, thus cache is
+        cleared whenever vocabulary is built.
+
+        Returns
+        =======
+        None
+        """
+        with self.lock:
+            self.lru.clear()
+            self.n_byte = 0
+
+    def stats(self) -> Dict[str, float]:
+        r"""Get cache statistics.
+
+        Returns
+        =======
+        Dict[str, float]
+            Number of cached entries, estimated total bytes, hits, misses and
+            hit rate.
+        """
+        with self.lock:
+            n_lookup = self.n_hit + self.n_miss
+            return {
+                'hit_rate': self.n_hit / n_lookup if n_lookup else 0.0,
+                'n_byte': self.n_byte,
+                'n_entry': len(self.lru),
+                'n_hit': self.n_hit,
+                'n_miss': self.n_miss,
+            }
@@ -0,0 +1,258 @@
+r"""Memory-mapped binary :term:`vocabulary` file."""
+
+import mmap
+import struct
+import sys
+import zlib
+from typing import Dict, Iterator, List, Mapping, Sequence
+
+# File layout (all integers are little-endian):
+#
+# - Header: magic, version, number of ids, number of tokens, number of hash
+#   slots and blob size.
+# - Offsets: `uint64[n_id + 1]`, token of id `i` is UTF-8 encoded in
+#   `blob[offsets[i]:offsets[i + 1]]`.
+# - Hash slots: `uint32[n_slot]`, open addressing hash table with linear
+#   probing.  Each slot stores `id + 1`, and `0` means empty slot.
+# - Blob: UTF-8 encoded tokens concatenated in id order.
+_HEADER = struct.Struct('<8sIIIIQ')
+_MAGIC = b'LMPVOCAB'
+_VERSION = 1
+
+
+def _hash(tk_bytes: bytes) -> int:
+    r"""Hash UTF-8 encoded token.
+
+    Parameters
+    ==========
+    tk_bytes: bytes
+        UTF-8 encoded token.
+
+    Returns
+    =======
+    int
+        Unsigned 32-bit hash value.
+    """
+    return zlib.crc32(tk_bytes)
+
+
+def write_vocab(
+        file_path: str,
+        id2tk: Sequence[str],
+        tk2id: Mapping[str, int],
+) -> None:
+    r"""Write :term:`vocabulary` into binary file.
+
+    Parameters
+    ==========
+    file_path: str
+        Output file path.
+    id2tk: Sequence[str]
+        Id to token lookup table.
+        Ids which are not in ``tk2id`` are written as is, so that they are
+        decoded the same way after loading.
+    tk2id: Mapping[str, int]
+        Token to id lookup table.
+
+    Returns
+    =======
+    None
+
+    See Also
+    ========
+    lmp.tknzr.MmapVocab
+    """
+    all_tk_bytes = [tk.encode('utf-8') for tk in id2tk]
+
+    offsets: List[int] = [0]
+    for tk_bytes in all_tk_bytes:
+        offsets.append(offsets[-1] + len(tk_bytes))
+
+    # Keep load factor at most `0.5` so that probing sequences are short.
+    n_slot = 1
+    while n_slot < 2 * len(tk2id):
+        n_slot *= 2
+    slots = [0] * n_slot
+    for tk, tkid in tk2id.items():
+        slot = _hash(all_tk_bytes[tkid]) & (n_slot - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (n_slot - 1)
+        slots[slot] = tkid + 1
+
+    with open(file_path, 'wb') as output_file:
+        output_file.write(_HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            len(id2tk),
+            len(tk2id),
+            n_slot,
+            offsets[-1],
+        ))
+        output_file.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        output_file.write(struct.pack(f'<{n_slot}I', *slots))
+        output_file.write(b''.join(all_tk_bytes))
+
+
+class _MmapId2Tk(Sequence[str]):
+    r"""Read-only id to token lookup table of :py:class:`lmp.tknzr.MmapVocab`.
+
+    Parameters
+    ==========
+    vocab: lmp.tknzr.MmapVocab
+        Memory-mapped vocabulary.
+    """
+
+    def __init__(self, vocab: 'MmapVocab'):
+        self.vocab = vocab
+
+    def __len__(self) -> int:
+        return self.vocab.n_id
+
+    def __getitem__(self, tkid):  # type: ignore
+        if isinstance(tkid, slice):
+            return [self[idx] for idx in range(*tkid.indices(len(self)))]
+
+        return self.vocab.tk_of(tkid)
+
+
+class MmapVocab(Mapping[str, int]):
+    r"""Read-only memory-mapped token to id lookup table.
+
+    Vocabulary file written by :py:func:`lmp.tknzr._mmap_vocab.write_vocab`
+    is memory-mapped without parsing.
+    Token ids are looked up with the hash index stored in file, and tokens are
+    decoded from the string blob with the offsets array.
+    Since file pages are shared through page cache, multiple processes
+    loading the same vocabulary file only keep one copy in memory.
+
+    Lookups are slower than :py:class:`dict`, thus the memory-mapped
+    vocabulary is preferred when load time and memory usage matter more
+    than encoding throughput (e.g., many server worker processes).
+    Vocabulary cannot be extended, thus
+    :py:meth:`lmp.tknzr.BaseTknzr.build_vocab` raises :py:class:`TypeError`
+    on tokenizers with memory-mapped vocabulary.
+
+    Parameters
+    ==========
+    file_path: str
+        Vocabulary file path.
+
+    Attributes
+    ==========
+    id2tk: Sequence[str]
+        Id to token lookup table backed by the same memory-mapped file.
+    n_id: int
+        Length of ``id2tk``.
+
+    Raises
+    ======
+    ValueError
+        If file is not a vocabulary file.
+
+    See Also
+    ========
+    lmp.tknzr.BaseTknzr.load
+    lmp.tknzr.BaseTknzr.save
+    """
+
+    def __init__(self, file_path: str):
+        if sys.byteorder != 'little':
+            raise ValueError('Vocabulary file requires little-endian host.')
+
+        with open(file_path, 'rb') as input_file:
+            self.buf = mmap.mmap(
+                input_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+
+        magic, version, n_id, n_tk, n_slot, _ = _HEADER.unpack_from(self.buf)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'{file_path} is not a vocabulary file.')
+
+        self.n_id = n_id
+        self.n_tk = n_tk
+        self.n_slot = n_slot
+
+        # Zero-copy views of offsets and hash slots.
+        view = memoryview(self.buf)
+        start = _HEADER.size
+        end = start + 8 * (n_id + 1)
+        self.offsets = view[start:end].cast('Q')
+        self.slots = view[end:end + 4 * n_slot].cast('I')
+        self.blob_start = end + 4 * n_slot
+
+        self.id2tk = _MmapId2Tk(self)
+
+    def __getitem__(self, tk: str) -> int:
+        if not isinstance(tk, str):
+            raise KeyError(tk)
+
+        tk_bytes = tk.encode('utf-8')
+        mask = self.n_slot - 1
+        slot = _hash(tk_bytes) & mask
+        while True:
+            tkid = self.slots[slot] - 1
+            if tkid == -1:
+                raise KeyError(tk)
+            if self._tk_bytes_of(tkid) == tk_bytes:
+                return tkid
+            slot = (slot + 1) & mask
+
+    def __iter__(self) -> Iterator[str]:
+        # Iterate tokens in id order.
+        for tkid in sorted(tkid - 1 for tkid in self.slots if tkid):
+            yield self.tk_of(tkid)
+
+    def __len__(self) -> int:
+        return self.n_tk
+
+    def _tk_bytes_of(self, tkid: int) -> bytes:
+        r"""Get UTF-8 encoded token of token id.
+
+        Parameters
+        ==========
+        tkid: int
+            Token id.
+
+        Returns
+        =======
+        bytes
+            UTF-8 encoded token.
+        """
+        start = self.blob_start + self.offsets[tkid]
+        end = self.blob_start + self.offsets[tkid + 1]
+        return self.buf[start:end]
+
+    def tk_of(self, tkid: int) -> str:
+        r"""Get token of token id.
+
+        Parameters
+        ==========
+        tkid: int
+            Token id.
+            Must satisfy ``0 <= tkid < self.n_id``.
+
+        Returns
+        =======
+        str
+            Token.
+
+        Raises
+        ======
+        IndexError
+            If ``tkid`` is out of range.
+        """
+        if not 0 <= tkid < self.n_id:
+            raise IndexError(f'Token id {tkid} is out of range.')
+        return self._tk_bytes_of(tkid).decode('utf-8')
+
+    def to_dict(self) -> Dict[str, int]:
+        r"""Copy vocabulary into a :py:class:`dict`.
+
+        Returns
+        =======
+        Dict[str, int]
+            Token to id lookup table.
+        """
+        return dict(self.items())
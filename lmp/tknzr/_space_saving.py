@@ -0,0 +1,179 @@
+r"""Bounded-memory approximate :term:`token` frequency counter."""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class SpaceSavingCounter:
+    r"""Approximate heavy hitters counter with Space-Saving algorithm.
+
+    Count token frequency in a stream of tokens with at most ``n_counter``
+    counters, thus memory usage is fixed no matter how many distinct tokens
+    are in the stream.
+
+    When a token is not counted yet and all counters are used, the counter
+    with the minimum count ``m`` is reassigned to the token with count
+    ``m + 1`` and error ``m``.
+    Let ``N`` be the number of counted tokens.
+    Space-Saving algorithm guarantees the following error bounds:
+
+    - True frequency of a counted token is in range ``[count - err, count]``.
+    - ``err <= err_bound <= N / n_counter``.
+    - Every token with true frequency larger than ``err_bound`` is counted.
+
+    Parameters
+    ==========
+    n_counter: int
+        Maximum number of counters.
+        Must satisfy ``n_counter > 0``.
+
+    Attributes
+    ==========
+    cnt: Dict[str, int]
+        Estimated frequency of each counted token.
+        Estimated frequency never underestimates true frequency.
+    err: Dict[str, int]
+        Maximum overestimation of each counted token.
+    n_counter: int
+        Maximum number of counters.
+    n_tk: int
+        Number of tokens counted so far.
+
+    Raises
+    ======
+    TypeError
+        If ``n_counter`` is not an instance of :py:class:`int`.
+    ValueError
+        If ``n_counter < 1``.
+
+    See Also
+    ========
+    lmp.tknzr.BaseTknzr.build_vocab_stream
+
+    Examples
+    ========
+    >>> from lmp.tknzr import SpaceSavingCounter
+    >>> counter = SpaceSavingCounter(n_counter=2)
+    >>> counter.update(['a', 'a', 'b', 'c', 'a'])
+    >>> counter.most_common()
+    [('a', 3), ('c', 2)]
+    >>> counter.err['c']
+    1
+    >>> counter.err_bound
+    2
+    """
+
+    def __init__(self, n_counter: int):
+        if not isinstance(n_counter, int):
+            raise TypeError('`n_counter` must be an instance of `int`.')
+
+        if n_counter < 1:
+            raise ValueError('`n_counter` must be larger than `0`.')
+
+        self.cnt: Dict[str, int] = {}
+        self.err: Dict[str, int] = {}
+        self.n_counter = n_counter
+        self.n_tk = 0
+
+        # Min-heap of `(count, token)`.
+        # Counts in heap are only updated lazily, thus they may be smaller
+        # than counts in `self.cnt`.
+        self.heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.cnt)
+
+    @property
+    def err_bound(self) -> int:
+        r"""Maximum overestimation of all tokens.
+
+        If not all counters are used, then every token is counted exactly.
+        Otherwise it is the minimum count among all counters, which is also
+        the maximum true frequency of any uncounted token.
+
+        Returns
+        =======
+        int
+            Maximum overestimation of all tokens.
+        """
+        if len(self.cnt) < self.n_counter:
+            return 0
+
+        return self.min_count()
+
+    def min_count(self) -> int:
+        r"""Get the minimum count among all counters.
+
+        Stale heap entries are updated until the heap top is exact.
+
+        Returns
+        =======
+        int
+            The minimum count among all counters.
+        """
+        while True:
+            count, tk = self.heap[0]
+            if self.cnt[tk] == count:
+                return count
+            heapq.heapreplace(self.heap, (self.cnt[tk], tk))
+
+    def update(self, tks: Iterable[str]) -> None:
+        r"""Count tokens.
+
+        Parameters
+        ==========
+        tks: Iterable[str]
+            Tokens to be counted.
+
+        Returns
+        =======
+        None
+        """
+        cnt = self.cnt
+        for tk in tks:
+            self.n_tk += 1
+
+            # Token is already counted.
+            if tk in cnt:
+                cnt[tk] += 1
+                continue
+
+            # Use an unused counter.
+            if len(cnt) < self.n_counter:
+                cnt[tk] = 1
+                self.err[tk] = 0
+                heapq.heappush(self.heap, (1, tk))
+                continue
+
+            # Reassign the counter with minimum count to the token.
+            min_count = self.min_count()
+            min_tk = self.heap[0][1]
+            del cnt[min_tk]
+            del self.err[min_tk]
+            cnt[tk] = min_count + 1
+            self.err[tk] = min_count
+            heapq.heapreplace(self.heap, (min_count + 1, tk))
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        r"""List tokens by estimated frequency in descending order.
+
+        Parameters
+        ==========
+        n: Optional[int], optional
+            Number of tokens to list.
+            List all counted tokens if set to ``None``.
+            Defaults to ``None``.
+
+        Returns
+        =======
+        List[Tuple[str, int]]
+            Pairs of token and its estimated frequency.
+        """
+        tk_counts = sorted(
+            self.cnt.items(),
+            key=lambda tk_count: tk_count[1],
+            reverse=True,
+        )
+        if n is None:
+            return tk_counts
+        return tk_counts[:n]
@@ -22,7 +22,7 @@ class WsTknzr(BaseTknzr):
     min_count: int
         Minimum token frequency for each token to be included in tokenizer's
         vocabulary.
-    tk2id: Dict[str, int], optional
+    tk2id: Union[Dict[str, int], lmp.tknzr.MmapVocab], optional
         Token (a string) to id (an integer) lookup table.
         If ``tk2id is not None``, then initialize lookup table with ``tk2id``.
         Otherwise initialize lookup table with special tokens only.
@@ -57,7 +57,7 @@ class WsTknzr(BaseTknzr):
     """
     tknzr_name: ClassVar[str] = 'whitespace'
 
-    def tknz(self, txt: str) -> List[str]:
+    def tknz(self, txt: str, *, normalized: bool = False) -> List[str]:
         r"""Perform whitespace :term:`tokenization` on text.
 
         Text will first be normalized by :py:meth:`lmp.tknzr.BaseTknz.norm`,
@@ -67,6 +67,11 @@ class WsTknzr(BaseTknzr):
         ==========
         txt: str
             Text to be tokenized.
+        normalized: bool, optional
+            Whether ``txt`` is already normalized by
+            :py:func:`lmp.dset.util.norm`.
+            See :py:meth:`lmp.tknzr.BaseTknzr.norm` for details.
+            Defaults to ``False``.
 
         Returns
         =======
@@ -89,7 +94,7 @@ class WsTknzr(BaseTknzr):
         ['abc', 'def']
         """
         # First do normalization, then perform tokenization.
-        tks = re.split(r'\s+', self.norm(txt))
+        tks = re.split(r'\s+', self.norm(txt, normalized=normalized))
 
         # Return empty list when `txt` is empty string.
         # This is needed since `re.split(r'\s+', '')` return `['']` instead of